@@ -0,0 +1,208 @@
+import asyncio
+import heapq
+import logging
+import os
+import shutil
+from collections import namedtuple
+from datetime import date, datetime, time
+from typing import Iterator, Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from api.database import SessionLocal, run_db
+from api.models.delivery import Delivery
+from api.serialization import arrow_type
+
+# Months older than the hot window are moved out of the deliveries table into
+# month partitions: <ARCHIVE_DIR>/deliveries/month=YYYY-MM/part-<first id>-<last id>.parquet.
+# Reads prune by month (date filters) and by the id range in the file name
+# (keyset cursors) before opening anything, so queries over recent dates
+# never touch the archive.
+archive_dir = os.path.join(os.getenv("ARCHIVE_DIR", "archive"), "deliveries")
+archive_keep_months = int(os.getenv("ARCHIVE_KEEP_MONTHS", "0"))
+archive_interval = float(os.getenv("ARCHIVE_INTERVAL_HOURS", "24")) * 3600
+ARCHIVE_BATCH_SIZE = 10000
+DELETE_CHUNK_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = pa.schema([(c.name, arrow_type(c)) for c in Delivery.__table__.columns])
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+def next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+def next_day(value: date) -> date:
+    return date.fromordinal(value.toordinal() + 1)
+
+def archive_files(start_date: Optional[date] = None, end_date: Optional[date] = None, after_id: Optional[int] = None) -> list:
+    # (first_id, last_id, path) for every part that can hold rows in the
+    # inclusive date range with id > after_id, in id order
+    if not os.path.isdir(archive_dir):
+        return []
+    parts = []
+    for partition in os.scandir(archive_dir):
+        if not partition.name.startswith("month="):
+            continue
+        month = datetime.strptime(partition.name[6:], "%Y-%m").date()
+        if start_date is not None and next_month(month) <= start_date:
+            continue
+        if end_date is not None and month > end_date:
+            continue
+        for part in os.scandir(partition.path):
+            if not part.name.endswith(".parquet"):
+                continue
+            first_id, last_id = (int(n) for n in part.name[5:-8].split("-"))
+            if after_id is not None and last_id <= after_id:
+                continue
+            parts.append((first_id, last_id, part.path))
+    return sorted(parts)
+
+def archive_filter(filters=None, after_id: Optional[int] = None, updated_since: Optional[datetime] = None):
+    # The DeliveryFilters semantics of crud.delivery.filter_deliveries as an Arrow expression
+    conditions = []
+    if after_id is not None:
+        conditions.append(pc.field("id") > after_id)
+    if updated_since is not None:
+        conditions.append(pc.field("updated_at") > updated_since)
+    if filters is not None:
+        if filters.status:
+            conditions.append(pc.field("status").isin(filters.status))
+        if filters.sla_type:
+            conditions.append(pc.field("sla_type").isin(filters.sla_type))
+        if filters.start_date is not None:
+            conditions.append(pc.field("date") >= datetime.combine(filters.start_date, time()))
+        if filters.end_date is not None:
+            conditions.append(pc.field("date") < datetime.combine(next_day(filters.end_date), time()))
+        if filters.compliance == "Compliant":
+            conditions.append(pc.field("sla_compliance") == 1)
+        elif filters.compliance == "Non-Compliant":
+            conditions.append(pc.field("sla_compliance") == 0)
+        if filters.vehicle_id:
+            conditions.append(pc.field("vehicle_id").isin(filters.vehicle_id))
+        if filters.driver_id:
+            conditions.append(pc.field("driver_id").isin(filters.driver_id))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+def _part_rows(path: str, columns: list[str], expression, row_type) -> Iterator:
+    # Parts are written in id order, so each one is already a sorted run
+    for batch in ds.dataset(path, schema=ARCHIVE_SCHEMA).to_batches(columns=columns, filter=expression, batch_size=ARCHIVE_BATCH_SIZE):
+        yield from (row_type(*values) for values in zip(*(batch.column(i).to_pylist() for i in range(batch.num_columns))))
+
+def _merged(runs: list, limit: Optional[int]) -> Iterator:
+    last_id = None
+    count = 0
+    # heapq.merge keeps the order of equal keys, so the hot row (first run) wins
+    for row in heapq.merge(*runs, key=lambda row: row.id):
+        # A part written just before its DELETE failed to commit can repeat hot rows
+        if row.id == last_id:
+            continue
+        last_id = row.id
+        yield row
+        count += 1
+        if limit is not None and count >= limit:
+            return
+
+def with_archive(rows, columns: list[str], filters=None, page=None, where=None) -> Iterator:
+    # rows: hot rows in id order; returns hot and archived rows merged in id
+    # order. where is an extra Arrow condition for the archived rows.
+    after_id = page.after_id if page is not None else None
+    limit = page.limit if page is not None else None
+    parts = archive_files(
+        filters.start_date if filters is not None else None,
+        filters.end_date if filters is not None else None,
+        after_id,
+    )
+    if not parts:
+        return iter(rows)
+    expression = archive_filter(filters, after_id, page.updated_since if page is not None else None)
+    if where is not None:
+        expression = where if expression is None else expression & where
+    row_type = namedtuple("ArchivedDelivery", columns)
+    runs = [_part_rows(path, columns, expression, row_type) for _, _, path in parts]
+    return _merged([iter(rows), *runs], limit)
+
+def archived_table(columns: list[str], filters=None) -> Optional[pa.Table]:
+    parts = archive_files(filters.start_date if filters is not None else None, filters.end_date if filters is not None else None)
+    if not parts:
+        return None
+    dataset = ds.dataset([path for _, _, path in parts], schema=ARCHIVE_SCHEMA)
+    return dataset.to_table(columns=columns, filter=archive_filter(filters))
+
+def archive_month(db: Session, month: date) -> int:
+    table = Delivery.__table__
+    rows = db.execute(
+        select(table).where(table.c.date >= month, table.c.date < next_month(month)).order_by(table.c.id)
+    ).all()
+    if not rows:
+        return 0
+    columns = list(zip(*rows))
+    data = pa.Table.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, ARCHIVE_SCHEMA)],
+        schema=ARCHIVE_SCHEMA,
+    )
+    ids = [row.id for row in rows]
+    partition = os.path.join(archive_dir, f"month={month:%Y-%m}")
+    os.makedirs(partition, exist_ok=True)
+    path = os.path.join(partition, f"part-{ids[0]:012d}-{ids[-1]:012d}.parquet")
+    pq.write_table(data, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    try:
+        for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+            db.execute(table.delete().where(table.c.id.in_(ids[start:start + DELETE_CHUNK_SIZE])))
+        db.commit()
+    except Exception:
+        db.rollback()
+        os.remove(path)
+        raise
+    return len(ids)
+
+def archive_before(db: Session, cutoff: date) -> dict:
+    # Moves every month that ends on or before cutoff; the rollup in
+    # delivery_daily_stats is left alone since it already covers all history.
+    cutoff = month_start(cutoff)
+    first = db.execute(select(func.min(Delivery.date)).where(Delivery.date < cutoff)).scalar()
+    archived = {}
+    month = month_start(first) if first is not None else cutoff
+    while month < cutoff:
+        count = archive_month(db, month)
+        if count:
+            archived[f"{month:%Y-%m}"] = count
+        month = next_month(month)
+    return archived
+
+def archive_cutoff(keep_months: int, today: Optional[date] = None) -> date:
+    # First day of the oldest month kept hot, counting the current month
+    month = month_start(today or date.today())
+    for _ in range(keep_months - 1):
+        month = date(month.year - (month.month == 1), (month.month - 2) % 12 + 1, 1)
+    return month
+
+def clear_archive():
+    shutil.rmtree(archive_dir, ignore_errors=True)
+
+def archive_old_months(keep_months: int) -> dict:
+    db = SessionLocal()
+    try:
+        return archive_before(db, archive_cutoff(keep_months))
+    finally:
+        db.close()
+
+async def archive_periodically():
+    # Started by the app lifespan when ARCHIVE_KEEP_MONTHS is set
+    while True:
+        try:
+            archived = await run_db(archive_old_months, archive_keep_months)
+            if archived:
+                logger.info("Archived deliveries by month: %s", archived)
+        except Exception:
+            logger.exception("Archiving deliveries failed")
+        await asyncio.sleep(archive_interval)
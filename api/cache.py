@@ -0,0 +1,105 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+cache_max_entries = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+cache_max_bytes = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Only writes through this process invalidate the cache. Rows written by other
+# workers, the maintenance scripts or direct loads show up once an entry is this
+# many seconds old; 0 turns the cache off, for deployments that need that at once.
+cache_ttl = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30"))
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: dict
+    etag: str
+    last_modified: float
+    expires: float = float("inf")
+
+    def validators(self) -> dict:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
+        if if_modified_since is not None:
+            try:
+                return int(self.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+class ResponseCache:
+    # Process-local LRU of serialized GET responses, keyed per table and per
+    # request. Writes bump the table's version so a read that raced a write
+    # is never stored.
+    def __init__(self, max_entries: int = cache_max_entries, max_bytes: int = cache_max_bytes, ttl: float = cache_ttl):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._modified = {}
+        self._size = 0
+        self._started = time.time()
+        self._lock = threading.Lock()
+
+    def version(self, table: str) -> int:
+        with self._lock:
+            return self._versions.get(table, 0)
+
+    def get(self, table: str, key) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get((table, key))
+            if entry is None or entry.expires <= time.monotonic():
+                # Expired entries stay until put so their ETag can be compared
+                return None
+            self._entries.move_to_end((table, key))
+            return entry
+
+    def put(self, table: str, key, version: int, body: bytes, headers: dict) -> CachedResponse:
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        with self._lock:
+            previous = self._entries.pop((table, key), None)
+            if previous is not None:
+                self._size -= len(previous.body)
+            modified = self._modified.get(table, self._started)
+            if previous is not None and previous.etag != etag:
+                # Changed by a write this process never saw
+                modified = max(modified, time.time())
+            entry = CachedResponse(body, headers, etag, modified, time.monotonic() + self.ttl)
+            if self._versions.get(table, 0) != version or len(body) > self.max_bytes or self.ttl <= 0:
+                return entry
+            self._entries[(table, key)] = entry
+            self._size += len(body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+            return entry
+
+    def invalidate(self, table: str):
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            self._modified[table] = time.time()
+            for cache_key in [k for k in self._entries if k[0] == table]:
+                self._size -= len(self._entries.pop(cache_key).body)
+
+response_cache = ResponseCache()
+
+def cache_table(path: str) -> Optional[str]:
+    # /api/<table>/... -> <table>
+    parts = path.strip("/").split("/")
+    if len(parts) >= 2 and parts[0] == "api":
+        return parts[1]
+    return None
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, TypeAdapter
+from api.metrics import record_rows
+
+BULK_CHUNK_SIZE = 5000
+
+@lru_cache
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+def bulk_insert(db: Session, model, items: list[BaseModel], schema: type[BaseModel], chunk_size: int = BULK_CHUNK_SIZE, commit: bool = True, return_ids: bool = True) -> Optional[list[int]]:
+    # Core executemany instead of one ORM object per row; all chunks share one
+    # transaction. RETURNING keeps the generated ids in input order, but on
+    # mssql it also turns pyodbc's fast_executemany into batched multi-row
+    # INSERTs, so callers that do not need the ids skip it and get None.
+    stmt = insert(model)
+    if return_ids:
+        stmt = stmt.returning(model.id, sort_by_parameter_order=True)
+    adapter = _list_adapter(schema)
+    ids = []
+    for start in range(0, len(items), chunk_size):
+        rows = adapter.dump_python(items[start:start + chunk_size])
+        if return_ids:
+            ids.extend(db.scalars(stmt, rows).all())
+        else:
+            db.execute(stmt, rows)
+    if return_ids:
+        record_rows(len(ids))
+    if commit:
+        db.commit()
+    return ids if return_ids else None
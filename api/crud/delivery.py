@@ -1,23 +1,201 @@
+import os
+from datetime import timedelta
+from typing import Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+from sqlalchemy import Float, and_, case, cast, func, select
 from sqlalchemy.orm import Session
 from api.models.delivery import Delivery
-from api.schemas.delivery import DeliveryCreate
+from api.models.delivery_stats import DeliveryDailyStats
+from api.archive import archived_table, clear_archive, with_archive
+from api.crud.bulk import bulk_insert
+from api.crud.delivery_stats import STATS_KEYS, STATS_SUMS, apply_delivery_stats, clear_delivery_stats
+from api.geo import Area, area_page, area_rows, area_select
+from api.pagination import PageParams, page_select
+from api.serialization import STREAM_CHUNK_SIZE, IteratorResult, Rows, select_rows
+from api.schemas.delivery import DeliveryCreate, DeliveryFilters, DeliveryKPIs
 
 def create_delivery(db: Session, delivery: DeliveryCreate):
     db_delivery = Delivery(**delivery.dict())
     db.add(db_delivery)
+    apply_delivery_stats(db, [delivery])
     db.commit()
     db.refresh(db_delivery)
     return db_delivery
 
-def create_delivery_batch(db: Session, deliveries: list[DeliveryCreate]):
-    db_deliveries = [Delivery(**d.dict()) for d in deliveries]
-    db.add_all(db_deliveries)
+def create_delivery_batch(db: Session, deliveries: list[DeliveryCreate], return_ids: bool = True):
+    ids = bulk_insert(db, Delivery, deliveries, DeliveryCreate, commit=False, return_ids=return_ids)
+    apply_delivery_stats(db, deliveries)
     db.commit()
-    return db_deliveries
+    return ids
 
 def delete_all_deliveries(db: Session):
     db.query(Delivery).delete()
+    clear_delivery_stats(db)
     db.commit()
+    clear_archive()
 
-def get_deliveries(db: Session):
-    return db.query(Delivery).all()
\ No newline at end of file
+def filter_deliveries(query, filters: Optional[DeliveryFilters], source=Delivery):
+    # source is Delivery or DeliveryDailyStats, which share the filtered column names
+    if filters is None:
+        return query
+    if filters.status:
+        query = query.filter(source.status.in_(filters.status))
+    if filters.sla_type:
+        query = query.filter(source.sla_type.in_(filters.sla_type))
+    if filters.start_date is not None:
+        query = query.filter(source.date >= filters.start_date)
+    if filters.end_date is not None:
+        # end_date is inclusive of the whole day
+        query = query.filter(source.date < filters.end_date + timedelta(days=1))
+    if filters.compliance == "Compliant":
+        query = query.filter(source.sla_compliance == 1)
+    elif filters.compliance == "Non-Compliant":
+        query = query.filter(source.sla_compliance == 0)
+    if filters.vehicle_id:
+        query = query.filter(source.vehicle_id.in_(filters.vehicle_id))
+    if filters.driver_id:
+        query = query.filter(source.driver_id.in_(filters.driver_id))
+    return query
+
+# Reads cover the hot table and the Parquet archive of old months (api.archive)
+
+def _delivery_rows(db: Session, page: PageParams, filters: Optional[DeliveryFilters], area: Optional[Area], stream: bool):
+    table = Delivery.__table__
+    read_page = page if area is None else area_page(page, area)
+    query = page_select(table, read_page)
+    columns = list(query.selected_columns)
+    if area is not None:
+        query, names = area_select(query, table, area)
+    query = filter_deliveries(query, filters)
+    if stream or (area is not None and not area.exact):
+        result = db.execute(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+    else:
+        result = db.execute(query)
+    rows = with_archive(result, list(query.selected_columns.keys()), filters, read_page, area.expression() if area is not None else None)
+    if area is not None:
+        rows = area_rows(rows, area, names, page.limit)
+    return result, rows, columns
+
+def get_deliveries(db: Session, page: PageParams, filters: Optional[DeliveryFilters] = None, area: Optional[Area] = None):
+    result, rows, columns = _delivery_rows(db, page, filters, area, stream=False)
+    try:
+        return Rows(rows, columns)
+    finally:
+        result.close()
+
+def stream_deliveries(db: Session, page: PageParams, filters: Optional[DeliveryFilters] = None, area: Optional[Area] = None):
+    return IteratorResult(*_delivery_rows(db, page, filters, area, stream=True))
+
+KPI_GROUP_COLUMNS = {
+    "sla_type": Delivery.sla_type,
+    "status": Delivery.status,
+    "day_of_week": Delivery.day_of_week,
+    "time_of_day": Delivery.time_of_day,
+}
+
+KPI_SUMS = ("compliance", "delay", "fuel")
+
+# sla_compliance holds 0-100 scores (scripts/data_generator.py and
+# data_generatorv2.py) or, set SLA_COMPLIANCE_UNIT=flag, 0/1 flags (what the
+# Compliant/Non-Compliant filters and the daily stats count). Scores average to
+# a percentage already, flags to a fraction.
+compliance_unit = os.getenv("SLA_COMPLIANCE_UNIT", "score").lower()
+compliance_scale = 100 if compliance_unit == "flag" else 1
+
+def _archived_kpis(filters: Optional[DeliveryFilters], group_by: Optional[str], on_time_threshold: float) -> list:
+    columns = ["id", "status", "sla_compliance", "delay_minutes", "fuel_consumed"] + ([group_by] if group_by else [])
+    table = archived_table(list(dict.fromkeys(columns)), filters)
+    if table is None or table.num_rows == 0:
+        return []
+    on_time = pc.and_(pc.equal(table["status"], "Delivered"), pc.less_equal(table["delay_minutes"], on_time_threshold))
+    table = table.append_column("on_time", pc.cast(pc.fill_null(on_time, False), pa.int64()))
+    table = table.append_column("compliance", pc.cast(table["sla_compliance"], pa.float64()))
+    aggregates = table.group_by([group_by] if group_by else []).aggregate([
+        ("id", "count"), ("on_time", "sum"),
+        ("compliance", "sum"), ("compliance", "count"),
+        ("delay_minutes", "sum"), ("delay_minutes", "count"),
+        ("fuel_consumed", "sum"), ("fuel_consumed", "count"),
+    ]).to_pylist()
+    return [
+        {
+            "group": row[group_by] if group_by else None,
+            "count": row["id_count"],
+            "on_time": row["on_time_sum"],
+            "compliance": (row["compliance_sum"], row["compliance_count"]),
+            "delay": (row["delay_minutes_sum"], row["delay_minutes_count"]),
+            "fuel": (row["fuel_consumed_sum"], row["fuel_consumed_count"]),
+        }
+        for row in aggregates
+    ]
+
+def _average(total: tuple) -> Optional[float]:
+    value, count = total
+    return value / count if count else None
+
+def get_delivery_kpis(db: Session, filters: Optional[DeliveryFilters] = None, group_by: Optional[str] = None, on_time_threshold: float = 0):
+    on_time = case((and_(Delivery.status == "Delivered", Delivery.delay_minutes <= on_time_threshold), 1), else_=0)
+    # Sums and non-null counts rather than averages so the hot table and the
+    # archive can be combined; the compliance cast keeps SQL Server from
+    # truncating to an integer
+    columns = [
+        func.count(Delivery.id).label("count"),
+        func.sum(on_time).label("on_time"),
+        func.sum(cast(Delivery.sla_compliance, Float)).label("compliance_sum"),
+        func.count(Delivery.sla_compliance).label("compliance_count"),
+        func.sum(Delivery.delay_minutes).label("delay_sum"),
+        func.count(Delivery.delay_minutes).label("delay_count"),
+        func.sum(Delivery.fuel_consumed).label("fuel_sum"),
+        func.count(Delivery.fuel_consumed).label("fuel_count"),
+    ]
+    group_column = KPI_GROUP_COLUMNS[group_by] if group_by else None
+    if group_column is not None:
+        columns.insert(0, group_column.label("group"))
+    query = filter_deliveries(db.query(*columns), filters)
+    if group_column is not None:
+        query = query.group_by(group_column).order_by(group_column)
+    groups = {}
+    for row in query.all():
+        groups[row.group if group_column is not None else None] = {
+            "count": row.count,
+            "on_time": row.on_time or 0,
+            "compliance": (row.compliance_sum or 0, row.compliance_count),
+            "delay": (row.delay_sum or 0, row.delay_count),
+            "fuel": (row.fuel_sum or 0, row.fuel_count),
+        }
+    for archived in _archived_kpis(filters, group_by, on_time_threshold):
+        totals = groups.setdefault(archived["group"], {"count": 0, "on_time": 0, **{name: (0, 0) for name in KPI_SUMS}})
+        totals["count"] += archived["count"]
+        totals["on_time"] += archived["on_time"] or 0
+        for name in KPI_SUMS:
+            totals[name] = (totals[name][0] + (archived[name][0] or 0), totals[name][1] + archived[name][1])
+    kpis = []
+    for group in sorted(groups, key=lambda g: (g is None, g)):
+        totals = groups[group]
+        compliance = _average(totals["compliance"])
+        kpis.append(DeliveryKPIs(
+            group=group,
+            count=totals["count"],
+            sla_compliance_rate=compliance * compliance_scale if compliance is not None else None,
+            avg_delay_minutes=_average(totals["delay"]),
+            avg_fuel_consumed=_average(totals["fuel"]),
+            on_time_rate=totals["on_time"] / totals["count"] * 100 if totals["count"] else None,
+        ))
+    return kpis
+
+def get_delivery_daily_stats(db: Session, filters: Optional[DeliveryFilters] = None, group_by: Optional[list[str]] = None):
+    table = DeliveryDailyStats.__table__
+    group_columns = [table.c[name] for name in (STATS_KEYS if group_by is None else group_by)]
+    count = func.coalesce(func.sum(table.c.delivery_count), 0)
+    compliant = func.coalesce(func.sum(case((table.c.sla_compliance == 1, table.c.delivery_count), else_=0)), 0)
+    query = select(
+        *group_columns,
+        count.label("delivery_count"),
+        compliant.label("compliant_count"),
+        (count - compliant).label("non_compliant_count"),
+        *[func.coalesce(func.sum(table.c[name]), 0.0).label(name) for name in STATS_SUMS],
+    )
+    query = filter_deliveries(query, filters, DeliveryDailyStats)
+    if group_columns:
+        query = query.group_by(*group_columns).order_by(*group_columns)
+    return select_rows(db, query)
\ No newline at end of file
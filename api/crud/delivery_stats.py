@@ -0,0 +1,87 @@
+from collections import defaultdict
+from sqlalchemy import Date, and_, bindparam, cast, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from api.models.delivery import Delivery
+from api.models.delivery_stats import DeliveryDailyStats
+from api.schemas.delivery import DeliveryCreate
+
+STATS_KEYS = ("date", "sla_type", "status", "sla_compliance")
+STATS_SUMS = {
+    "delay_minutes_sum": "delay_minutes",
+    "fuel_consumed_sum": "fuel_consumed",
+    "penalty_amount_sum": "penalty_amount",
+    "distance_km_sum": "distance_km",
+}
+STATS_VALUES = ("delivery_count", *STATS_SUMS)
+
+stats_table = DeliveryDailyStats.__table__
+
+_increment = update(stats_table).where(
+    *[stats_table.c[name] == bindparam(f"key_{name}") for name in STATS_KEYS]
+).values({name: stats_table.c[name] + bindparam(name) for name in STATS_VALUES})
+
+def _increment_params(key: tuple, values: dict) -> dict:
+    return {**{f"key_{name}": value for name, value in zip(STATS_KEYS, key)}, **values}
+
+def apply_delivery_stats(db: Session, deliveries: list[DeliveryCreate]):
+    # Runs inside the caller's transaction so the rollup commits (or rolls
+    # back) together with the deliveries it counts.
+    totals = defaultdict(lambda: dict.fromkeys(STATS_VALUES, 0))
+    for delivery in deliveries:
+        group = totals[(delivery.date.date(), delivery.sla_type, delivery.status, delivery.sla_compliance)]
+        group["delivery_count"] += 1
+        for name, column in STATS_SUMS.items():
+            group[name] += getattr(delivery, column)
+    if not totals:
+        return
+
+    dates = [key[0] for key in totals]
+    existing = set(db.execute(
+        select(*[stats_table.c[name] for name in STATS_KEYS])
+        .where(stats_table.c.date.between(min(dates), max(dates)))
+    ).all())
+    updates = [_increment_params(key, values) for key, values in totals.items() if key in existing]
+    inserts = [{**dict(zip(STATS_KEYS, key)), **values} for key, values in totals.items() if key not in existing]
+    if updates:
+        db.execute(_increment, updates)
+    if not inserts:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(stats_table), inserts)
+    except IntegrityError:
+        # A concurrent writer created some of these groups first
+        for row in inserts:
+            key = tuple(row[name] for name in STATS_KEYS)
+            values = {name: row[name] for name in STATS_VALUES}
+            if db.execute(_increment, _increment_params(key, values)).rowcount:
+                continue
+            db.execute(insert(stats_table), row)
+
+def clear_delivery_stats(db: Session):
+    db.execute(delete(stats_table))
+
+def _day(column, dialect: str):
+    # deliveries.date may carry a time of day; the rollup is per calendar day.
+    # SQLite has no DATE type, so match the 'YYYY-MM-DD' text SQLAlchemy stores.
+    if dialect == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+def rebuild_delivery_stats(db: Session) -> int:
+    keys = [Delivery.__table__.c[name] for name in STATS_KEYS]
+    keys[0] = _day(keys[0], db.get_bind().dialect.name)
+    rollup = (
+        select(
+            *keys,
+            func.count(Delivery.id),
+            *[func.coalesce(func.sum(Delivery.__table__.c[column]), 0) for column in STATS_SUMS.values()],
+        )
+        .where(and_(*[key.isnot(None) for key in keys]))
+        .group_by(*keys)
+    )
+    clear_delivery_stats(db)
+    db.execute(insert(stats_table).from_select([*STATS_KEYS, *STATS_VALUES], rollup))
+    db.commit()
+    return db.scalar(select(func.count()).select_from(stats_table))
\ No newline at end of file
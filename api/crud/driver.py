@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from api.models.driver import Driver
+from api.crud.bulk import bulk_insert
+from api.pagination import PageParams, page_select
+from api.serialization import STREAM_CHUNK_SIZE, select_rows
 from api.schemas.driver import DriverCreate
 
 def create_driver(db: Session, driver: DriverCreate):
@@ -9,15 +12,16 @@ def create_driver(db: Session, driver: DriverCreate):
     db.refresh(db_driver)
     return db_driver
 
-def create_driver_batch(db: Session, drivers: list[DriverCreate]):
-    db_drivers = [Driver(**d.dict()) for d in drivers]
-    db.add_all(db_drivers)
-    db.commit()
-    return db_drivers
+def create_driver_batch(db: Session, drivers: list[DriverCreate], return_ids: bool = True):
+    return bulk_insert(db, Driver, drivers, DriverCreate, return_ids=return_ids)
 
 def delete_all_drivers(db: Session):
     db.query(Driver).delete()
     db.commit()
 
-def get_drivers(db: Session):
-    return db.query(Driver).all()
\ No newline at end of file
+def get_drivers(db: Session, page: PageParams):
+    return select_rows(db, page_select(Driver.__table__, page))
+
+def stream_drivers(db: Session, page: PageParams):
+    query = page_select(Driver.__table__, page)
+    return db.execute(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
\ No newline at end of file
@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from api.models.maintenance import Maintenance
+from api.crud.bulk import bulk_insert
+from api.pagination import PageParams, page_select
+from api.serialization import STREAM_CHUNK_SIZE, select_rows
 from api.schemas.maintenance import MaintenanceCreate
 
 def create_maintenance(db: Session, maintenance: MaintenanceCreate):
@@ -9,15 +12,16 @@ def create_maintenance(db: Session, maintenance: MaintenanceCreate):
     db.refresh(db_maintenance)
     return db_maintenance
 
-def create_maintenance_batch(db: Session, maintenances: list[MaintenanceCreate]):
-    db_maintenances = [Maintenance(**m.dict()) for m in maintenances]
-    db.add_all(db_maintenances)
-    db.commit()
-    return db_maintenances
+def create_maintenance_batch(db: Session, maintenances: list[MaintenanceCreate], return_ids: bool = True):
+    return bulk_insert(db, Maintenance, maintenances, MaintenanceCreate, return_ids=return_ids)
 
 def delete_all_maintenance(db: Session):
     db.query(Maintenance).delete()
     db.commit()
 
-def get_maintenance(db: Session):
-    return db.query(Maintenance).all()
\ No newline at end of file
+def get_maintenance(db: Session, page: PageParams):
+    return select_rows(db, page_select(Maintenance.__table__, page))
+
+def stream_maintenance(db: Session, page: PageParams):
+    query = page_select(Maintenance.__table__, page)
+    return db.execute(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
\ No newline at end of file
@@ -1,5 +1,10 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from api.models.route import Route
+from api.crud.bulk import bulk_insert
+from api.geo import Area, area_page, area_rows, area_select
+from api.pagination import PageParams, page_select
+from api.serialization import STREAM_CHUNK_SIZE, IteratorResult, Rows
 from api.schemas.route import RouteCreate
 
 def create_route(db: Session, route: RouteCreate):
@@ -9,15 +14,40 @@ def create_route(db: Session, route: RouteCreate):
     db.refresh(db_route)
     return db_route
 
-def create_routes_batch(db: Session, routes: list[RouteCreate]):
-    db_routes = [Route(**r.dict()) for r in routes]
-    db.add_all(db_routes)
-    db.commit()
-    return db_routes
+def create_routes_batch(db: Session, routes: list[RouteCreate], return_ids: bool = True):
+    return bulk_insert(db, Route, routes, RouteCreate, return_ids=return_ids)
 
 def delete_all_routes(db: Session):
     db.query(Route).delete()
     db.commit()
 
-def get_routes(db: Session):
-    return db.query(Route).all()
\ No newline at end of file
+def _route_query(page: PageParams, area: Optional[Area]):
+    # (query, the columns its rows are returned with)
+    table = Route.__table__
+    if area is None:
+        query = page_select(table, page)
+        return query, list(query.selected_columns)
+    query = page_select(table, area_page(page, area))
+    return area_select(query, table, area)[0], list(query.selected_columns)
+
+def _route_rows(db: Session, page: PageParams, area: Optional[Area], stream: bool):
+    query, columns = _route_query(page, area)
+    if stream or (area is not None and not area.exact):
+        # Radius candidates are streamed through the distance check rather
+        # than all loaded first
+        result = db.execute(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+    else:
+        result = db.execute(query)
+    rows = result if area is None or area.exact else area_rows(result, area, [column.name for column in columns], page.limit)
+    return result, rows, columns
+
+def get_routes(db: Session, page: PageParams, area: Optional[Area] = None):
+    result, rows, columns = _route_rows(db, page, area, stream=False)
+    try:
+        return Rows(rows, columns)
+    finally:
+        result.close()
+
+def stream_routes(db: Session, page: PageParams, area: Optional[Area] = None):
+    result, rows, columns = _route_rows(db, page, area, stream=True)
+    return result if rows is result else IteratorResult(result, rows, columns)
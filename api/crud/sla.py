@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from api.models.sla import SLA
+from api.crud.bulk import bulk_insert
+from api.pagination import PageParams, page_select
+from api.serialization import STREAM_CHUNK_SIZE, select_rows
 from api.schemas.sla import SLACreate
 
 def create_sla(db: Session, sla: SLACreate):
@@ -9,15 +12,16 @@ def create_sla(db: Session, sla: SLACreate):
     db.refresh(db_sla)
     return db_sla
 
-def create_slas_batch(db: Session, slas: list[SLACreate]):
-    db_slas = [SLA(**s.dict()) for s in slas]
-    db.add_all(db_slas)
-    db.commit()
-    return db_slas
+def create_slas_batch(db: Session, slas: list[SLACreate], return_ids: bool = True):
+    return bulk_insert(db, SLA, slas, SLACreate, return_ids=return_ids)
 
 def delete_all_slas(db: Session):
     db.query(SLA).delete()
     db.commit()
 
-def get_slas(db: Session):
-    return db.query(SLA).all()
\ No newline at end of file
+def get_slas(db: Session, page: PageParams):
+    return select_rows(db, page_select(SLA.__table__, page))
+
+def stream_slas(db: Session, page: PageParams):
+    query = page_select(SLA.__table__, page)
+    return db.execute(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
\ No newline at end of file
@@ -1,5 +1,9 @@
 from sqlalchemy.orm import Session
 from api.models.traffic import Traffic
+from api.crud.bulk import bulk_insert
+from api.pagination import PageParams, page_select
+from api.serialization import STREAM_CHUNK_SIZE, select_rows
+from api.timeseries import TimeseriesParams, timeseries
 from api.schemas.traffic import TrafficCreate
 
 def create_traffic(db: Session, traffic: TrafficCreate):
@@ -9,15 +13,21 @@ def create_traffic(db: Session, traffic: TrafficCreate):
     db.refresh(db_traffic)
     return db_traffic
 
-def create_traffic_batch(db: Session, traffics: list[TrafficCreate]):
-    db_traffics = [Traffic(**t.dict()) for t in traffics]
-    db.add_all(db_traffics)
-    db.commit()
-    return db_traffics
+def create_traffic_batch(db: Session, traffics: list[TrafficCreate], return_ids: bool = True):
+    return bulk_insert(db, Traffic, traffics, TrafficCreate, return_ids=return_ids)
 
 def delete_all_traffic(db: Session):
     db.query(Traffic).delete()
     db.commit()
 
-def get_traffic(db: Session):
-    return db.query(Traffic).all()
\ No newline at end of file
+def get_traffic(db: Session, page: PageParams):
+    return select_rows(db, page_select(Traffic.__table__, page))
+
+def stream_traffic(db: Session, page: PageParams):
+    query = page_select(Traffic.__table__, page)
+    return db.execute(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+
+TRAFFIC_METRICS = ["traffic_index", "delay_minutes"]
+
+def get_traffic_timeseries(db: Session, params: TimeseriesParams):
+    return timeseries(db, Traffic.__table__, TRAFFIC_METRICS, params)
\ No newline at end of file
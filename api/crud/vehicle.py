@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from api.models.vehicle import Vehicle
+from api.crud.bulk import bulk_insert
+from api.pagination import PageParams, page_select
+from api.serialization import STREAM_CHUNK_SIZE, select_rows
 from api.schemas.vehicle import VehicleCreate
 
 def create_vehicle(db: Session, vehicle: VehicleCreate):
@@ -9,15 +12,16 @@ def create_vehicle(db: Session, vehicle: VehicleCreate):
     db.refresh(db_vehicle)
     return db_vehicle
 
-def create_vehicle_batch(db: Session, vehicles: list[VehicleCreate]):
-    db_vehicles = [Vehicle(**v.dict()) for v in vehicles]
-    db.add_all(db_vehicles)
-    db.commit()
-    return db_vehicles
+def create_vehicle_batch(db: Session, vehicles: list[VehicleCreate], return_ids: bool = True):
+    return bulk_insert(db, Vehicle, vehicles, VehicleCreate, return_ids=return_ids)
 
 def delete_all_vehicles(db: Session):
     db.query(Vehicle).delete()
     db.commit()
 
-def get_vehicles(db: Session):
-    return db.query(Vehicle).all()
\ No newline at end of file
+def get_vehicles(db: Session, page: PageParams):
+    return select_rows(db, page_select(Vehicle.__table__, page))
+
+def stream_vehicles(db: Session, page: PageParams):
+    query = page_select(Vehicle.__table__, page)
+    return db.execute(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
\ No newline at end of file
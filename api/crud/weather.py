@@ -1,5 +1,9 @@
 from sqlalchemy.orm import Session
 from api.models.weather import Weather
+from api.crud.bulk import bulk_insert
+from api.pagination import PageParams, page_select
+from api.serialization import STREAM_CHUNK_SIZE, select_rows
+from api.timeseries import TimeseriesParams, timeseries
 from api.schemas.weather import WeatherCreate
 
 def create_weather(db: Session, weather: WeatherCreate):
@@ -9,15 +13,21 @@ def create_weather(db: Session, weather: WeatherCreate):
     db.refresh(db_weather)
     return db_weather
 
-def create_weather_batch(db: Session, weathers: list[WeatherCreate]):
-    db_weathers = [Weather(**w.dict()) for w in weathers]
-    db.add_all(db_weathers)
-    db.commit()
-    return db_weathers
+def create_weather_batch(db: Session, weathers: list[WeatherCreate], return_ids: bool = True):
+    return bulk_insert(db, Weather, weathers, WeatherCreate, return_ids=return_ids)
 
 def delete_all_weather(db: Session):
     db.query(Weather).delete()
     db.commit()
 
-def get_weather(db: Session):
-    return db.query(Weather).all()
\ No newline at end of file
+def get_weather(db: Session, page: PageParams):
+    return select_rows(db, page_select(Weather.__table__, page))
+
+def stream_weather(db: Session, page: PageParams):
+    query = page_select(Weather.__table__, page)
+    return db.execute(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+
+WEATHER_METRICS = ["temperature", "wind_speed", "humidity"]
+
+def get_weather_timeseries(db: Session, params: TimeseriesParams):
+    return timeseries(db, Weather.__table__, WEATHER_METRICS, params)
\ No newline at end of file
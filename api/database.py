@@ -1,9 +1,30 @@
-from sqlalchemy import create_engine
+import asyncio
+import contextvars
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import StaticPool
 import urllib
 
-server = 'DESKTOP-8CQER49'
-database = 'LogisticsFleetDBv2'
+# Connection settings come from the environment. DATABASE_URL overrides the
+# SQL Server defaults, e.g. DATABASE_URL=sqlite:///logistics.db runs the API
+# against an embedded SQLite file (WAL mode) with no SQL Server at all.
+server = os.getenv("DB_SERVER", "DESKTOP-8CQER49")
+database = os.getenv("DB_NAME", "LogisticsFleetDBv2")
+pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+slow_query_ms = float(os.getenv("SLOW_QUERY_MS", "200"))
+# /debug/explain returns SQL text, bound parameters and query plans; it is
+# only mounted when this is set
+debug_endpoints = os.getenv("DEBUG_ENDPOINTS", "false").lower() in ("1", "true", "yes")
 
 params = urllib.parse.quote_plus(
     f"DRIVER={{ODBC Driver 17 for SQL Server}};"
@@ -11,12 +32,93 @@ params = urllib.parse.quote_plus(
     f"DATABASE={database};"
     f"Trusted_Connection=yes;"
 )
+database_url = os.getenv("DATABASE_URL", f"mssql+pyodbc:///?odbc_connect={params}")
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        options = {"connect_args": {"check_same_thread": False}}
+        if url in ("sqlite://", "sqlite:///:memory:"):
+            # Every session must see the same in-memory database
+            options["poolclass"] = StaticPool
+            return options
+    else:
+        options = {}
+    options.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+    )
+    if url.startswith("mssql+pyodbc"):
+        options["fast_executemany"] = True
+    return options
+
+engine = create_engine(database_url, **_engine_options(database_url))
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+slow_query_logger = logging.getLogger("api.slow_query")
+
+# Called as fn(conn, cursor, statement, parameters, context, executemany, seconds)
+# after every statement; the metrics and EXPLAIN capture hook in here.
+query_listeners = []
+
+def _format_parameters(parameters, executemany: bool) -> str:
+    if executemany:
+        text = f"{len(parameters)} sets, first {parameters[0]!r}" if parameters else "[]"
+    else:
+        text = repr(parameters)
+    return text if len(text) <= 1000 else text[:1000] + "..."
+
+@event.listens_for(engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    for listener in query_listeners:
+        listener(conn, cursor, statement, parameters, context, executemany, seconds)
+    if seconds * 1000 >= slow_query_ms:
+        # rowcount is -1 for SELECTs on most drivers until rows are fetched
+        slow_query_logger.warning(
+            "slow query %.1f ms, rowcount %s: %s | parameters %s",
+            seconds * 1000, cursor.rowcount, " ".join(statement.split()), _format_parameters(parameters, executemany),
+        )
+
+@event.listens_for(engine, "handle_error")
+def _query_failed(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
 
-engine = create_engine(f"mssql+pyodbc:///?odbc_connect={params}")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+def utcnow() -> datetime:
+    # Naive UTC, matching the DateTime columns
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+# Blocking DB work runs here instead of on the event loop. One thread per
+# connection the pool can hand out, so extra calls queue in the executor
+# rather than piling up on pool checkout.
+db_executor = ThreadPoolExecutor(max_workers=pool_size + max_overflow, thread_name_prefix="db")
+
+async def run_db(fn, *args, **kwargs):
+    # Carry the caller's context so per-request metrics see the work
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(db_executor, partial(context.run, fn, *args, **kwargs))
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,78 @@
+import asyncio
+import os
+from typing import Optional
+import orjson
+
+event_queue_size = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+event_max_rows = int(os.getenv("EVENT_MAX_ROWS", "1000"))
+event_max_clients = int(os.getenv("EVENT_MAX_CLIENTS", "100"))
+event_heartbeat = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+EVENT_TABLES = ("deliveries", "traffic", "weather")
+
+def sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+class Subscriber:
+    def __init__(self, tables: frozenset):
+        self.tables = tables
+        self.queue = asyncio.Queue(maxsize=event_queue_size)
+        self.dropped = 0
+
+    def offer(self, message: bytes):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client is not keeping up. Rather than buffer without bound or
+            # stall the writers, drop its backlog and tell it to catch up from
+            # the list endpoints with since_id.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.dropped += 1
+            self.queue.put_nowait(sse("resync", {"dropped": self.dropped}))
+
+class Broadcaster:
+    # Process-local fan-out of insert notifications to SSE clients. Only
+    # touched from the event loop thread, so no locking is needed.
+    def __init__(self, max_clients: int = event_max_clients):
+        self.max_clients = max_clients
+        self.subscribers = set()
+
+    def subscribe(self, tables) -> Optional[Subscriber]:
+        if len(self.subscribers) >= self.max_clients:
+            return None
+        subscriber = Subscriber(frozenset(tables))
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def listening(self, table: str) -> bool:
+        return any(table in s.tables for s in self.subscribers)
+
+    def publish(self, table: str, ids: Optional[list[int]], items: list):
+        listeners = [s for s in self.subscribers if table in s.tables]
+        if not listeners or not ids:
+            return
+        data = {"table": table, "count": len(ids), "first_id": ids[0], "last_id": ids[-1]}
+        if len(ids) <= event_max_rows:
+            data["rows"] = [{"id": i, **item.model_dump()} for i, item in zip(ids, items)]
+        # Serialized once and shared by every client
+        message = sse("insert", data)
+        for subscriber in listeners:
+            subscriber.offer(message)
+
+broadcaster = Broadcaster()
+
+async def event_stream(subscriber: Subscriber):
+    try:
+        yield sse("ready", {"tables": sorted(subscriber.tables)})
+        while True:
+            try:
+                yield await asyncio.wait_for(subscriber.queue.get(), timeout=event_heartbeat)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+    finally:
+        broadcaster.unsubscribe(subscriber)
\ No newline at end of file
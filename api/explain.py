@@ -0,0 +1,48 @@
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy.engine import Connection
+from api.database import query_listeners
+
+# While a request runs under capture_queries(), every statement it executes
+# is recorded so its plan can be asked for afterwards with the same parameters.
+captured_queries: ContextVar[Optional[list]] = ContextVar("captured_queries", default=None)
+
+def _capture(conn, cursor, statement, parameters, context, executemany, seconds):
+    captured = captured_queries.get()
+    if captured is not None:
+        captured.append({
+            "statement": statement,
+            "parameters": parameters,
+            "executemany": executemany,
+            "seconds": round(seconds, 6),
+            "rowcount": cursor.rowcount,
+        })
+
+query_listeners.append(_capture)
+
+def is_select(statement: str) -> bool:
+    return statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH")
+
+def query_plan(conn: Connection, statement: str, parameters) -> list:
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        return [{"id": r[0], "parent": r[1], "detail": r[3]} for r in rows]
+    if dialect == "mssql":
+        # SHOWPLAN_TEXT must be alone in its batch; the statement is then
+        # compiled but not run, and the plan arrives as extra result sets.
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("SET SHOWPLAN_TEXT ON")
+            try:
+                cursor.execute(statement, parameters)
+                lines = []
+                while True:
+                    lines.extend(r[0] for r in cursor.fetchall())
+                    if not cursor.nextset():
+                        return lines
+            finally:
+                cursor.execute("SET SHOWPLAN_TEXT OFF")
+        finally:
+            cursor.close()
+    return [r[0] for r in conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()]
@@ -0,0 +1,175 @@
+import copy
+import math
+from collections import namedtuple
+from itertools import islice
+from typing import Annotated, Iterator, Optional
+import pyarrow.compute as pc
+from fastapi import HTTPException, Query
+from sqlalchemy import Integer, Table, and_, cast, literal_column, or_, update
+from api.database import engine
+
+# Coordinates are indexed by an integer grid cell: 0.1 degree cells (about
+# 11 km north-south), numbered row-major from (-90, -180). A bounding box is
+# then a handful of contiguous cell ranges, one per grid row, which the
+# *_cell indexes answer with range seeks before the exact lat/lng check.
+GRID_CELL_DEGREES = 0.1
+GRID_COLUMNS = 3601
+MAX_CELL_RANGES = 64
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+COORDINATES = {"origin": ("origin_lat", "origin_lng"), "dest": ("dest_lat", "dest_lng")}
+
+def _row(lat: float) -> int:
+    return int((lat + 90) / GRID_CELL_DEGREES)
+
+def _column(lng: float) -> int:
+    return int((lng + 180) / GRID_CELL_DEGREES)
+
+def grid_cell(lat: Optional[float], lng: Optional[float]) -> Optional[int]:
+    if lat is None or lng is None:
+        return None
+    return _row(lat) * GRID_COLUMNS + _column(lng)
+
+def cell_default(point: str):
+    # Column default, so ORM inserts and bulk executemany both fill the cell
+    lat, lng = COORDINATES[point]
+
+    def default(context):
+        parameters = context.get_current_parameters()
+        return grid_cell(parameters.get(lat), parameters.get(lng))
+    return default
+
+def cell_expression(table: Table, point: str):
+    # grid_cell in SQL; CAST truncates like int() since both operands are >= 0
+    lat, lng = (table.c[name] for name in COORDINATES[point])
+    return cast((lat + 90) / GRID_CELL_DEGREES, Integer) * GRID_COLUMNS + cast((lng + 180) / GRID_CELL_DEGREES, Integer)
+
+def backfill_cells(conn, table: Table) -> int:
+    # For rows inserted before the cell columns existed
+    count = 0
+    for point in COORDINATES:
+        cell = table.c[f"{point}_cell"]
+        result = conn.execute(update(table).where(cell.is_(None)).values({cell: cell_expression(table, point)}))
+        count += max(result.rowcount, 0)
+    return count
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+PointQuery = Annotated[str, Query(pattern="^(origin|dest|any)$", description="Which coordinates must match")]
+
+class Area:
+    # Bounding box in SQL; radius areas are the circle's box plus an exact
+    # distance check on the candidate rows.
+    radius_km = None
+
+    def __init__(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, point: str):
+        if min_lat > max_lat or min_lng > max_lng:
+            raise HTTPException(status_code=422, detail="min_lat/min_lng must not exceed max_lat/max_lng")
+        self.min_lat, self.min_lng, self.max_lat, self.max_lng = min_lat, min_lng, max_lat, max_lng
+        self.points = ("origin", "dest") if point == "any" else (point,)
+
+    @property
+    def exact(self) -> bool:
+        return self.radius_km is None
+
+    def cell_ranges(self) -> list[tuple[int, int]]:
+        # One contiguous range per grid row; none for boxes too tall to be
+        # worth an index seek, which then fall back to the lat/lng check alone
+        first_row, last_row = _row(self.min_lat), _row(self.max_lat)
+        if last_row - first_row >= MAX_CELL_RANGES:
+            return []
+        first_column, last_column = _column(self.min_lng), _column(self.max_lng)
+        return [(row * GRID_COLUMNS + first_column, row * GRID_COLUMNS + last_column) for row in range(first_row, last_row + 1)]
+
+    def condition(self, table: Table):
+        ranges = self.cell_ranges()
+        matches = []
+        for point in self.points:
+            cell = table.c[f"{point}_cell"]
+            lat, lng = (table.c[name] for name in COORDINATES[point])
+            conditions = [
+                lat.between(self.min_lat, self.max_lat),
+                lng.between(self.min_lng, self.max_lng),
+            ]
+            if ranges:
+                conditions.insert(0, or_(*[cell.between(low, high) for low, high in ranges]))
+            matches.append(and_(*conditions))
+        return or_(*matches)
+
+    def expression(self):
+        # The same box for Parquet reads
+        matches = None
+        for point in self.points:
+            lat, lng = (pc.field(name) for name in COORDINATES[point])
+            match = (lat >= self.min_lat) & (lat <= self.max_lat) & (lng >= self.min_lng) & (lng <= self.max_lng)
+            matches = match if matches is None else matches | match
+        return matches
+
+    def contains(self, row) -> bool:
+        return True
+
+class BoundingBoxParams(Area):
+    def __init__(
+        self,
+        min_lat: Annotated[float, Query(ge=-90, le=90)],
+        min_lng: Annotated[float, Query(ge=-180, le=180)],
+        max_lat: Annotated[float, Query(ge=-90, le=90)],
+        max_lng: Annotated[float, Query(ge=-180, le=180)],
+        point: PointQuery = "any",
+    ):
+        super().__init__(min_lat, min_lng, max_lat, max_lng, point)
+
+class RadiusParams(Area):
+    def __init__(
+        self,
+        lat: Annotated[float, Query(ge=-90, le=90)],
+        lng: Annotated[float, Query(ge=-180, le=180)],
+        radius_km: Annotated[float, Query(gt=0, le=2000)],
+        point: PointQuery = "any",
+    ):
+        dlat = radius_km / KM_PER_DEGREE
+        dlng = min(180.0, radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6)))
+        super().__init__(max(lat - dlat, -90), max(lng - dlng, -180), min(lat + dlat, 90), min(lng + dlng, 180), point)
+        self.lat, self.lng, self.radius_km = lat, lng, radius_km
+
+    def contains(self, row) -> bool:
+        for point in self.points:
+            lat, lng = (getattr(row, name) for name in COORDINATES[point])
+            if lat is not None and lng is not None and haversine_km(self.lat, self.lng, lat, lng) <= self.radius_km:
+                return True
+        return False
+
+def area_select(query, table: Table, area: Area):
+    # Radius checks run on the rows, so they need the coordinates even when
+    # ?fields= leaves them out; area_rows drops them again.
+    names = list(query.selected_columns.keys())
+    if not area.exact:
+        extra = [name for point in area.points for name in COORDINATES[point] if name not in names]
+        query = query.add_columns(*[table.c[name] for name in extra])
+    query = query.where(area.condition(table))
+    if area.cell_ranges() and engine.dialect.name == "sqlite":
+        # Still id order, but as an expression: ORDER BY id lets SQLite pick a
+        # full scan in id order over the cell index seeks to avoid the sort
+        query = query.order_by(None).order_by(table.c.id + literal_column("0", Integer))
+    return query, names
+
+def area_page(page, area: Area):
+    # Radius matches are only known after the distance check, so the page
+    # limit is applied to the checked rows instead of in SQL
+    if area.exact or page.limit is None:
+        return page
+    page = copy.copy(page)
+    page.limit = None
+    return page
+
+def area_rows(rows, area: Area, names: list[str], limit: Optional[int]) -> Iterator:
+    if area.exact:
+        return iter(rows)
+    matches = (row for row in rows if area.contains(row))
+    row_type = namedtuple("AreaRow", names)
+    matches = (row if len(row) == len(names) else row_type(*row[:len(names)]) for row in matches)
+    return islice(matches, limit)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import os
+from typing import Callable, Optional
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from api.cache import response_cache
+from api.database import SessionLocal, run_db
+from api.events import broadcaster
+
+# With INGEST_QUEUE enabled, the single-row POST endpoints hand rows to a
+# per-table queue instead of running one transaction each. A background
+# writer drains the queue into the table's *_batch function, flushing when it
+# has INGEST_MAX_BATCH rows or INGEST_MAX_WAIT_MS after the first row arrived.
+ingest_enabled = os.getenv("INGEST_QUEUE", "false").lower() in ("1", "true", "yes")
+ingest_max_batch = int(os.getenv("INGEST_MAX_BATCH", "1000"))
+ingest_max_wait = float(os.getenv("INGEST_MAX_WAIT_MS", "50")) / 1000
+ingest_max_pending = int(os.getenv("INGEST_MAX_PENDING", "10000"))
+ingest_put_timeout = float(os.getenv("INGEST_PUT_TIMEOUT", "5"))
+
+logger = logging.getLogger(__name__)
+
+class IngestQueue:
+    def __init__(self, table: str, batch_fn: Callable):
+        self.table = table
+        self.batch_fn = batch_fn
+        self.queue = asyncio.Queue(maxsize=ingest_max_pending)
+        self.task = asyncio.create_task(self._run())
+
+    async def put(self, item: BaseModel, future: Optional[asyncio.Future]):
+        # Waiting here is the backpressure: a full queue holds the request
+        # until the writer catches up, then gives up with 503.
+        try:
+            self.queue.put_nowait((item, future))
+            return
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(self.queue.put((item, future)), ingest_put_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail=f"{self.table} ingest queue is full", headers={"Retry-After": "1"})
+
+    async def _collect(self) -> list:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + ingest_max_wait
+        while len(batch) < ingest_max_batch:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _write(self, items: list, return_ids: bool) -> Optional[list[int]]:
+        db = SessionLocal()
+        try:
+            return self.batch_fn(db, items, return_ids)
+        finally:
+            db.close()
+
+    async def _flush(self, batch: list):
+        # Ids only when someone waits for them or listens for the rows
+        return_ids = any(future is not None for _, future in batch) or broadcaster.listening(self.table)
+        try:
+            chunks = [(batch, await run_db(self._write, [item for item, _ in batch], return_ids), None)]
+        except Exception:
+            # Retry row by row so one bad row does not fail the whole batch
+            logger.exception("Batched insert into %s failed; retrying %d rows one at a time", self.table, len(batch))
+            chunks = []
+            for entry in batch:
+                try:
+                    chunks.append(([entry], await run_db(self._write, [entry[0]], return_ids), None))
+                except Exception as exc:
+                    logger.exception("Insert into %s failed", self.table)
+                    chunks.append(([entry], None, exc))
+        response_cache.invalidate(self.table)
+        for chunk, ids, error in chunks:
+            if ids is not None:
+                broadcaster.publish(self.table, ids, [item for item, _ in chunk])
+            for index, (_, future) in enumerate(chunk):
+                if future is None or future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(ids[index])
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                await self._flush(batch)
+            except Exception as exc:
+                # The writer outlives any one batch; waiters get the error
+                logger.exception("Flushing %d rows into %s failed", len(batch), self.table)
+                for _, future in batch:
+                    if future is not None and not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def close(self):
+        await self.queue.join()
+        self.task.cancel()
+
+ingest_queues = {}
+
+async def ingest(response: Response, table: str, batch_fn: Callable, item: BaseModel, wait: bool) -> dict:
+    queue = ingest_queues.get(table)
+    if queue is None:
+        queue = ingest_queues[table] = IngestQueue(table, batch_fn)
+    future = asyncio.get_running_loop().create_future() if wait else None
+    await queue.put(item, future)
+    if future is None:
+        response.status_code = 202
+        return {"status": "queued"}
+    return {"id": await future}
+
+async def close_ingest_queues():
+    # Flush whatever is still queued before the process exits
+    for queue in ingest_queues.values():
+        await queue.close()
+    ingest_queues.clear()
\ No newline at end of file
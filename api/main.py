@@ -1,12 +1,85 @@
-from fastapi import FastAPI
-from api.database import Base, engine
-from api.routers import vehicle, driver, delivery, weather, maintenance, route, sla, traffic
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from api.archive import archive_keep_months, archive_periodically
+from api.cache import cache_table, response_cache
+from api.events import EVENT_TABLES, broadcaster, event_stream
+from api.ingest import close_ingest_queues
+from api.database import Base, debug_endpoints, engine
+from api.metrics import metrics_enabled, observe_request, render_metrics
+from api.serialization import MEDIA_TYPES
+from api.routers import vehicle, driver, delivery, weather, maintenance, route, sla, traffic, debug
 
-app = FastAPI(title="Logistics Dashboard API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    archiver = asyncio.create_task(archive_periodically()) if archive_keep_months else None
+    yield
+    if archiver is not None:
+        archiver.cancel()
+    await close_ingest_queues()
+
+app = FastAPI(title="Logistics Dashboard API", lifespan=lifespan)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+@app.middleware("http")
+async def cache_responses(request: Request, call_next):
+    table = cache_table(request.url.path)
+    if table is None:
+        return await call_next(request)
+    if request.method != "GET":
+        response = await call_next(request)
+        if response.status_code < 400:
+            response_cache.invalidate(table)
+        return response
+    if "stream" in request.query_params:
+        # Streamed responses are never buffered
+        return await call_next(request)
+
+    key = (request.url.path, request.url.query, request.headers.get("accept", ""))
+    entry = response_cache.get(table, key)
+    if entry is None:
+        version = response_cache.version(table)
+        response = await call_next(request)
+        media_type = response.headers.get("content-type", "").split(";")[0]
+        if response.status_code != 200 or media_type not in MEDIA_TYPES:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+        entry = response_cache.put(table, key, version, body, headers)
+
+    if entry.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=entry.validators())
+    return Response(content=entry.body, headers={**entry.headers, **entry.validators()})
+
+if metrics_enabled:
+    # Registered after the cache so it wraps it and times cache hits too
+    app.middleware("http")(observe_request)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/events")
+async def events(tables: Optional[List[str]] = Query(None, description="Any of deliveries, traffic, weather; all by default")):
+    # Server-sent events for rows inserted through the API: one "insert" event
+    # per create or batch call, "resync" when this client fell too far behind.
+    names = [name.strip() for value in tables or [] for name in value.split(",") if name.strip()] or EVENT_TABLES
+    unknown = [name for name in names if name not in EVENT_TABLES]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"No events for: {', '.join(unknown)}")
+    subscriber = broadcaster.subscribe(names)
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many event subscribers")
+    return StreamingResponse(
+        event_stream(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # Include routers
 app.include_router(vehicle.router, prefix="/api")
 app.include_router(driver.router, prefix="/api")
@@ -15,4 +88,6 @@ app.include_router(weather.router, prefix="/api")
 app.include_router(maintenance.router, prefix="/api")
 app.include_router(route.router, prefix="/api")
 app.include_router(sla.router, prefix="/api")
-app.include_router(traffic.router, prefix="/api")
\ No newline at end of file
+app.include_router(traffic.router, prefix="/api")
+if debug_endpoints:
+    app.include_router(debug.router)
@@ -0,0 +1,190 @@
+import bisect
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from starlette.routing import Match
+from api.database import query_listeners
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+metrics_enabled = os.getenv("METRICS", "true").lower() in ("1", "true", "yes")
+
+# Minimal Prometheus text exposition (no client library dependency). Label
+# values are route templates, never raw paths, so cardinality stays bounded.
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self.values.items())
+        return self.header() + [f"{self.name}{_labels(self.labels, key)} {_number(value)}" for key, value in items]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, *labels, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self.values.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + ("+Inf" if bound == float("inf") else _number(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+ROUTE = ("method", "route")
+
+requests_total = Counter("api_requests_total", "HTTP requests by route and status.", ROUTE + ("status",))
+requests_in_progress = Gauge("api_requests_in_progress", "HTTP requests currently being served.", ROUTE)
+request_duration = Histogram("api_request_duration_seconds", "Time from request to last body byte.", ROUTE)
+request_db_duration = Histogram("api_request_db_seconds", "Time spent executing SQL per request.", ROUTE)
+request_db_queries = Histogram("api_request_db_queries", "SQL statements executed per request.", ROUTE, COUNT_BUCKETS)
+request_db_rows = Histogram("api_request_db_rows", "Rows read or written per request.", ROUTE, ROW_BUCKETS)
+db_queries_total = Counter("api_db_queries_total", "SQL statements executed, including background writers.")
+db_duration_total = Counter("api_db_seconds_total", "Time spent executing SQL, including background writers.")
+
+REGISTRY = (
+    requests_total, requests_in_progress, request_duration,
+    request_db_duration, request_db_queries, request_db_rows,
+    db_queries_total, db_duration_total,
+)
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+class RequestStats:
+    __slots__ = ("db_seconds", "queries", "rows")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+
+# Set by the middleware; DB threads see it because run_db copies the context
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def record_rows(count: int):
+    stats = request_stats.get()
+    if stats is not None:
+        stats.rows += count
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany, seconds):
+    db_queries_total.inc()
+    db_duration_total.inc(amount=seconds)
+    stats = request_stats.get()
+    if stats is None:
+        return
+    stats.db_seconds += seconds
+    stats.queries += 1
+    # Selected rows are counted where they are serialized and RETURNING rows
+    # where they are read (api.crud.bulk): drivers report no rowcount for
+    # those until they are fetched. Other DML reports its own.
+    if context is None or getattr(context.compiled, "effective_returning", None):
+        return
+    if (context.isinsert or context.isupdate or context.isdelete) and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+query_listeners.append(_query_finished)
+
+def route_template(app, scope) -> str:
+    # The matched path template (/api/vehicles/{vehicle_id}), not the raw path
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+async def _observed(body, finish):
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        finish()
+
+async def observe_request(request, call_next):
+    labels = (request.method, route_template(request.app, request.scope))
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    requests_in_progress.inc(*labels)
+    start = time.perf_counter()
+
+    def finish(status: int):
+        requests_in_progress.dec(*labels)
+        requests_total.inc(*labels, str(status))
+        request_duration.observe(*labels, value=time.perf_counter() - start)
+        request_db_duration.observe(*labels, value=stats.db_seconds)
+        request_db_queries.observe(*labels, value=stats.queries)
+        request_db_rows.observe(*labels, value=stats.rows)
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        finish(500)
+        raise
+    finally:
+        request_stats.reset(token)
+    # Streamed bodies keep reading rows after the headers go out, so the
+    # request is only finished once the last chunk has been sent
+    response.body_iterator = _observed(response.body_iterator, lambda: finish(response.status_code))
+    return response
@@ -1,15 +1,21 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime
-from api.database import Base
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Index
+from api.database import Base, utcnow
+from api.geo import cell_default
 
 class Delivery(Base):
     __tablename__ = "deliveries"
+    __table_args__ = (
+        Index("ix_deliveries_date_sla_type", "date", "sla_type"),
+        Index("ix_deliveries_vehicle_id_date", "vehicle_id", "date"),
+        Index("ix_deliveries_driver_id_date", "driver_id", "date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer)
     driver_id = Column(Integer)
     scheduled_time = Column(DateTime)
     actual_time = Column(DateTime)
-    status = Column(String)
-    sla_type = Column(String)
+    status = Column(String(50), index=True)
+    sla_type = Column(String(50), index=True)
     distance_km = Column(Float)
     fuel_consumed = Column(Float)
     idle_time_min = Column(Float)
@@ -18,6 +24,8 @@ class Delivery(Base):
     origin_lng = Column(Float)
     dest_lat = Column(Float)
     dest_lng = Column(Float)
+    origin_cell = Column(Integer, default=cell_default("origin"), index=True, info={"internal": True})
+    dest_cell = Column(Integer, default=cell_default("dest"), index=True, info={"internal": True})
     estimated_time_min = Column(Float)
     actual_time_min = Column(Float)
     fuel_efficiency = Column(Float)
@@ -35,4 +43,5 @@ class Delivery(Base):
     date = Column(DateTime)
     time_of_day = Column(String)
     day_of_week = Column(String)
-    is_weekend = Column(Boolean)
\ No newline at end of file
+    is_weekend = Column(Boolean)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Float, Date
+from api.database import Base
+
+class DeliveryDailyStats(Base):
+    # Rollup of deliveries per day x sla_type x status x compliance, kept in
+    # step with the deliveries table by api.crud.delivery_stats.
+    __tablename__ = "delivery_daily_stats"
+    date = Column(Date, primary_key=True)
+    sla_type = Column(String(50), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    sla_compliance = Column(Integer, primary_key=True)
+    delivery_count = Column(Integer, nullable=False, default=0)
+    delay_minutes_sum = Column(Float, nullable=False, default=0)
+    fuel_consumed_sum = Column(Float, nullable=False, default=0)
+    penalty_amount_sum = Column(Float, nullable=False, default=0)
+    distance_km_sum = Column(Float, nullable=False, default=0)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime
-from api.database import Base
+from api.database import Base, utcnow
 
 class Driver(Base):
     __tablename__ = "drivers"
@@ -10,6 +10,8 @@ class Driver(Base):
     punctuality_score = Column(Float)
     incident_count = Column(Integer)
     status = Column(String)
-    training_completed = Column(String)
+    # Stored as "Yes"/"No"; returned as the bool DriverResponse declares
+    training_completed = Column(String, info={"boolean": True})
     joined_date = Column(DateTime)
-    contact_number = Column(String)
\ No newline at end of file
+    contact_number = Column(String)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
\ No newline at end of file
@@ -1,12 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
-from api.database import Base
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from api.database import Base, utcnow
 
 class Maintenance(Base):
     __tablename__ = "maintenance"
+    __table_args__ = (
+        Index("ix_maintenance_vehicle_id_date", "vehicle_id", "date"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer)
-    date = Column(DateTime)
+    date = Column(DateTime, index=True)
     type = Column(String)
     cost = Column(Float)
     description = Column(String)
-    status = Column(String)
\ No newline at end of file
+    status = Column(String)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
\ No newline at end of file
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float
-from api.database import Base
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from api.database import Base, utcnow
+from api.geo import cell_default
 
 class Route(Base):
     __tablename__ = "routes"
@@ -8,6 +9,9 @@ class Route(Base):
     origin_lng = Column(Float)
     dest_lat = Column(Float)
     dest_lng = Column(Float)
+    origin_cell = Column(Integer, default=cell_default("origin"), index=True, info={"internal": True})
+    dest_cell = Column(Integer, default=cell_default("dest"), index=True, info={"internal": True})
     distance_km = Column(Float)
     typical_traffic = Column(Float)
-    route_name = Column(String)
\ No newline at end of file
+    route_name = Column(String)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
\ No newline at end of file
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float
-from api.database import Base
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from api.database import Base, utcnow
 
 class SLA(Base):
     __tablename__ = "slas"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String)
     max_hours = Column(Float)
-    penalty = Column(Float)
\ No newline at end of file
+    penalty = Column(Float)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
\ No newline at end of file
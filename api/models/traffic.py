@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
-from api.database import Base
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from api.database import Base, utcnow
 
 class Traffic(Base):
     __tablename__ = "traffic"
+    __table_args__ = (
+        Index("ix_traffic_location_timestamp", "location", "timestamp"),
+    )
     id = Column(Integer, primary_key=True, index=True)
-    location = Column(String)
-    timestamp = Column(DateTime)
+    location = Column(String(100))
+    timestamp = Column(DateTime, index=True)
     traffic_index = Column(Float)
     delay_minutes = Column(Float)
-    severity = Column(String)
\ No newline at end of file
+    severity = Column(String)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
\ No newline at end of file
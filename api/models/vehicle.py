@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime
-from api.database import Base
+from api.database import Base, utcnow
 
 class Vehicle(Base):
     __tablename__ = "vehicles"
@@ -13,4 +13,5 @@ class Vehicle(Base):
     avg_fuel_consumption = Column(Float)
     engine_hours = Column(Integer)
     tire_condition = Column(String)
-    battery_health = Column(Integer)
\ No newline at end of file
+    battery_health = Column(Integer)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
\ No newline at end of file
@@ -1,13 +1,17 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
-from api.database import Base
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from api.database import Base, utcnow
 
 class Weather(Base):
     __tablename__ = "weather"
+    __table_args__ = (
+        Index("ix_weather_location_timestamp", "location", "timestamp"),
+    )
     id = Column(Integer, primary_key=True, index=True)
-    location = Column(String)
-    timestamp = Column(DateTime)
+    location = Column(String(100))
+    timestamp = Column(DateTime, index=True)
     temperature = Column(Float)
     condition = Column(String)
     wind_speed = Column(Float)
     humidity = Column(Integer)
-    severity = Column(String)
\ No newline at end of file
+    severity = Column(String)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, index=True)
\ No newline at end of file
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Annotated, List, Optional
+from fastapi import Header, HTTPException, Query
+from sqlalchemy import Boolean, Table, case, func, null, select, type_coerce
+from api.serialization import PARQUET, negotiate
+
+MAX_PAGE_SIZE = 10000
+
+class PageParams:
+    def __init__(
+        self,
+        limit: Annotated[Optional[int], Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+        after_id: Annotated[Optional[int], Query(ge=0)] = None,
+        since_id: Annotated[Optional[int], Query(ge=0, description="Only rows inserted after this id")] = None,
+        updated_since: Annotated[Optional[datetime], Query(description="Only rows modified after this UTC time")] = None,
+        stream: bool = False,
+        fields: Annotated[Optional[List[str]], Query(description="Columns to return, comma-separated or repeated")] = None,
+        accept: Annotated[Optional[str], Header()] = None,
+    ):
+        self.limit = limit
+        # since_id is the same cursor as after_id, named for delta sync clients
+        self.after_id = after_id if since_id is None else max(since_id, after_id or 0)
+        self.updated_since = updated_since
+        self.stream = stream
+        self.fields = [name.strip() for value in fields or [] for name in value.split(",") if name.strip()] or None
+        self.media_type = negotiate(accept)
+        if stream and self.media_type == PARQUET:
+            raise HTTPException(status_code=406, detail="Parquet cannot be streamed; request Arrow or drop stream=true")
+
+def keyset(query, id_column, limit: Optional[int] = None, after_id: Optional[int] = None):
+    # Keyset pagination on the primary key: the next page starts after the
+    # last id seen, so every page is an index seek rather than an OFFSET scan.
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    query = query.order_by(id_column)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+# The strings Pydantic reads as True for a bool field
+TRUE_STRINGS = ("1", "on", "t", "true", "y", "yes")
+
+def output_column(column):
+    # Columns marked info={"boolean": True} hold strings but are returned as
+    # bools, converted in the SELECT as the response schema's bool field did
+    if column.info.get("boolean"):
+        value = case((column.is_(None), null()), (func.lower(column).in_(TRUE_STRINGS), 1), else_=0)
+        return type_coerce(value, Boolean).label(column.name)
+    return column
+
+def project(table: Table, fields: Optional[List[str]]) -> list:
+    # Columns marked info={"internal": True} (index keys such as *_cell) are never returned
+    columns = [column for column in table.columns if not column.info.get("internal")]
+    if not fields:
+        return [output_column(column) for column in columns]
+    unknown = [name for name in fields if name not in table.columns or table.columns[name].info.get("internal")]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields for {table.name}: {', '.join(unknown)}")
+    # id is always returned: it is the keyset cursor
+    names = ["id"] + [name for name in dict.fromkeys(fields) if name != "id"]
+    return [output_column(table.columns[name]) for name in names]
+
+def page_select(table: Table, page: PageParams):
+    query = select(*project(table, page.fields))
+    if page.updated_since is not None:
+        query = query.where(table.c.updated_at > page.updated_since)
+    return keyset(query, table.c.id, page.limit, page.after_id)
+
+def next_cursor_headers(rows: list, limit: Optional[int]) -> dict:
+    if limit is not None and len(rows) == limit:
+        return {"X-Next-After-Id": str(rows[-1].id)}
+    return {}
@@ -0,0 +1,80 @@
+import asyncio
+from urllib.parse import urlsplit
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from api.database import engine, run_db
+from api.explain import captured_queries, is_select, query_plan
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+async def _call(request: Request, url: str) -> tuple[int, int]:
+    # Runs a GET against the routes directly, below the response cache and
+    # metrics middleware, so its queries always reach the database.
+    target = urlsplit(url)
+    headers = [(k, v) for k, v in request.scope["headers"] if k not in (b"if-none-match", b"if-modified-since")]
+    scope = {k: v for k, v in request.scope.items() if k not in ("route", "endpoint", "path_params")}
+    scope.update(
+        method="GET", path=target.path, raw_path=target.path.encode(),
+        query_string=target.query.encode(), headers=headers, root_path="",
+    )
+    sent = False
+    status, size = 500, 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    try:
+        await request.app.router(scope, receive, send)
+    except StarletteHTTPException as exc:
+        status = exc.status_code
+    except RequestValidationError:
+        status = 422
+    return status, size
+
+def _plans(queries: list) -> list:
+    with engine.connect() as conn:
+        for query in queries:
+            if query["executemany"] or not is_select(query["statement"]):
+                continue
+            query["plan"] = query_plan(conn, query["statement"], query["parameters"])
+            conn.rollback()
+    return queries
+
+@router.get("/explain")
+async def explain(request: Request, url: str = Query(..., description="URL-encoded GET path with its query, e.g. /api/deliveries/query?status=Delayed")):
+    if not url.startswith("/api/"):
+        raise HTTPException(status_code=422, detail="url must be an /api/ path")
+    captured = []
+    token = captured_queries.set(captured)
+    try:
+        status, size = await _call(request, url)
+    finally:
+        captured_queries.reset(token)
+    queries = await run_db(_plans, captured)
+    return {
+        "url": url,
+        "status": status,
+        "response_bytes": size,
+        "queries": [
+            {
+                "statement": " ".join(q["statement"].split()),
+                "parameters": q["parameters"],
+                "seconds": q["seconds"],
+                "rowcount": q["rowcount"],
+                "plan": q.get("plan"),
+            }
+            for q in queries
+        ],
+    }
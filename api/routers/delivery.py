@@ -1,28 +1,113 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
-from api.schemas.delivery import DeliveryCreate, DeliveryResponse
-from api.crud.delivery import create_delivery, create_delivery_batch, delete_all_deliveries, get_deliveries
-from api.database import get_db
+from datetime import date
+from typing import List, Optional, Union
+from api.schemas.delivery import DeliveryCreate, DeliveryResponse, DeliveryFilters, DeliveryKPIs
+from api.schemas.delivery_stats import DeliveryDailyStatsResponse
+from api.crud.delivery import create_delivery, create_delivery_batch, delete_all_deliveries, get_deliveries, stream_deliveries, get_delivery_kpis, get_delivery_daily_stats
+from api.crud.delivery_stats import STATS_KEYS
+from api.database import get_db, run_db
+from api.ingest import ingest, ingest_enabled
+from api.events import broadcaster
+from api.geo import BoundingBoxParams, RadiusParams
+from api.pagination import PageParams, next_cursor_headers
+from api.serialization import negotiate, rows_response, stream_response
 
 router = APIRouter(prefix="/deliveries", tags=["deliveries"])
 
+def delivery_filters(
+    status: Optional[List[str]] = Query(None),
+    sla_type: Optional[List[str]] = Query(None),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    compliance: str = Query("All", pattern="^(All|Compliant|Non-Compliant)$"),
+    vehicle_id: Optional[List[int]] = Query(None),
+    driver_id: Optional[List[int]] = Query(None),
+) -> DeliveryFilters:
+    return DeliveryFilters(
+        status=status,
+        sla_type=sla_type,
+        start_date=start_date,
+        end_date=end_date,
+        compliance=compliance,
+        vehicle_id=vehicle_id,
+        driver_id=driver_id,
+    )
+
 @router.post("/", response_model=dict)
-async def create_delivery_endpoint(delivery: DeliveryCreate, db: Session = Depends(get_db)):
-    db_delivery = create_delivery(db, delivery)
+async def create_delivery_endpoint(delivery: DeliveryCreate, response: Response, wait: bool = False, db: Session = Depends(get_db)):
+    if ingest_enabled:
+        return await ingest(response, "deliveries", create_delivery_batch, delivery, wait)
+    db_delivery = await run_db(create_delivery, db, delivery)
+    broadcaster.publish("deliveries", [db_delivery.id], [delivery])
     return {"id": db_delivery.id}
 
-@router.post("/batch", response_model=List[dict])
-async def create_delivery_batch_endpoint(deliveries: List[DeliveryCreate], db: Session = Depends(get_db)):
-    db_deliveries = create_delivery_batch(db, deliveries)
-    return [{"id": d.id} for d in db_deliveries]
+@router.post("/batch", response_model=Union[List[dict], dict])
+async def create_delivery_batch_endpoint(deliveries: List[DeliveryCreate], return_ids: bool = True, db: Session = Depends(get_db)):
+    ids = await run_db(create_delivery_batch, db, deliveries, return_ids or broadcaster.listening("deliveries"))
+    broadcaster.publish("deliveries", ids, deliveries)
+    if ids is None:
+        return {"count": len(deliveries)}
+    return [{"id": i} for i in ids]
 
 @router.delete("/all", response_model=dict)
 async def delete_deliveries_endpoint(db: Session = Depends(get_db)):
-    delete_all_deliveries(db)
+    await run_db(delete_all_deliveries, db)
     return {"status": "deleted"}
 
 @router.get("/", response_model=List[DeliveryResponse])
-async def get_deliveries_endpoint(db: Session = Depends(get_db)):
-    deliveries = get_deliveries(db)
-    return deliveries
\ No newline at end of file
+async def get_deliveries_endpoint(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_deliveries, db, page), page.media_type)
+    deliveries = await run_db(get_deliveries, db, page)
+    return rows_response(deliveries, page.media_type, next_cursor_headers(deliveries, page.limit))
+
+@router.get("/query", response_model=List[DeliveryResponse])
+async def query_deliveries_endpoint(filters: DeliveryFilters = Depends(delivery_filters), page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_deliveries, db, page, filters), page.media_type)
+    deliveries = await run_db(get_deliveries, db, page, filters)
+    return rows_response(deliveries, page.media_type, next_cursor_headers(deliveries, page.limit))
+
+@router.get("/within", response_model=List[DeliveryResponse])
+async def deliveries_within_endpoint(area: BoundingBoxParams = Depends(), filters: DeliveryFilters = Depends(delivery_filters), page: PageParams = Depends(), db: Session = Depends(get_db)):
+    # Deliveries whose origin and/or destination lies in the box, e.g. a map viewport
+    if page.stream:
+        return stream_response(await run_db(stream_deliveries, db, page, filters, area), page.media_type)
+    deliveries = await run_db(get_deliveries, db, page, filters, area)
+    return rows_response(deliveries, page.media_type, next_cursor_headers(deliveries, page.limit))
+
+@router.get("/near", response_model=List[DeliveryResponse])
+async def deliveries_near_endpoint(area: RadiusParams = Depends(), filters: DeliveryFilters = Depends(delivery_filters), page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_deliveries, db, page, filters, area), page.media_type)
+    deliveries = await run_db(get_deliveries, db, page, filters, area)
+    return rows_response(deliveries, page.media_type, next_cursor_headers(deliveries, page.limit))
+
+@router.get("/kpis", response_model=List[DeliveryKPIs])
+async def get_delivery_kpis_endpoint(
+    filters: DeliveryFilters = Depends(delivery_filters),
+    group_by: Optional[str] = Query(None, pattern="^(sla_type|status|day_of_week|time_of_day)$"),
+    on_time_threshold: float = 0,
+    db: Session = Depends(get_db),
+):
+    return await run_db(get_delivery_kpis, db, filters, group_by, on_time_threshold)
+
+@router.get("/daily-stats", response_model=List[DeliveryDailyStatsResponse])
+async def get_delivery_daily_stats_endpoint(
+    filters: DeliveryFilters = Depends(delivery_filters),
+    group_by: Optional[List[str]] = Query(None, description="Any of date, sla_type, status, sla_compliance; empty for totals"),
+    accept: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    # Served from the delivery_daily_stats rollup, so the cost depends on the
+    # number of days and groups rather than on the number of deliveries.
+    if filters.vehicle_id or filters.driver_id:
+        raise HTTPException(status_code=422, detail="vehicle_id and driver_id are not kept in the daily rollup; use /deliveries/kpis")
+    if group_by is not None:
+        group_by = [name.strip() for value in group_by for name in value.split(",") if name.strip()]
+        unknown = [name for name in group_by if name not in STATS_KEYS]
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Cannot group daily stats by: {', '.join(unknown)}")
+    stats = await run_db(get_delivery_daily_stats, db, filters, group_by)
+    return rows_response(stats, negotiate(accept))
\ No newline at end of file
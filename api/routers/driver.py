@@ -1,28 +1,37 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Union
 from api.schemas.driver import DriverCreate, DriverResponse
-from api.crud.driver import create_driver, create_driver_batch, delete_all_drivers, get_drivers
-from api.database import get_db
+from api.crud.driver import create_driver, create_driver_batch, delete_all_drivers, get_drivers, stream_drivers
+from api.database import get_db, run_db
+from api.ingest import ingest, ingest_enabled
+from api.pagination import PageParams, next_cursor_headers
+from api.serialization import rows_response, stream_response
 
 router = APIRouter(prefix="/drivers", tags=["drivers"])
 
 @router.post("/", response_model=dict)
-async def create_driver_endpoint(driver: DriverCreate, db: Session = Depends(get_db)):
-    db_driver = create_driver(db, driver)
+async def create_driver_endpoint(driver: DriverCreate, response: Response, wait: bool = False, db: Session = Depends(get_db)):
+    if ingest_enabled:
+        return await ingest(response, "drivers", create_driver_batch, driver, wait)
+    db_driver = await run_db(create_driver, db, driver)
     return {"id": db_driver.id}
 
-@router.post("/batch", response_model=List[dict])
-async def create_driver_batch_endpoint(drivers: List[DriverCreate], db: Session = Depends(get_db)):
-    db_drivers = create_driver_batch(db, drivers)
-    return [{"id": d.id} for d in db_drivers]
+@router.post("/batch", response_model=Union[List[dict], dict])
+async def create_driver_batch_endpoint(drivers: List[DriverCreate], return_ids: bool = True, db: Session = Depends(get_db)):
+    ids = await run_db(create_driver_batch, db, drivers, return_ids)
+    if ids is None:
+        return {"count": len(drivers)}
+    return [{"id": i} for i in ids]
 
 @router.delete("/all", response_model=dict)
 async def delete_drivers_endpoint(db: Session = Depends(get_db)):
-    delete_all_drivers(db)
+    await run_db(delete_all_drivers, db)
     return {"status": "deleted"}
 
 @router.get("/", response_model=List[DriverResponse])
-async def get_drivers_endpoint(db: Session = Depends(get_db)):
-    drivers = get_drivers(db)
-    return drivers
\ No newline at end of file
+async def get_drivers_endpoint(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_drivers, db, page), page.media_type)
+    drivers = await run_db(get_drivers, db, page)
+    return rows_response(drivers, page.media_type, next_cursor_headers(drivers, page.limit))
\ No newline at end of file
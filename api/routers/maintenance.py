@@ -1,28 +1,37 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Union
 from api.schemas.maintenance import MaintenanceCreate, MaintenanceResponse
-from api.crud.maintenance import create_maintenance, create_maintenance_batch, delete_all_maintenance, get_maintenance
-from api.database import get_db
+from api.crud.maintenance import create_maintenance, create_maintenance_batch, delete_all_maintenance, get_maintenance, stream_maintenance
+from api.database import get_db, run_db
+from api.ingest import ingest, ingest_enabled
+from api.pagination import PageParams, next_cursor_headers
+from api.serialization import rows_response, stream_response
 
 router = APIRouter(prefix="/maintenance", tags=["maintenance"])
 
 @router.post("/", response_model=dict)
-async def create_maintenance_endpoint(maintenance: MaintenanceCreate, db: Session = Depends(get_db)):
-    db_maintenance = create_maintenance(db, maintenance)
+async def create_maintenance_endpoint(maintenance: MaintenanceCreate, response: Response, wait: bool = False, db: Session = Depends(get_db)):
+    if ingest_enabled:
+        return await ingest(response, "maintenance", create_maintenance_batch, maintenance, wait)
+    db_maintenance = await run_db(create_maintenance, db, maintenance)
     return {"id": db_maintenance.id}
 
-@router.post("/batch", response_model=List[dict])
-async def create_maintenance_batch_endpoint(maintenances: List[MaintenanceCreate], db: Session = Depends(get_db)):
-    db_maintenances = create_maintenance_batch(db, maintenances)
-    return [{"id": m.id} for m in db_maintenances]
+@router.post("/batch", response_model=Union[List[dict], dict])
+async def create_maintenance_batch_endpoint(maintenances: List[MaintenanceCreate], return_ids: bool = True, db: Session = Depends(get_db)):
+    ids = await run_db(create_maintenance_batch, db, maintenances, return_ids)
+    if ids is None:
+        return {"count": len(maintenances)}
+    return [{"id": i} for i in ids]
 
 @router.delete("/all", response_model=dict)
 async def delete_maintenance_endpoint(db: Session = Depends(get_db)):
-    delete_all_maintenance(db)
+    await run_db(delete_all_maintenance, db)
     return {"status": "deleted"}
 
 @router.get("/", response_model=List[MaintenanceResponse])
-async def get_maintenance_endpoint(db: Session = Depends(get_db)):
-    maintenance = get_maintenance(db)
-    return maintenance
\ No newline at end of file
+async def get_maintenance_endpoint(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_maintenance, db, page), page.media_type)
+    maintenance = await run_db(get_maintenance, db, page)
+    return rows_response(maintenance, page.media_type, next_cursor_headers(maintenance, page.limit))
\ No newline at end of file
@@ -1,28 +1,52 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Union
 from api.schemas.route import RouteCreate, RouteResponse
-from api.crud.route import create_route, create_routes_batch, delete_all_routes, get_routes
-from api.database import get_db
+from api.crud.route import create_route, create_routes_batch, delete_all_routes, get_routes, stream_routes
+from api.database import get_db, run_db
+from api.geo import BoundingBoxParams, RadiusParams
+from api.ingest import ingest, ingest_enabled
+from api.pagination import PageParams, next_cursor_headers
+from api.serialization import rows_response, stream_response
 
 router = APIRouter(prefix="/routes", tags=["routes"])
 
 @router.post("/", response_model=dict)
-async def create_route_endpoint(route: RouteCreate, db: Session = Depends(get_db)):
-    db_route = create_route(db, route)
+async def create_route_endpoint(route: RouteCreate, response: Response, wait: bool = False, db: Session = Depends(get_db)):
+    if ingest_enabled:
+        return await ingest(response, "routes", create_routes_batch, route, wait)
+    db_route = await run_db(create_route, db, route)
     return {"id": db_route.id}
 
-@router.post("/batch", response_model=List[dict])
-async def create_routes_batch_endpoint(routes: List[RouteCreate], db: Session = Depends(get_db)):
-    db_routes = create_routes_batch(db, routes)
-    return [{"id": r.id} for r in db_routes]
+@router.post("/batch", response_model=Union[List[dict], dict])
+async def create_routes_batch_endpoint(routes: List[RouteCreate], return_ids: bool = True, db: Session = Depends(get_db)):
+    ids = await run_db(create_routes_batch, db, routes, return_ids)
+    if ids is None:
+        return {"count": len(routes)}
+    return [{"id": i} for i in ids]
 
 @router.delete("/all", response_model=dict)
 async def delete_routes_endpoint(db: Session = Depends(get_db)):
-    delete_all_routes(db)
+    await run_db(delete_all_routes, db)
     return {"status": "deleted"}
 
 @router.get("/", response_model=List[RouteResponse])
-async def get_routes_endpoint(db: Session = Depends(get_db)):
-    routes = get_routes(db)
-    return routes
\ No newline at end of file
+async def get_routes_endpoint(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_routes, db, page), page.media_type)
+    routes = await run_db(get_routes, db, page)
+    return rows_response(routes, page.media_type, next_cursor_headers(routes, page.limit))
+
+@router.get("/within", response_model=List[RouteResponse])
+async def routes_within_endpoint(area: BoundingBoxParams = Depends(), page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_routes, db, page, area), page.media_type)
+    routes = await run_db(get_routes, db, page, area)
+    return rows_response(routes, page.media_type, next_cursor_headers(routes, page.limit))
+
+@router.get("/near", response_model=List[RouteResponse])
+async def routes_near_endpoint(area: RadiusParams = Depends(), page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_routes, db, page, area), page.media_type)
+    routes = await run_db(get_routes, db, page, area)
+    return rows_response(routes, page.media_type, next_cursor_headers(routes, page.limit))
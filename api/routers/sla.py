@@ -1,28 +1,37 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Union
 from api.schemas.sla import SLACreate, SLAResponse
-from api.crud.sla import create_sla, create_slas_batch, delete_all_slas, get_slas
-from api.database import get_db
+from api.crud.sla import create_sla, create_slas_batch, delete_all_slas, get_slas, stream_slas
+from api.database import get_db, run_db
+from api.ingest import ingest, ingest_enabled
+from api.pagination import PageParams, next_cursor_headers
+from api.serialization import rows_response, stream_response
 
 router = APIRouter(prefix="/slas", tags=["slas"])
 
 @router.post("/", response_model=dict)
-async def create_sla_endpoint(sla: SLACreate, db: Session = Depends(get_db)):
-    db_sla = create_sla(db, sla)
+async def create_sla_endpoint(sla: SLACreate, response: Response, wait: bool = False, db: Session = Depends(get_db)):
+    if ingest_enabled:
+        return await ingest(response, "slas", create_slas_batch, sla, wait)
+    db_sla = await run_db(create_sla, db, sla)
     return {"id": db_sla.id}
 
-@router.post("/batch", response_model=List[dict])
-async def create_slas_batch_endpoint(slas: List[SLACreate], db: Session = Depends(get_db)):
-    db_slas = create_slas_batch(db, slas)
-    return [{"id": s.id} for s in db_slas]
+@router.post("/batch", response_model=Union[List[dict], dict])
+async def create_slas_batch_endpoint(slas: List[SLACreate], return_ids: bool = True, db: Session = Depends(get_db)):
+    ids = await run_db(create_slas_batch, db, slas, return_ids)
+    if ids is None:
+        return {"count": len(slas)}
+    return [{"id": i} for i in ids]
 
 @router.delete("/all", response_model=dict)
 async def delete_slas_endpoint(db: Session = Depends(get_db)):
-    delete_all_slas(db)
+    await run_db(delete_all_slas, db)
     return {"status": "deleted"}
 
 @router.get("/", response_model=List[SLAResponse])
-async def get_slas_endpoint(db: Session = Depends(get_db)):
-    slas = get_slas(db)
-    return slas
\ No newline at end of file
+async def get_slas_endpoint(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_slas, db, page), page.media_type)
+    slas = await run_db(get_slas, db, page)
+    return rows_response(slas, page.media_type, next_cursor_headers(slas, page.limit))
\ No newline at end of file
@@ -1,28 +1,46 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from typing import List
-from api.schemas.traffic import TrafficCreate, TrafficResponse
-from api.crud.traffic import create_traffic, create_traffic_batch, delete_all_traffic, get_traffic
-from api.database import get_db
+from typing import List, Union
+from api.schemas.traffic import TrafficCreate, TrafficResponse, TrafficTimeseriesPoint
+from api.crud.traffic import create_traffic, create_traffic_batch, delete_all_traffic, get_traffic, stream_traffic, get_traffic_timeseries
+from api.database import get_db, run_db
+from api.ingest import ingest, ingest_enabled
+from api.events import broadcaster
+from api.pagination import PageParams, next_cursor_headers
+from api.serialization import rows_response, stream_response
+from api.timeseries import TimeseriesParams
 
 router = APIRouter(prefix="/traffic", tags=["traffic"])
 
 @router.post("/", response_model=dict)
-async def create_traffic_endpoint(traffic: TrafficCreate, db: Session = Depends(get_db)):
-    db_traffic = create_traffic(db, traffic)
+async def create_traffic_endpoint(traffic: TrafficCreate, response: Response, wait: bool = False, db: Session = Depends(get_db)):
+    if ingest_enabled:
+        return await ingest(response, "traffic", create_traffic_batch, traffic, wait)
+    db_traffic = await run_db(create_traffic, db, traffic)
+    broadcaster.publish("traffic", [db_traffic.id], [traffic])
     return {"id": db_traffic.id}
 
-@router.post("/batch", response_model=List[dict])
-async def create_traffic_batch_endpoint(traffics: List[TrafficCreate], db: Session = Depends(get_db)):
-    db_traffics = create_traffic_batch(db, traffics)
-    return [{"id": t.id} for t in db_traffics]
+@router.post("/batch", response_model=Union[List[dict], dict])
+async def create_traffic_batch_endpoint(traffics: List[TrafficCreate], return_ids: bool = True, db: Session = Depends(get_db)):
+    ids = await run_db(create_traffic_batch, db, traffics, return_ids or broadcaster.listening("traffic"))
+    broadcaster.publish("traffic", ids, traffics)
+    if ids is None:
+        return {"count": len(traffics)}
+    return [{"id": i} for i in ids]
 
 @router.delete("/all", response_model=dict)
 async def delete_traffic_endpoint(db: Session = Depends(get_db)):
-    delete_all_traffic(db)
+    await run_db(delete_all_traffic, db)
     return {"status": "deleted"}
 
 @router.get("/", response_model=List[TrafficResponse])
-async def get_traffic_endpoint(db: Session = Depends(get_db)):
-    traffic = get_traffic(db)
-    return traffic
\ No newline at end of file
+async def get_traffic_endpoint(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_traffic, db, page), page.media_type)
+    traffic = await run_db(get_traffic, db, page)
+    return rows_response(traffic, page.media_type, next_cursor_headers(traffic, page.limit))
+
+@router.get("/timeseries", response_model=List[TrafficTimeseriesPoint])
+async def get_traffic_timeseries_endpoint(params: TimeseriesParams = Depends(), db: Session = Depends(get_db)):
+    points = await run_db(get_traffic_timeseries, db, params)
+    return rows_response(points, params.media_type)
\ No newline at end of file
@@ -1,28 +1,37 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Union
 from api.schemas.vehicle import VehicleCreate, VehicleResponse
-from api.crud.vehicle import create_vehicle, create_vehicle_batch, delete_all_vehicles, get_vehicles
-from api.database import get_db
+from api.crud.vehicle import create_vehicle, create_vehicle_batch, delete_all_vehicles, get_vehicles, stream_vehicles
+from api.database import get_db, run_db
+from api.ingest import ingest, ingest_enabled
+from api.pagination import PageParams, next_cursor_headers
+from api.serialization import rows_response, stream_response
 
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 
 @router.post("/", response_model=dict)
-async def create_vehicle_endpoint(vehicle: VehicleCreate, db: Session = Depends(get_db)):
-    db_vehicle = create_vehicle(db, vehicle)
+async def create_vehicle_endpoint(vehicle: VehicleCreate, response: Response, wait: bool = False, db: Session = Depends(get_db)):
+    if ingest_enabled:
+        return await ingest(response, "vehicles", create_vehicle_batch, vehicle, wait)
+    db_vehicle = await run_db(create_vehicle, db, vehicle)
     return {"id": db_vehicle.id}
 
-@router.post("/batch", response_model=List[dict])
-async def create_vehicle_batch_endpoint(vehicles: List[VehicleCreate], db: Session = Depends(get_db)):
-    db_vehicles = create_vehicle_batch(db, vehicles)
-    return [{"id": v.id} for v in db_vehicles]
+@router.post("/batch", response_model=Union[List[dict], dict])
+async def create_vehicle_batch_endpoint(vehicles: List[VehicleCreate], return_ids: bool = True, db: Session = Depends(get_db)):
+    ids = await run_db(create_vehicle_batch, db, vehicles, return_ids)
+    if ids is None:
+        return {"count": len(vehicles)}
+    return [{"id": i} for i in ids]
 
 @router.delete("/all", response_model=dict)
 async def delete_vehicles_endpoint(db: Session = Depends(get_db)):
-    delete_all_vehicles(db)
+    await run_db(delete_all_vehicles, db)
     return {"status": "deleted"}
 
 @router.get("/", response_model=List[VehicleResponse])
-async def get_vehicles_endpoint(db: Session = Depends(get_db)):
-    vehicles = get_vehicles(db)
-    return vehicles
\ No newline at end of file
+async def get_vehicles_endpoint(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_vehicles, db, page), page.media_type)
+    vehicles = await run_db(get_vehicles, db, page)
+    return rows_response(vehicles, page.media_type, next_cursor_headers(vehicles, page.limit))
\ No newline at end of file
@@ -1,28 +1,46 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.orm import Session
-from typing import List
-from api.schemas.weather import WeatherCreate, WeatherResponse
-from api.crud.weather import create_weather, create_weather_batch, delete_all_weather, get_weather
-from api.database import get_db
+from typing import List, Union
+from api.schemas.weather import WeatherCreate, WeatherResponse, WeatherTimeseriesPoint
+from api.crud.weather import create_weather, create_weather_batch, delete_all_weather, get_weather, stream_weather, get_weather_timeseries
+from api.database import get_db, run_db
+from api.ingest import ingest, ingest_enabled
+from api.events import broadcaster
+from api.pagination import PageParams, next_cursor_headers
+from api.serialization import rows_response, stream_response
+from api.timeseries import TimeseriesParams
 
 router = APIRouter(prefix="/weather", tags=["weather"])
 
 @router.post("/", response_model=dict)
-async def create_weather_endpoint(weather: WeatherCreate, db: Session = Depends(get_db)):
-    db_weather = create_weather(db, weather)
+async def create_weather_endpoint(weather: WeatherCreate, response: Response, wait: bool = False, db: Session = Depends(get_db)):
+    if ingest_enabled:
+        return await ingest(response, "weather", create_weather_batch, weather, wait)
+    db_weather = await run_db(create_weather, db, weather)
+    broadcaster.publish("weather", [db_weather.id], [weather])
     return {"id": db_weather.id}
 
-@router.post("/batch", response_model=List[dict])
-async def create_weather_batch_endpoint(weathers: List[WeatherCreate], db: Session = Depends(get_db)):
-    db_weathers = create_weather_batch(db, weathers)
-    return [{"id": w.id} for w in db_weathers]
+@router.post("/batch", response_model=Union[List[dict], dict])
+async def create_weather_batch_endpoint(weathers: List[WeatherCreate], return_ids: bool = True, db: Session = Depends(get_db)):
+    ids = await run_db(create_weather_batch, db, weathers, return_ids or broadcaster.listening("weather"))
+    broadcaster.publish("weather", ids, weathers)
+    if ids is None:
+        return {"count": len(weathers)}
+    return [{"id": i} for i in ids]
 
 @router.delete("/all", response_model=dict)
 async def delete_weather_endpoint(db: Session = Depends(get_db)):
-    delete_all_weather(db)
+    await run_db(delete_all_weather, db)
     return {"status": "deleted"}
 
 @router.get("/", response_model=List[WeatherResponse])
-async def get_weather_endpoint(db: Session = Depends(get_db)):
-    weather = get_weather(db)
-    return weather
\ No newline at end of file
+async def get_weather_endpoint(page: PageParams = Depends(), db: Session = Depends(get_db)):
+    if page.stream:
+        return stream_response(await run_db(stream_weather, db, page), page.media_type)
+    weather = await run_db(get_weather, db, page)
+    return rows_response(weather, page.media_type, next_cursor_headers(weather, page.limit))
+
+@router.get("/timeseries", response_model=List[WeatherTimeseriesPoint])
+async def get_weather_timeseries_endpoint(params: TimeseriesParams = Depends(), db: Session = Depends(get_db)):
+    points = await run_db(get_weather_timeseries, db, params)
+    return rows_response(points, params.media_type)
\ No newline at end of file
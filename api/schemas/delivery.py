@@ -1,11 +1,12 @@
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field
+from datetime import date, datetime
+from typing import List, Optional
 
 class DeliveryCreate(BaseModel):
     vehicle_id: int
     driver_id: int
-    scheduled_time: str
-    actual_time: str
+    scheduled_time: datetime
+    actual_time: datetime
     status: str
     sla_type: str
     distance_km: float
@@ -30,7 +31,7 @@ class DeliveryCreate(BaseModel):
     temperature: float
     humidity: int
     wind_speed: float
-    date: str
+    date: datetime
     time_of_day: str
     day_of_week: str
     is_weekend: bool
@@ -69,6 +70,28 @@ class DeliveryResponse(BaseModel):
     time_of_day: str
     day_of_week: str
     is_weekend: bool
+    updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class DeliveryFilters(BaseModel):
+    status: Optional[List[str]] = None
+    sla_type: Optional[List[str]] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    compliance: str = "All"
+    vehicle_id: Optional[List[int]] = None
+    driver_id: Optional[List[int]] = None
+
+class DeliveryKPIs(BaseModel):
+    group: Optional[str] = None
+    count: int
+    sla_compliance_rate: Optional[float] = Field(
+        None,
+        description="Percent, 0-100: the mean sla_compliance score, or the share of compliant deliveries "
+        "when SLA_COMPLIANCE_UNIT=flag",
+    )
+    avg_delay_minutes: Optional[float] = None
+    avg_fuel_consumed: Optional[float] = None
+    on_time_rate: Optional[float] = None
\ No newline at end of file
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Optional
+
+class DeliveryDailyStatsResponse(BaseModel):
+    date: Optional[date] = None
+    sla_type: Optional[str] = None
+    status: Optional[str] = None
+    sla_compliance: Optional[int] = None
+    delivery_count: int
+    compliant_count: int
+    non_compliant_count: int
+    delay_minutes_sum: float
+    fuel_consumed_sum: float
+    penalty_amount_sum: float
+    distance_km_sum: float
\ No newline at end of file
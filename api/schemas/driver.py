@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class DriverCreate(BaseModel):
     name: str
@@ -9,7 +10,7 @@ class DriverCreate(BaseModel):
     incident_count: int
     status: str
     training_completed: str
-    joined_date: str
+    joined_date: datetime
     contact_number: str
 
 class DriverResponse(BaseModel):
@@ -23,6 +24,7 @@ class DriverResponse(BaseModel):
     training_completed: bool
     joined_date: datetime
     contact_number: str
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
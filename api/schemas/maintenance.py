@@ -1,9 +1,10 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class MaintenanceCreate(BaseModel):
     vehicle_id: int
-    date: str
+    date: datetime
     type: str
     cost: float
     description: str
@@ -17,6 +18,7 @@ class MaintenanceResponse(BaseModel):
     cost: float
     description: str
     status: str
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,4 +1,6 @@
 from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
 
 class RouteCreate(BaseModel):
     origin_lat: float
@@ -18,6 +20,7 @@ class RouteResponse(BaseModel):
     distance_km: float
     typical_traffic: float
     route_name: str
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
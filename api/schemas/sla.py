@@ -1,4 +1,6 @@
 from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
 
 class SLACreate(BaseModel):
     name: str
@@ -10,6 +12,7 @@ class SLAResponse(BaseModel):
     name: str
     max_hours: float
     penalty: float
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
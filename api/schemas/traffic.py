@@ -1,9 +1,10 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class TrafficCreate(BaseModel):
     location: str
-    timestamp: str
+    timestamp: datetime
     traffic_index: float
     delay_minutes: float
     severity: str
@@ -15,6 +16,14 @@ class TrafficResponse(BaseModel):
     traffic_index: float
     delay_minutes: float
     severity: str
+    updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TrafficTimeseriesPoint(BaseModel):
+    location: str
+    bucket: datetime
+    count: int
+    traffic_index: Optional[float] = None
+    delay_minutes: Optional[float] = None
\ No newline at end of file
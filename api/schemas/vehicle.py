@@ -1,10 +1,11 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class VehicleCreate(BaseModel):
     model: str
     fuel_efficiency: float
-    last_maintenance_date: str
+    last_maintenance_date: datetime
     mileage: int
     idle_hours: float
     status: str
@@ -25,6 +26,7 @@ class VehicleResponse(BaseModel):
     engine_hours: int
     tire_condition: str
     battery_health: int
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,9 +1,10 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class WeatherCreate(BaseModel):
     location: str
-    timestamp: str
+    timestamp: datetime
     temperature: float
     condition: str
     wind_speed: float
@@ -19,6 +20,15 @@ class WeatherResponse(BaseModel):
     wind_speed: float
     humidity: int
     severity: str
+    updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class WeatherTimeseriesPoint(BaseModel):
+    location: str
+    bucket: datetime
+    count: int
+    temperature: Optional[float] = None
+    wind_speed: Optional[float] = None
+    humidity: Optional[float] = None
\ No newline at end of file
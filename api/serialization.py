@@ -0,0 +1,183 @@
+import io
+from itertools import islice
+from typing import Iterator, Optional
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric
+from api.database import run_db
+from api.metrics import record_rows
+
+STREAM_CHUNK_SIZE = 1000
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+MEDIA_TYPES = (JSON, ARROW_STREAM, PARQUET)
+
+# Rows come straight from SQLAlchemy Core. JSON is dumped with orjson, which
+# produces the same output as the *Response schemas without building a
+# Pydantic model per row; Arrow and Parquet keep the column types.
+
+def negotiate(accept: Optional[str]) -> str:
+    offers = []
+    for position, part in enumerate((accept or "").split(",")):
+        media_type, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        offers.append((-quality, position, media_type.strip().lower()))
+    for quality, _, media_type in sorted(offers):
+        if quality == 0:
+            break
+        if media_type in MEDIA_TYPES:
+            return media_type
+        if media_type in ("*/*", "application/*"):
+            return JSON
+    return JSON
+
+def _arrow_arrays(columns, schema: Optional[pa.Schema] = None) -> list:
+    arrays = []
+    for index, values in enumerate(columns):
+        field_type = schema.field(index).type if schema is not None else None
+        if field_type is not None and pa.types.is_dictionary(field_type):
+            array = pa.array(values, type=field_type.value_type)
+        else:
+            array = pa.array(values, type=field_type)
+        # Low-cardinality strings (status, sla_type, location...) become
+        # dictionary arrays and arrive in pandas as categoricals.
+        if pa.types.is_string(array.type):
+            array = array.dictionary_encode()
+        arrays.append(array)
+    return arrays
+
+def arrow_type(column) -> pa.DataType:
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    return pa.string()
+
+def arrow_schema(columns) -> pa.Schema:
+    # What a select returns, for results with no rows to take types from;
+    # strings are dictionary-encoded like _arrow_arrays does
+    fields = []
+    for column in columns:
+        field_type = arrow_type(column)
+        if pa.types.is_string(field_type):
+            field_type = pa.dictionary(pa.int32(), field_type)
+        fields.append(pa.field(column.name, field_type))
+    return pa.schema(fields)
+
+class Rows(list):
+    # Fetched rows plus the select's columns, so an empty page still has a schema
+    def __init__(self, rows, columns):
+        super().__init__(rows)
+        self.columns = list(columns)
+
+def select_rows(db, query) -> Rows:
+    return Rows(db.execute(query).all(), query.selected_columns)
+
+def arrow_table(rows) -> pa.Table:
+    if not rows:
+        return arrow_schema(getattr(rows, "columns", [])).empty_table()
+    return pa.Table.from_arrays(_arrow_arrays(zip(*rows)), names=list(rows[0]._fields))
+
+def rows_response(rows, media_type: str = JSON, headers: Optional[dict] = None) -> Response:
+    record_rows(len(rows))
+    if media_type == ARROW_STREAM:
+        table = arrow_table(rows)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body = sink.getvalue()
+    elif media_type == PARQUET:
+        sink = io.BytesIO()
+        pq.write_table(arrow_table(rows), sink)
+        body = sink.getvalue()
+    else:
+        media_type = JSON
+        body = orjson.dumps([row._asdict() for row in rows])
+    return Response(body, media_type=media_type, headers=headers)
+
+class IteratorResult:
+    # fetchmany/close over a row iterator, for rows that are filtered or
+    # merged in Python (archive, radius queries) before streaming; columns
+    # are the ones the rows carry
+    def __init__(self, result, rows: Iterator, columns: list):
+        self.result = result
+        self.rows = rows
+        self.columns = columns
+
+    def fetchmany(self, size: int) -> list:
+        return list(islice(self.rows, size))
+
+    def close(self):
+        self.result.close()
+
+def result_columns(result) -> list:
+    # The columns a streamed result was selected with
+    if isinstance(result, IteratorResult):
+        return result.columns
+    return list(result.context.compiled.statement.selected_columns)
+
+def _ndjson_chunk(result) -> bytes:
+    rows = result.fetchmany(STREAM_CHUNK_SIZE)
+    record_rows(len(rows))
+    return b"".join(orjson.dumps(row._asdict()) + b"\n" for row in rows)
+
+def _arrow_batch(result, schema: Optional[pa.Schema]) -> Optional[pa.RecordBatch]:
+    rows = result.fetchmany(STREAM_CHUNK_SIZE)
+    record_rows(len(rows))
+    if not rows:
+        return None
+    arrays = _arrow_arrays(zip(*rows), schema)
+    if schema is None:
+        return pa.RecordBatch.from_arrays(arrays, names=list(rows[0]._fields))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def stream_response(result, media_type: str = JSON) -> StreamingResponse:
+    async def generate_ndjson():
+        # Cursor reads and serialization happen chunk by chunk on the DB executor
+        try:
+            while chunk := await run_db(_ndjson_chunk, result):
+                yield chunk
+        finally:
+            result.close()
+
+    async def generate_arrow():
+        sink = io.BytesIO()
+        writer = schema = None
+        try:
+            while (batch := await run_db(_arrow_batch, result, schema)) is not None:
+                if writer is None:
+                    schema = batch.schema
+                    writer = pa.ipc.new_stream(sink, schema)
+                writer.write_batch(batch)
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+            if writer is None:
+                # No rows: the stream still carries the schema
+                writer = pa.ipc.new_stream(sink, arrow_schema(result_columns(result)))
+            writer.close()
+            yield sink.getvalue()
+        finally:
+            result.close()
+
+    if media_type == ARROW_STREAM:
+        return StreamingResponse(generate_arrow(), media_type=ARROW_STREAM)
+    return StreamingResponse(generate_ndjson(), media_type=NDJSON)
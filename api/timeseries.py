@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from typing import Annotated, List, Optional
+from fastapi import Header, Query
+from sqlalchemy import DateTime, Float, Integer, Table, case, cast, func, literal_column, select, text, type_coerce
+from sqlalchemy.orm import Session
+from api.serialization import negotiate, select_rows
+
+TIMESERIES_MAX_POINTS = 1000
+INTERVALS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=31),
+}
+
+class TimeseriesParams:
+    def __init__(
+        self,
+        interval: Annotated[str, Query(pattern="^(auto|hour|day|week|month)$")] = "auto",
+        agg: Annotated[str, Query(pattern="^(mean|min|max|p95)$")] = "mean",
+        location: Annotated[Optional[List[str]], Query()] = None,
+        severity: Annotated[Optional[List[str]], Query()] = None,
+        start: Optional[datetime] = None,
+        end: Annotated[Optional[datetime], Query(description="Exclusive")] = None,
+        max_points: Annotated[int, Query(ge=1, le=100000)] = TIMESERIES_MAX_POINTS,
+        accept: Annotated[Optional[str], Header()] = None,
+    ):
+        self.interval = interval
+        self.agg = agg
+        self.location = location
+        self.severity = severity
+        self.start = start
+        self.end = end
+        self.max_points = max_points
+        self.media_type = negotiate(accept)
+
+def time_bucket(column, interval: str, dialect: str):
+    # Start of the hour/day/week/month containing column; weeks start on Monday.
+    # Constants are inlined rather than bound so the expression in GROUP BY is
+    # textually identical to the one in the select list, as SQL Server requires.
+    if dialect == "sqlite":
+        formats = {
+            "hour": ("'%Y-%m-%d %H:00:00'",),
+            "day": ("'%Y-%m-%d 00:00:00'",),
+            "week": ("'%Y-%m-%d 00:00:00'", "'weekday 0'", "'-6 days'"),
+            "month": ("'%Y-%m-01 00:00:00'",),
+        }[interval]
+        bucket = func.strftime(literal_column(formats[0]), column, *[literal_column(m) for m in formats[1:]])
+        return type_coerce(bucket, DateTime)
+    if dialect == "mssql":
+        zero = literal_column("0")
+        if interval == "week":
+            # Day 0 (1900-01-01) was a Monday; DATEDIFF(week) would split on Sundays
+            week = literal_column("7", Integer)
+            days = type_coerce(func.datediff(text("day"), zero, column), Integer) // week * week
+            return func.dateadd(text("day"), days, zero)
+        return func.dateadd(text(interval), func.datediff(text(interval), zero, column), zero)
+    return func.date_trunc(literal_column(f"'{interval}'"), column)
+
+def resolve_interval(db: Session, table: Table, params: TimeseriesParams, conditions: list) -> str:
+    if params.interval != "auto":
+        return params.interval
+    start, end = params.start, params.end
+    if start is None or end is None:
+        first, last = db.execute(select(func.min(table.c.timestamp), func.max(table.c.timestamp)).where(*conditions)).one()
+        start = start or first
+        end = end or last
+    if start is None or end is None:
+        return "day"
+    # Finest interval that keeps each location's series within max_points
+    for name, step in INTERVALS.items():
+        if (end - start) / step <= params.max_points:
+            return name
+    return "month"
+
+def timeseries(db: Session, table: Table, metrics: list[str], params: TimeseriesParams):
+    conditions = []
+    if params.location:
+        conditions.append(table.c.location.in_(params.location))
+    if params.severity:
+        conditions.append(table.c.severity.in_(params.severity))
+    if params.start is not None:
+        conditions.append(table.c.timestamp >= params.start)
+    if params.end is not None:
+        conditions.append(table.c.timestamp < params.end)
+    interval = resolve_interval(db, table, params, conditions)
+    bucket = time_bucket(table.c.timestamp, interval, db.get_bind().dialect.name)
+
+    if params.agg == "p95":
+        # Nearest-rank percentile from ROW_NUMBER, which every supported
+        # backend has; PERCENTILE_CONT is not an aggregate on SQL Server.
+        partition = [table.c.location, bucket]
+        ranked = select(
+            table.c.location,
+            bucket.label("bucket"),
+            func.count().over(partition_by=partition).label("n"),
+            *[table.c[name] for name in metrics],
+            *[func.row_number().over(partition_by=partition, order_by=table.c[name]).label(f"rank_{name}") for name in metrics],
+        ).where(*conditions).subquery()
+        values = [
+            func.min(case((ranked.c[f"rank_{name}"] >= 0.95 * ranked.c.n, ranked.c[name]))).label(name)
+            for name in metrics
+        ]
+        query = (
+            select(ranked.c.location.label("location"), ranked.c.bucket.label("bucket"), func.count().label("count"), *values)
+            .group_by(ranked.c.location, ranked.c.bucket)
+            .order_by(ranked.c.location, ranked.c.bucket)
+        )
+    else:
+        if params.agg == "mean":
+            # Cast first so integer columns (humidity) are not averaged as integers
+            values = [func.avg(cast(table.c[name], Float)).label(name) for name in metrics]
+        else:
+            aggregate = getattr(func, params.agg)
+            values = [aggregate(table.c[name]).label(name) for name in metrics]
+        query = (
+            select(table.c.location, bucket.label("bucket"), func.count().label("count"), *values)
+            .where(*conditions)
+            .group_by(table.c.location, bucket)
+            .order_by(table.c.location, bucket)
+        )
+    return select_rows(db, query)
\ No newline at end of file
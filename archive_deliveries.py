@@ -0,0 +1,24 @@
+import argparse
+from datetime import datetime
+from api.database import Base, SessionLocal, engine
+from api.archive import archive_before, archive_cutoff, archive_dir, archive_keep_months
+
+# Moves whole months of deliveries out of the hot table into the Parquet
+# archive, e.g. python archive_deliveries.py --keep-months 3
+# The API keeps serving archived rows from list, query and KPI endpoints.
+parser = argparse.ArgumentParser(description="Archive old months of deliveries to Parquet")
+group = parser.add_mutually_exclusive_group()
+group.add_argument("--keep-months", type=int, default=archive_keep_months or 3, help="months kept hot, counting the current one")
+group.add_argument("--before", help="archive every month before YYYY-MM")
+args = parser.parse_args()
+
+cutoff = datetime.strptime(args.before, "%Y-%m").date() if args.before else archive_cutoff(args.keep_months)
+Base.metadata.create_all(bind=engine)
+db = SessionLocal()
+try:
+    archived = archive_before(db, cutoff)
+finally:
+    db.close()
+for month, count in archived.items():
+    print(f"{month}: {count} deliveries")
+print(f"Archived {sum(archived.values())} deliveries before {cutoff:%Y-%m} to {archive_dir}.")
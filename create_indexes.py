@@ -0,0 +1,38 @@
+from sqlalchemy import String, inspect, text
+from api.database import Base, engine
+from api.geo import backfill_cells
+from api.models import delivery, delivery_stats, driver, maintenance, route, sla, traffic, vehicle, weather  # noqa: F401
+
+# Adds the columns and indexes declared on the models to an existing database
+# without dropping any data (unlike clear_db.py). Safe to run repeatedly.
+inspector = inspect(engine)
+with engine.begin() as conn:
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in columns:
+                # Only nullable columns are ever added this way (e.g. updated_at);
+                # rows that predate them keep NULL.
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD {column.name} {column_type}"))
+                print(f"Added column {column.name} to {table.name}")
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if engine.dialect.name == "mssql":
+                # Tables created before the columns had a length are VARCHAR(max),
+                # which SQL Server refuses to index.
+                for column in index.columns:
+                    if isinstance(column.type, String) and column.type.length:
+                        column_type = column.type.compile(dialect=engine.dialect)
+                        conn.execute(text(f"ALTER TABLE {table.name} ALTER COLUMN {column.name} {column_type}"))
+            index.create(bind=conn)
+            print(f"Created index {index.name} on {table.name}")
+        if "origin_cell" in table.columns:
+            filled = backfill_cells(conn, table)
+            if filled:
+                print(f"Filled {filled} grid cells on {table.name}")
+print("Columns and indexes are up to date.")
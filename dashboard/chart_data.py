@@ -0,0 +1,96 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+
+# Chart inputs built column-wise from the filtered frames. Panels used to
+# build these with iterrows, a comprehension per row or one re-filter per
+# group, which grows with the rows the filters leave in.
+# python -m scripts.bench_chart_data compares both ways.
+
+def _codes(series):
+    # (codes, values); categoricals already carry theirs
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series, sort=True)
+
+def _datetimes(series):
+    # Sections turn datetime columns into date objects; read those back as datetimes
+    if series.dtype == object:
+        series = pd.to_datetime(series)
+    return series.to_numpy().astype("datetime64[D]")
+
+def map_points(frame, route='route_name'):
+    # One origin and one destination point per route, in row order. The
+    # labels stay in their column's own array; boxing them as objects costs
+    # more than everything else here.
+    count = len(frame)
+    return pd.DataFrame({
+        'lat': np.column_stack([frame['origin_lat'].to_numpy(), frame['dest_lat'].to_numpy()]).ravel(),
+        'lng': np.column_stack([frame['origin_lng'].to_numpy(), frame['dest_lng'].to_numpy()]).ravel(),
+        'type': pd.Categorical.from_codes(np.tile(np.array([0, 1], dtype=np.int8), count), ['Origin', 'Destination']),
+        'route': frame[route].array.take(np.repeat(np.arange(count), 2)),
+    })
+
+def sankey_links(frame, source, target, target_labels=None):
+    # (labels, source, target, value) for go.Sankey: one link per observed
+    # pair, counted with one bincount. Sources and targets get separate
+    # nodes even when a value appears on both sides.
+    source_codes, source_values = _codes(frame[source])
+    target_codes, target_values = _codes(frame[target])
+    if target_labels is not None and len(target_values):
+        # Like Series.map: every value without a label goes to one None node
+        positions = {}
+        node_codes = np.array([positions.setdefault(target_labels.get(value), len(positions)) for value in target_values])
+        target_codes = np.where(target_codes >= 0, node_codes[target_codes], -1)
+        target_values = list(positions)
+    present = (source_codes >= 0) & (target_codes >= 0)
+    pairs = source_codes[present].astype(np.int64) * len(target_values) + target_codes[present]
+    counts = np.bincount(pairs, minlength=len(source_values) * len(target_values))
+    links = np.flatnonzero(counts)
+    link_sources, link_targets = np.divmod(links, len(target_values))
+    # Only the values that have a link become nodes
+    used_sources, link_sources = np.unique(link_sources, return_inverse=True)
+    used_targets, link_targets = np.unique(link_targets, return_inverse=True)
+    labels = [source_values[i] for i in used_sources] + [target_values[i] for i in used_targets]
+    return labels, link_sources, link_targets + len(used_sources), counts[links]
+
+def radar_vectors(frame, by, scales):
+    # {group: r} for go.Scatterpolar from the group means of each column.
+    # scales maps a column to its divisor, or to a function of the column's
+    # group means that returns one.
+    codes, groups = _codes(frame[by])
+    present = codes >= 0
+    if present.all():
+        present = slice(None)
+    else:
+        codes = codes[present]
+    counts = np.bincount(codes, minlength=len(groups))
+    means = {}
+    for column in scales:
+        values = frame[column].to_numpy(dtype=np.float64)[present]
+        missing = np.isnan(values)
+        if missing.any():
+            # Like mean(): missing values count neither in the sum nor the count
+            kept = ~missing
+            sums = np.bincount(codes[kept], weights=values[kept], minlength=len(groups))
+            column_counts = np.bincount(codes[kept], minlength=len(groups))
+        else:
+            sums = np.bincount(codes, weights=values, minlength=len(groups))
+            column_counts = counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[column] = sums / column_counts
+    # Groups with no rows left are not plotted, as with groupby(observed=True)
+    observed = counts > 0
+    vectors = np.column_stack([
+        means[column] / (scale(pd.Series(means[column][observed])) if callable(scale) else scale)
+        for column, scale in scales.items()
+    ])
+    return {groups[i]: vectors[i].tolist() for i in np.flatnonzero(observed)}
+
+def age_days(dates, today=None):
+    # Whole days from each date to today; 0 where the date is missing
+    today = np.datetime64(today or date.today(), "D")
+    values = _datetimes(dates)
+    ages = (today - values).astype(np.int64)
+    ages[np.isnat(values)] = 0
+    return pd.Series(ages, index=dates.index)
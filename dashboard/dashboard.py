@@ -1,26 +1,19 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import plotly.graph_objects as go
+from data_access import invalidate, load_frame, load_frames, memory_report
+from filters import filter_index
+from chart_data import age_days, map_points, radar_vectors, sankey_links
 
-BASE_URL = "http://localhost:8000/api"
-
-def fetch_data(endpoint):
-    try:
-        response = requests.get(f"{BASE_URL}/{endpoint}")
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        st.error(f"HTTP Error fetching {endpoint}: {e}")
-        return []
-    except requests.exceptions.JSONDecodeError as e:
-        st.error(f"JSON Decode Error for {endpoint}: {e}")
-        return []
-    except requests.RequestException as e:
-        st.error(f"Error fetching {endpoint}: {e}")
-        return []
+def timeseries_params(locations, severities, start_date, end_date):
+    # Filters for the /timeseries endpoints; the dashboard's end date is inclusive
+    params = {"location": locations, "severity": severities}
+    if start_date is not None and end_date is not None:
+        params["start"] = start_date.isoformat()
+        params["end"] = (end_date + timedelta(days=1)).isoformat()
+    return params
 
 st.set_page_config(page_title="Logistics Fleet Management", layout="wide")
 st.title("Logistics Fleet Management Dashboard")
@@ -31,12 +24,15 @@ section = st.sidebar.selectbox(
     "Select Section",
     ["Deliveries", "Vehicles", "Drivers", "Weather", "Maintenance", "Routes", "SLAs", "Traffic", "Metrics"]
 )
+if st.sidebar.button("Reload data"):
+    # Drops the cached tables for every session; deletes are otherwise only
+    # seen once the TTL runs out
+    invalidate()
 
 # Deliveries Section
 if section == "Deliveries":
     st.header("Deliveries")
-    deliveries = fetch_data("deliveries")
-    df_deliveries = pd.DataFrame(deliveries)
+    df_deliveries = load_frame("deliveries")
     
     if not df_deliveries.empty:
         # Convert datetime fields to appropriate format
@@ -98,21 +94,16 @@ if section == "Deliveries":
                 selected_compliance = st.selectbox("Compliance Status", options=compliance_options)
         
         # Apply Filters
-        filtered_df = df_deliveries.copy()
-        if selected_status:
-            filtered_df = filtered_df[filtered_df['status'].isin(selected_status)]
-        if selected_sla_type:
-            filtered_df = filtered_df[filtered_df['sla_type'].isin(selected_sla_type)]
-        if start_date is not None and end_date is not None:
-            filtered_df = filtered_df[
-                (filtered_df['date'] >= start_date) & 
-                (filtered_df['date'] <= end_date)
-            ]
-        if selected_compliance != "All":
-            if selected_compliance == "Compliant":
-                filtered_df = filtered_df[filtered_df['sla_compliance'] == 1]
-            else:  # Non-Compliant
-                filtered_df = filtered_df[filtered_df['sla_compliance'] == 0]
+        index = filter_index(df_deliveries, categories=['status', 'sla_type', 'sla_compliance'], ranges=['date'])
+        filtered_df = index.filter(
+            df_deliveries,
+            isin={
+                'status': selected_status,
+                'sla_type': selected_sla_type,
+                'sla_compliance': {"All": None, "Compliant": [1], "Non-Compliant": [0]}[selected_compliance],
+            },
+            between={'date': (start_date, end_date)},
+        )
         
         # Display Filtered Table
         desired_columns = [
@@ -132,13 +123,9 @@ if section == "Deliveries":
         
         # Sankey Diagram (Delivery Flow by SLA Type and Compliance)
         if 'sla_type' in filtered_df.columns and 'sla_compliance' in filtered_df.columns:
-            sankey_data = filtered_df.groupby(['sla_type', 'sla_compliance']).size().reset_index(name='count')
-            sankey_data['compliance_label'] = sankey_data['sla_compliance'].map({1: 'Compliant', 0: 'Non-Compliant'})
-            
-            labels = list(sankey_data['sla_type'].unique()) + list(sankey_data['compliance_label'].unique())
-            source = [labels.index(sla) for sla in sankey_data['sla_type']]
-            target = [labels.index(comp) for comp in sankey_data['compliance_label']]
-            value = sankey_data['count']
+            labels, source, target, value = sankey_links(
+                filtered_df, 'sla_type', 'sla_compliance', {1: 'Compliant', 0: 'Non-Compliant'}
+            )
             
             fig_sankey = go.Figure(data=[go.Sankey(
                 node=dict(
@@ -191,7 +178,7 @@ if section == "Deliveries":
         
         # Existing Bar Chart: Status Distribution
         if 'status' in filtered_df.columns:
-            status_counts = filtered_df['status'].value_counts().reset_index()
+            status_counts = filtered_df['status'].cat.remove_unused_categories().value_counts().reset_index()
             status_counts.columns = ['status', 'count']
             fig_bar = px.bar(
                 status_counts,
@@ -211,8 +198,7 @@ if section == "Deliveries":
 # Vehicles Section
 elif section == "Vehicles":
     st.header("Vehicles")
-    vehicles = fetch_data("vehicles")
-    df_vehicles = pd.DataFrame(vehicles)
+    df_vehicles = load_frame("vehicles")
     
     if not df_vehicles.empty:
         # Convert datetime fields
@@ -272,21 +258,12 @@ elif section == "Vehicles":
                 selected_tire = st.multiselect("Tire Condition", options=tire_options, default=tire_options)
         
         # Apply Filters
-        filtered_df = df_vehicles.copy()
-        if selected_status:
-            filtered_df = filtered_df[filtered_df['status'].isin(selected_status)]
-        if 'fuel_efficiency' in filtered_df.columns:
-            filtered_df = filtered_df[
-                (filtered_df['fuel_efficiency'] >= selected_fuel_eff[0]) & 
-                (filtered_df['fuel_efficiency'] <= selected_fuel_eff[1])
-            ]
-        if 'last_maintenance_date' in filtered_df.columns:
-            filtered_df = filtered_df[
-                (filtered_df['last_maintenance_date'] >= start_date) & 
-                (filtered_df['last_maintenance_date'] <= end_date)
-            ]
-        if selected_tire:
-            filtered_df = filtered_df[filtered_df['tire_condition'].isin(selected_tire)]
+        index = filter_index(df_vehicles, categories=['status', 'tire_condition'], ranges=['fuel_efficiency', 'last_maintenance_date'])
+        filtered_df = index.filter(
+            df_vehicles,
+            isin={'status': selected_status, 'tire_condition': selected_tire},
+            between={'fuel_efficiency': selected_fuel_eff, 'last_maintenance_date': (start_date, end_date)},
+        )
         
         # Display Filtered Table
         desired_columns = [
@@ -324,7 +301,7 @@ elif section == "Vehicles":
         # Line Chart (Maintenance Age Over Time)
         if 'last_maintenance_date' in filtered_df.columns and 'tire_condition' in filtered_df.columns:
             filtered_df = filtered_df.copy()
-            filtered_df['maintenance_age_days'] = [(datetime.now().date() - d).days for d in filtered_df['last_maintenance_date']]
+            filtered_df['maintenance_age_days'] = age_days(filtered_df['last_maintenance_date'])
             fig_line = px.line(
                 filtered_df,
                 x='last_maintenance_date',
@@ -359,8 +336,7 @@ elif section == "Vehicles":
 # Drivers Section
 elif section == "Drivers":
     st.header("Drivers")
-    drivers = fetch_data("drivers")
-    df_drivers = pd.DataFrame(drivers)
+    df_drivers = load_frame("drivers")
     
     if not df_drivers.empty:
         # Convert datetime fields
@@ -425,20 +401,12 @@ elif section == "Drivers":
                 selected_training = st.multiselect("Training Completed", options=training_options, default=training_options)
         
         # Apply Filters
-        filtered_df = df_drivers.copy()
-        if selected_status:
-            filtered_df = filtered_df[filtered_df['status'].isin(selected_status)]
-        filtered_df = filtered_df[
-            (filtered_df['punctuality_score'] >= selected_punctuality[0]) & 
-            (filtered_df['punctuality_score'] <= selected_punctuality[1])
-        ]
-        if start_date is not None and end_date is not None:
-            filtered_df = filtered_df[
-                (filtered_df['joined_date'] >= start_date) & 
-                (filtered_df['joined_date'] <= end_date)
-            ]
-        if selected_training:
-            filtered_df = filtered_df[filtered_df['training_completed'].isin(selected_training)]
+        index = filter_index(df_drivers, categories=['status', 'training_completed'], ranges=['punctuality_score', 'joined_date'])
+        filtered_df = index.filter(
+            df_drivers,
+            isin={'status': selected_status, 'training_completed': selected_training},
+            between={'punctuality_score': selected_punctuality, 'joined_date': (start_date, end_date)},
+        )
         
         # Display Filtered Table
         desired_columns = [
@@ -457,7 +425,7 @@ elif section == "Drivers":
         st.subheader("Driver Insights")
         
         # Status Distribution (Bar Chart)
-        status_counts = filtered_df['status'].value_counts().reset_index()
+        status_counts = filtered_df['status'].cat.remove_unused_categories().value_counts().reset_index()
         status_counts.columns = ['status', 'count']
         fig_status = px.bar(
             status_counts,
@@ -499,8 +467,7 @@ elif section == "Drivers":
 # Weather Section
 elif section == "Weather":
     st.header("Weather")
-    weather = fetch_data("weather")
-    df_weather = pd.DataFrame(weather)
+    df_weather = load_frame("weather")
     
     if not df_weather.empty:
         # Convert datetime fields
@@ -557,18 +524,12 @@ elif section == "Weather":
                 selected_severity = st.multiselect("Severity", options=severity_options, default=severity_options)
         
         # Apply Filters
-        filtered_df = df_weather.copy()
-        if selected_location:
-            filtered_df = filtered_df[filtered_df['location'].isin(selected_location)]
-        if start_date is not None and end_date is not None:
-            filtered_df = filtered_df[
-                (filtered_df['timestamp'] >= start_date) & 
-                (filtered_df['timestamp'] <= end_date)
-            ]
-        if selected_condition:
-            filtered_df = filtered_df[filtered_df['condition'].isin(selected_condition)]
-        if selected_severity:
-            filtered_df = filtered_df[filtered_df['severity'].isin(selected_severity)]
+        index = filter_index(df_weather, categories=['location', 'condition', 'severity'], ranges=['timestamp'])
+        filtered_df = index.filter(
+            df_weather,
+            isin={'location': selected_location, 'condition': selected_condition, 'severity': selected_severity},
+            between={'timestamp': (start_date, end_date)},
+        )
         
         # Display Filtered Table
         desired_columns = [
@@ -586,7 +547,7 @@ elif section == "Weather":
         st.subheader("Weather Insights")
         
         # Condition Distribution (Bar Chart)
-        condition_counts = filtered_df['condition'].value_counts().reset_index()
+        condition_counts = filtered_df['condition'].cat.remove_unused_categories().value_counts().reset_index()
         condition_counts.columns = ['condition', 'count']
         fig_condition = px.bar(
             condition_counts,
@@ -599,20 +560,22 @@ elif section == "Weather":
         fig_condition.update_layout(height=400, showlegend=False)
         st.plotly_chart(fig_condition, use_container_width=True)
         
-        # Temperature Trends (Line Chart)
-        temp_trends = filtered_df.groupby('timestamp')['temperature'].mean().reset_index()
-        fig_temp = px.line(
-            temp_trends,
-            x='timestamp',
-            y='temperature',
-            title="Average Temperature Trends",
-            labels={'timestamp': 'Date', 'temperature': 'Temperature (°C)'}
-        )
-        fig_temp.update_layout(height=400)
-        st.plotly_chart(fig_temp, use_container_width=True)
+        # Temperature Trends (Line Chart), resampled per location by the API
+        temp_trends = load_frame("weather/timeseries", timeseries_params(selected_location, selected_severity, start_date, end_date))
+        if not temp_trends.empty:
+            fig_temp = px.line(
+                temp_trends,
+                x='bucket',
+                y='temperature',
+                color='location',
+                title="Average Temperature Trends",
+                labels={'bucket': 'Date', 'temperature': 'Temperature (°C)'}
+            )
+            fig_temp.update_layout(height=400)
+            st.plotly_chart(fig_temp, use_container_width=True)
         
         # Severity Proportion (Pie Chart)
-        severity_counts = filtered_df['severity'].value_counts().reset_index()
+        severity_counts = filtered_df['severity'].cat.remove_unused_categories().value_counts().reset_index()
         severity_counts.columns = ['severity', 'count']
         fig_severity = px.pie(
             severity_counts,
@@ -629,8 +592,7 @@ elif section == "Weather":
 # Maintenance Section
 elif section == "Maintenance":
     st.header("Maintenance")
-    maintenance = fetch_data("maintenance")
-    df_maintenance = pd.DataFrame(maintenance)
+    df_maintenance = load_frame("maintenance")
     
     if not df_maintenance.empty:
         # Convert datetime fields
@@ -688,18 +650,12 @@ elif section == "Maintenance":
                 selected_status = st.multiselect("Status", options=status_options, default=status_options)
         
         # Apply Filters
-        filtered_df = df_maintenance.copy()
-        if selected_vehicle:
-            filtered_df = filtered_df[filtered_df['vehicle_id'].isin(selected_vehicle)]
-        if start_date is not None and end_date is not None:
-            filtered_df = filtered_df[
-                (filtered_df['date'] >= start_date) & 
-                (filtered_df['date'] <= end_date)
-            ]
-        if selected_type:
-            filtered_df = filtered_df[filtered_df['type'].isin(selected_type)]
-        if selected_status:
-            filtered_df = filtered_df[filtered_df['status'].isin(selected_status)]
+        index = filter_index(df_maintenance, categories=['vehicle_id', 'type', 'status'], ranges=['date'])
+        filtered_df = index.filter(
+            df_maintenance,
+            isin={'vehicle_id': selected_vehicle, 'type': selected_type, 'status': selected_status},
+            between={'date': (start_date, end_date)},
+        )
         
         # Display Filtered Table
         desired_columns = ["id", "vehicle_id", "date", "type", "cost", "description", "status"]
@@ -744,7 +700,7 @@ elif section == "Maintenance":
         
         # Stacked Bar Chart (Status by Month)
         filtered_df['month'] = pd.to_datetime(filtered_df['date']).dt.to_period('M').astype(str)
-        status_by_month = filtered_df.groupby(['month', 'status']).size().reset_index(name='count')
+        status_by_month = filtered_df.groupby(['month', 'status'], observed=True).size().reset_index(name='count')
         fig_status = px.bar(
             status_by_month,
             x='month',
@@ -761,8 +717,7 @@ elif section == "Maintenance":
 # Routes Section
 elif section == "Routes":
     st.header("Routes")
-    routes = fetch_data("routes")
-    df_routes = pd.DataFrame(routes)
+    df_routes = load_frame("routes")
     
     if not df_routes.empty:
         # Calculate Geographic Spread (simplified Euclidean distance in degrees)
@@ -824,19 +779,12 @@ elif section == "Routes":
                 )
         
         # Apply Filters
-        filtered_df = df_routes.copy()
-        if selected_name:
-            filtered_df = filtered_df[filtered_df['route_name'].isin(selected_name)]
-        filtered_df = filtered_df[
-            (filtered_df['distance_km'] >= selected_distance[0]) & 
-            (filtered_df['distance_km'] <= selected_distance[1])
-        ]
-        if selected_traffic:
-            filtered_df = filtered_df[filtered_df['typical_traffic'].isin(selected_traffic)]
-        filtered_df = filtered_df[
-            (filtered_df['origin_lat'] >= selected_lat[0]) & 
-            (filtered_df['origin_lat'] <= selected_lat[1])
-        ]
+        index = filter_index(df_routes, categories=['route_name', 'typical_traffic'], ranges=['distance_km', 'origin_lat'])
+        filtered_df = index.filter(
+            df_routes,
+            isin={'route_name': selected_name, 'typical_traffic': selected_traffic},
+            between={'distance_km': selected_distance, 'origin_lat': selected_lat},
+        )
         
         # Display Filtered Table
         desired_columns = ["id", "route_name", "origin_lat", "origin_lng", "dest_lat", "dest_lng", "distance_km", "typical_traffic"]
@@ -852,13 +800,7 @@ elif section == "Routes":
         
         # Scatter Map (Origins and Destinations)
         # Note: Requires Mapbox token (free at mapbox.com)
-        map_data = []
-        for _, row in filtered_df.iterrows():
-            map_data.extend([
-                {'lat': row['origin_lat'], 'lng': row['origin_lng'], 'type': 'Origin', 'route': row['route_name']},
-                {'lat': row['dest_lat'], 'lng': row['dest_lng'], 'type': 'Destination', 'route': row['route_name']}
-            ])
-        map_df = pd.DataFrame(map_data)
+        map_df = map_points(filtered_df)
         fig_map = px.scatter_mapbox(
             map_df,
             lat='lat',
@@ -903,13 +845,11 @@ elif section == "Routes":
 # SLAs Section
 elif section == "SLAs":
     st.header("SLAs")
-    slas = fetch_data("slas")
-    df_slas = pd.DataFrame(slas)
+    df_slas = load_frame("slas")
     
     if not df_slas.empty:
         # Fetch deliveries for compliance
-        deliveries = fetch_data("deliveries")
-        df_deliveries = pd.DataFrame(deliveries)
+        df_deliveries = load_frame("deliveries")
         
         # KPI Cards
         st.subheader("SLA KPIs")
@@ -975,16 +915,17 @@ elif section == "SLAs":
         ]
         
         # Filter Deliveries based on SLA names and compliance
-        filtered_deliveries = df_deliveries.copy() if not df_deliveries.empty else pd.DataFrame()
+        filtered_deliveries = df_deliveries
         if not filtered_deliveries.empty and 'sla_type' in filtered_deliveries.columns:
-            filtered_deliveries = filtered_deliveries[filtered_deliveries['sla_type'].isin(filtered_slas['name'])]
-            if "All" not in selected_compliance:
-                if "Compliant" in selected_compliance and "Non-Compliant" not in selected_compliance:
-                    filtered_deliveries = filtered_deliveries[filtered_deliveries['sla_compliance'] == 1]
-                elif "Non-Compliant" in selected_compliance and "Compliant" not in selected_compliance:
-                    filtered_deliveries = filtered_deliveries[filtered_deliveries['sla_compliance'] == 0]
-                elif selected_compliance:
-                    filtered_deliveries = filtered_deliveries[filtered_deliveries['sla_compliance'].isin([1 if c == "Compliant" else 0 for c in selected_compliance])]
+            index = filter_index(df_deliveries, categories=['sla_type', 'sla_compliance'])
+            compliance = None if "All" in selected_compliance else [1 if c == "Compliant" else 0 for c in selected_compliance]
+            filtered_deliveries = index.filter(
+                df_deliveries,
+                isin={'sla_type': list(filtered_slas['name']), 'sla_compliance': compliance},
+            )
+            if filtered_slas.empty:
+                # No SLA left matches no delivery, unlike an empty multiselect
+                filtered_deliveries = filtered_deliveries.iloc[0:0]
         
         # Display Filtered Table
         desired_columns = ["id", "name", "max_hours", "penalty"]
@@ -1010,7 +951,7 @@ elif section == "SLAs":
         
         # Bubble Chart (Max Hours vs. Penalty)
         if not filtered_deliveries.empty and 'sla_type' in filtered_deliveries.columns:
-            delivery_counts = filtered_deliveries.groupby('sla_type').size().reset_index(name='delivery_count')
+            delivery_counts = filtered_deliveries.groupby('sla_type', observed=True).size().reset_index(name='delivery_count')
             bubble_df = filtered_slas.merge(delivery_counts, left_on='name', right_on='sla_type', how='left').fillna({'delivery_count': 0})
         else:
             bubble_df = filtered_slas.assign(delivery_count=0)
@@ -1029,7 +970,7 @@ elif section == "SLAs":
         # Sunburst Chart (Compliance by SLA)
         if not filtered_deliveries.empty and 'sla_type' in filtered_deliveries.columns and 'sla_compliance' in filtered_deliveries.columns:
             filtered_deliveries['compliance_label'] = filtered_deliveries['sla_compliance'].map({1: 'Compliant', 0: 'Non-Compliant'})
-            sunburst_data = filtered_deliveries.groupby(['sla_type', 'compliance_label']).size().reset_index(name='count')
+            sunburst_data = filtered_deliveries.groupby(['sla_type', 'compliance_label'], observed=True).size().reset_index(name='count')
             sunburst_data = sunburst_data[sunburst_data['sla_type'].isin(filtered_slas['name'])]
             fig_sunburst = px.sunburst(
                 sunburst_data,
@@ -1048,8 +989,7 @@ elif section == "SLAs":
 # Traffic Section
 elif section == "Traffic":
     st.header("Traffic")
-    traffic = fetch_data("traffic")
-    df_traffic = pd.DataFrame(traffic)
+    df_traffic = load_frame("traffic")
     
     if not df_traffic.empty:
         # Convert datetime fields
@@ -1113,20 +1053,12 @@ elif section == "Traffic":
                 )
         
         # Apply Filters
-        filtered_df = df_traffic.copy()
-        if selected_location:
-            filtered_df = filtered_df[filtered_df['location'].isin(selected_location)]
-        if start_date is not None and end_date is not None:
-            filtered_df = filtered_df[
-                (filtered_df['timestamp'] >= start_date) & 
-                (filtered_df['timestamp'] <= end_date)
-            ]
-        if selected_severity:
-            filtered_df = filtered_df[filtered_df['severity'].isin(selected_severity)]
-        filtered_df = filtered_df[
-            (filtered_df['traffic_index'] >= selected_index[0]) & 
-            (filtered_df['traffic_index'] <= selected_index[1])
-        ]
+        index = filter_index(df_traffic, categories=['location', 'severity'], ranges=['timestamp', 'traffic_index'])
+        filtered_df = index.filter(
+            df_traffic,
+            isin={'location': selected_location, 'severity': selected_severity},
+            between={'timestamp': (start_date, end_date), 'traffic_index': selected_index},
+        )
         
         # Display Filtered Table
         desired_columns = ["id", "location", "timestamp", "traffic_index", "delay_minutes", "severity"]
@@ -1140,20 +1072,22 @@ elif section == "Traffic":
         # Visualizations
         st.subheader("Traffic Insights")
         
-        # Area Chart (Traffic Index Over Time)
-        traffic_trends = filtered_df.groupby('timestamp')['traffic_index'].mean().reset_index()
-        fig_area = px.area(
-            traffic_trends,
-            x='timestamp',
-            y='traffic_index',
-            title="Traffic Index Over Time",
-            labels={'timestamp': 'Date', 'traffic_index': 'Traffic Index'}
-        )
-        fig_area.update_layout(height=400)
-        st.plotly_chart(fig_area, use_container_width=True)
+        # Area Chart (Traffic Index Over Time), resampled per location by the API
+        traffic_trends = load_frame("traffic/timeseries", timeseries_params(selected_location, selected_severity, start_date, end_date))
+        if not traffic_trends.empty:
+            fig_area = px.area(
+                traffic_trends,
+                x='bucket',
+                y='traffic_index',
+                color='location',
+                title="Traffic Index Over Time",
+                labels={'bucket': 'Date', 'traffic_index': 'Traffic Index'}
+            )
+            fig_area.update_layout(height=400)
+            st.plotly_chart(fig_area, use_container_width=True)
         
         # Treemap (Delays by Location and Severity)
-        treemap_data = filtered_df.groupby(['location', 'severity'])['delay_minutes'].sum().reset_index()
+        treemap_data = filtered_df.groupby(['location', 'severity'], observed=True)['delay_minutes'].sum().reset_index()
         fig_treemap = px.treemap(
             treemap_data,
             path=['location', 'severity'],
@@ -1183,19 +1117,9 @@ elif section == "Metrics":
     st.header("Metrics")
     
     # Fetch data from multiple endpoints
-    deliveries = fetch_data("deliveries")
-    vehicles = fetch_data("vehicles")
-    drivers = fetch_data("drivers")
-    maintenance = fetch_data("maintenance")
-    traffic = fetch_data("traffic")
-    slas = fetch_data("slas")
-    
-    df_deliveries = pd.DataFrame(deliveries)
-    df_vehicles = pd.DataFrame(vehicles)
-    df_drivers = pd.DataFrame(drivers)
-    df_maintenance = pd.DataFrame(maintenance)
-    df_traffic = pd.DataFrame(traffic)
-    df_slas = pd.DataFrame(slas)
+    df_deliveries, df_vehicles, df_drivers, df_maintenance, df_traffic, df_slas = load_frames(
+        "deliveries", "vehicles", "drivers", "maintenance", "traffic", "slas", incremental=True
+    )
     
     if not (df_deliveries.empty or df_vehicles.empty):
         # Convert datetime fields
@@ -1259,33 +1183,26 @@ elif section == "Metrics":
                 selected_vehicle_status = st.multiselect("Vehicle Status", options=vehicle_status_options, default=vehicle_status_options)
         
         # Apply Filters
-        filtered_deliveries = df_deliveries.copy()
-        filtered_vehicles = df_vehicles.copy()
-        filtered_drivers = df_drivers.copy()
-        filtered_maintenance = df_maintenance.copy()
-        filtered_traffic = df_traffic.copy()
-        
-        if start_date is not None and end_date is not None:
-            if not filtered_deliveries.empty:
-                filtered_deliveries = filtered_deliveries[
-                    (filtered_deliveries['date'] >= start_date) & 
-                    (filtered_deliveries['date'] <= end_date)
-                ]
-            if not filtered_traffic.empty:
-                filtered_traffic = filtered_traffic[
-                    (filtered_traffic['timestamp'] >= start_date) & 
-                    (filtered_traffic['timestamp'] <= end_date)
-                ]
-        if selected_sla and not filtered_deliveries.empty:
-            filtered_deliveries = filtered_deliveries[filtered_deliveries['sla_type'].isin(selected_sla)]
-        if selected_driver_status and not filtered_deliveries.empty and not filtered_drivers.empty:
-            filtered_deliveries = filtered_deliveries[filtered_deliveries['driver_id'].isin(
-                filtered_drivers[filtered_drivers['status'].isin(selected_driver_status)]['id']
-            )]
-        if selected_vehicle_status and not filtered_deliveries.empty and not filtered_vehicles.empty:
-            filtered_deliveries = filtered_deliveries[filtered_deliveries['vehicle_id'].isin(
-                filtered_vehicles[filtered_vehicles['status'].isin(selected_vehicle_status)]['id']
-            )]
+        filtered_deliveries = df_deliveries
+        filtered_vehicles = df_vehicles
+        filtered_drivers = df_drivers
+        filtered_maintenance = df_maintenance
+        filtered_traffic = df_traffic
+        
+        if not filtered_deliveries.empty:
+            # Driver and vehicle status select the deliveries of those drivers and vehicles
+            driver_ids = list(df_drivers[df_drivers['status'].isin(selected_driver_status)]['id']) if selected_driver_status and not df_drivers.empty else None
+            vehicle_ids = list(df_vehicles[df_vehicles['status'].isin(selected_vehicle_status)]['id']) if selected_vehicle_status and not df_vehicles.empty else None
+            index = filter_index(df_deliveries, categories=['sla_type', 'driver_id', 'vehicle_id'], ranges=['date'])
+            filtered_deliveries = index.filter(
+                df_deliveries,
+                isin={'sla_type': selected_sla, 'driver_id': driver_ids, 'vehicle_id': vehicle_ids},
+                between={'date': (start_date, end_date)},
+            )
+        if not filtered_traffic.empty:
+            index = filter_index(df_traffic, ranges=['timestamp'])
+            filtered_traffic = index.filter(df_traffic, between={'timestamp': (start_date, end_date)})
+        if selected_vehicle_status and not df_deliveries.empty and not filtered_vehicles.empty:
             filtered_vehicles = filtered_vehicles[filtered_vehicles['status'].isin(selected_vehicle_status)]
         
         # Visualizations
@@ -1306,20 +1223,15 @@ elif section == "Metrics":
         
         # Radar Chart (Driver Performance Metrics)
         if not filtered_drivers.empty:
-            driver_metrics = filtered_drivers.groupby('status').agg({
-                'punctuality_score': 'mean',
-                'total_deliveries': 'mean',
-                'incident_count': 'mean'
-            }).reset_index()
+            driver_metrics = radar_vectors(filtered_drivers, 'status', {
+                'punctuality_score': 100,  # Normalize to 0-1
+                'total_deliveries': lambda means: means.max(),
+                'incident_count': lambda means: means.max() + 1,
+            })
             fig_radar = go.Figure()
-            for status in driver_metrics['status']:
-                metrics = driver_metrics[driver_metrics['status'] == status]
+            for status, r in driver_metrics.items():
                 fig_radar.add_trace(go.Scatterpolar(
-                    r=[
-                        metrics['punctuality_score'].iloc[0] / 100,  # Normalize to 0-1
-                        metrics['total_deliveries'].iloc[0] / driver_metrics['total_deliveries'].max(),
-                        metrics['incident_count'].iloc[0] / (driver_metrics['incident_count'].max() + 1)
-                    ],
+                    r=r,
                     theta=['Punctuality', 'Deliveries', 'Incidents'],
                     fill='toself',
                     name=status
@@ -1361,4 +1273,8 @@ elif section == "Metrics":
             fig_waterfall.update_layout(title="Cost Breakdown ($)", height=400)
             st.plotly_chart(fig_waterfall, use_container_width=True)
 else:
-    st.warning("Insufficient data for cost breakdown.")
\ No newline at end of file
+    st.warning("Insufficient data for cost breakdown.")
+
+# Cached tables, after this run loaded what the section needed
+with st.sidebar.expander("Data memory"):
+    st.dataframe(memory_report(), hide_index=True, use_container_width=True)
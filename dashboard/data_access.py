@@ -0,0 +1,266 @@
+import itertools
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+BASE_URL = os.getenv("DASHBOARD_API_URL", "http://localhost:8000/api")
+CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "60"))
+# Longest an incremental frame goes without a full revalidation
+FULL_REFRESH_TTL = float(os.getenv("DASHBOARD_FULL_REFRESH_TTL", "600"))
+FETCH_WORKERS = int(os.getenv("DASHBOARD_FETCH_WORKERS", "8"))
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Parsed frames are kept once per server process and shared by every session
+# of both dashboards. Within the TTL a rerun costs a DataFrame copy; after it
+# the API is asked again with If-None-Match, and a 304 keeps the parsed frame.
+
+# Bumped whenever a cached frame changes; copies carry it in attrs["version"]
+# so per-frame structures (filters.filter_index) can be cached against it
+_versions = itertools.count(1)
+
+class CachedFrame:
+    __slots__ = ("frame", "version", "etag", "fetched_at", "revalidated_at", "lock")
+
+    def __init__(self):
+        self.frame = None
+        self.version = None
+        self.etag = None
+        self.fetched_at = 0.0
+        self.revalidated_at = 0.0
+        # One download per table however many sessions miss at once
+        self.lock = threading.Lock()
+
+class FrameStore:
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def entry(self, key) -> CachedFrame:
+        with self.lock:
+            return self.entries.setdefault(key, CachedFrame())
+
+    def invalidate(self, endpoint=None):
+        with self.lock:
+            for key in list(self.entries):
+                if endpoint is None or key[0] == endpoint:
+                    del self.entries[key]
+
+@st.cache_resource
+def frame_store():
+    return FrameStore()
+
+@st.cache_resource
+def http_session():
+    # Keep-alive connections to the API, enough for every fetch worker
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=FETCH_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def fetch_pool():
+    return ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="dashboard-fetch")
+
+# Dashboard-side dtypes per endpoint: low-cardinality strings become
+# categoricals and datetimes are parsed here once; floats and ints are
+# downcast for every endpoint where the values fit.
+FRAME_SCHEMAS = {
+    "deliveries": {
+        "category": ["status", "sla_type", "vehicle_condition", "weather_condition", "weather_severity", "time_of_day", "day_of_week"],
+        "datetime": ["scheduled_time", "actual_time", "date", "updated_at"],
+    },
+    "drivers": {"category": ["status", "training_completed"], "datetime": ["joined_date", "updated_at"]},
+    "vehicles": {"category": ["model", "status", "tire_condition"], "datetime": ["last_maintenance_date", "updated_at"]},
+    "maintenance": {"category": ["type", "status"], "datetime": ["date", "updated_at"]},
+    "routes": {"datetime": ["updated_at"]},
+    "slas": {"datetime": ["updated_at"]},
+    "traffic": {"category": ["location", "severity"], "datetime": ["timestamp", "updated_at"]},
+    "weather": {"category": ["location", "condition", "severity"], "datetime": ["timestamp", "updated_at"]},
+    "traffic/timeseries": {"category": ["location"], "datetime": ["bucket"]},
+    "weather/timeseries": {"category": ["location"], "datetime": ["bucket"]},
+}
+INT32 = np.iinfo(np.int32)
+
+def _key(endpoint, params):
+    items = (params or {}).items()
+    return endpoint, tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in items))
+
+def read_arrow(content, categories=()):
+    with pa.ipc.open_stream(content) as reader:
+        table = reader.read_all()
+    # The API dictionary-encodes every string column; only the schema's
+    # categories stay that way, the rest decode to plain strings
+    table = pa.table([
+        column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) and name not in categories else column
+        for name, column in zip(table.column_names, table.columns)
+    ], names=table.column_names)
+    return table.to_pandas()
+
+def _sorted_categories(series):
+    # Arrow dictionaries list values in order of first appearance; sorted
+    # categories keep groupby and chart order the same across datasets
+    categories = series.cat.categories
+    if categories.is_monotonic_increasing:
+        return series
+    return series.cat.reorder_categories(categories.sort_values())
+
+def typed_frame(endpoint, frame):
+    schema = FRAME_SCHEMAS.get(endpoint, {})
+    for column in schema.get("category", ()):
+        if column in frame.columns:
+            if isinstance(frame[column].dtype, pd.CategoricalDtype):
+                frame[column] = _sorted_categories(frame[column])
+            else:
+                frame[column] = frame[column].astype("category")
+    for column in schema.get("datetime", ()):
+        if column in frame.columns and not pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = pd.to_datetime(frame[column])
+    for column in frame.select_dtypes("float64").columns:
+        # Only where float32 holds every value exactly: costs, coordinates
+        # and label-like values are shown as they are stored
+        values = frame[column].to_numpy()
+        narrow = values.astype("float32")
+        if np.array_equal(narrow.astype("float64"), values, equal_nan=True):
+            frame[column] = narrow
+    for column in frame.select_dtypes("int64").columns:
+        # No narrower than int32: sections do arithmetic on these columns
+        # that would wrap around in int8/int16
+        values = frame[column]
+        if values.empty or (values.min() >= INT32.min and values.max() <= INT32.max):
+            frame[column] = values.astype("int32")
+    return frame
+
+def _get(endpoint, params=None, etag=None):
+    # (frame, etag); frame is None when the API answered 304
+    headers = {"Accept": ARROW_STREAM}
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    response = http_session().get(f"{BASE_URL}/{endpoint}", params=params, headers=headers)
+    if response.status_code == 304:
+        return None, etag
+    response.raise_for_status()
+    if response.headers.get("content-type", "").startswith(ARROW_STREAM):
+        frame = read_arrow(response.content, FRAME_SCHEMAS.get(endpoint, {}).get("category", ()))
+    else:
+        frame = pd.DataFrame(response.json())
+    return typed_frame(endpoint, frame), response.headers.get("etag")
+
+def append_rows(frame, delta):
+    # Arrow categoricals from separate responses have different categories;
+    # widen them first so concat keeps the columns categorical.
+    for column in frame.select_dtypes("category").columns:
+        if column in delta.columns and isinstance(delta[column].dtype, pd.CategoricalDtype):
+            categories = frame[column].cat.categories.union(delta[column].cat.categories)
+            frame[column] = frame[column].cat.set_categories(categories)
+            delta[column] = delta[column].cat.set_categories(categories)
+    return pd.concat([frame, delta], ignore_index=True)
+
+def _refresh(entry, endpoint, params, incremental):
+    frame = entry.frame
+    if (incremental and frame is not None and not frame.empty and 'id' in frame.columns
+            and time.monotonic() - entry.revalidated_at < FULL_REFRESH_TTL):
+        # Only rows past the highest id held. The ETag is left alone: it still
+        # describes the last full read, so the full revalidation below sees
+        # any deletes or updates the deltas missed.
+        delta, _ = _get(endpoint, {**(params or {}), "since_id": int(frame['id'].max())})
+        if not delta.empty:
+            entry.frame, entry.version = append_rows(frame, delta), next(_versions)
+            entry.fetched_at = time.monotonic()
+            return
+        # Nothing new: revalidate the whole table, which is a 304 unless rows
+        # were deleted, updated or re-inserted under ids already seen
+    frame, etag = _get(endpoint, params, entry.etag if frame is not None else None)
+    if frame is not None:
+        entry.frame, entry.version, entry.etag = frame, next(_versions), etag
+    entry.fetched_at = entry.revalidated_at = time.monotonic()
+
+def _report(endpoint, error):
+    if isinstance(error, requests.exceptions.HTTPError):
+        st.error(f"HTTP Error fetching {endpoint}: {error}")
+    elif isinstance(error, requests.exceptions.JSONDecodeError):
+        st.error(f"JSON Decode Error for {endpoint}: {error}")
+    elif isinstance(error, pa.ArrowInvalid):
+        st.error(f"Arrow Decode Error for {endpoint}: {error}")
+    else:
+        st.error(f"Error fetching {endpoint}: {error}")
+
+def _load(endpoint, params, ttl, incremental):
+    # (frame, error); st calls only work on the script thread, so errors are
+    # handed back to be reported there
+    entry = frame_store().entry(_key(endpoint, params))
+    error = None
+    with entry.lock:
+        if entry.frame is None or time.monotonic() - entry.fetched_at >= ttl:
+            try:
+                _refresh(entry, endpoint, params, incremental)
+            except (requests.RequestException, pa.ArrowInvalid) as e:
+                # Keep serving the last good frame; the next rerun retries
+                error = e
+        frame, version = entry.frame, entry.version
+    if frame is None:
+        return pd.DataFrame(), error
+    # Sections convert columns in place; keep the shared frame untouched
+    frame = frame.copy()
+    frame.attrs["version"] = version
+    return frame, error
+
+def load_frame(endpoint, params=None, ttl=CACHE_TTL, incremental=False):
+    # incremental: refresh by since_id instead of re-reading the table
+    frame, error = _load(endpoint, params, ttl, incremental)
+    if error is not None:
+        _report(endpoint, error)
+    return frame
+
+def load_frames(*endpoints, ttl=CACHE_TTL, incremental=False):
+    # All at once, so a section waits for its slowest table rather than the sum
+    futures = [fetch_pool().submit(_load, endpoint, None, ttl, incremental) for endpoint in endpoints]
+    frames = []
+    for endpoint, future in zip(endpoints, futures):
+        frame, error = future.result()
+        if error is not None:
+            _report(endpoint, error)
+        frames.append(frame)
+    return frames
+
+def invalidate(endpoint=None):
+    frame_store().invalidate(endpoint)
+
+def _untyped_bytes(series):
+    # What the column takes as object strings and 64-bit numbers, the way
+    # it was held before typed_frame
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        counts = np.bincount(series.cat.codes[series.cat.codes >= 0], minlength=len(series.cat.categories))
+        sizes = np.array([sys.getsizeof(value) for value in series.cat.categories], dtype=np.int64)
+        return 8 * len(series) + int(counts @ sizes) if len(sizes) else 8 * len(series)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return 8 * len(series)
+    return int(series.memory_usage(deep=True, index=False))
+
+def memory_report():
+    # One row per cached frame: its size now against the untyped layout
+    with frame_store().lock:
+        entries = list(frame_store().entries.items())
+    rows = []
+    for (endpoint, params), entry in entries:
+        frame = entry.frame
+        if frame is None:
+            continue
+        typed = int(frame.memory_usage(deep=True, index=False).sum())
+        untyped = sum(_untyped_bytes(frame[column]) for column in frame.columns)
+        rows.append({
+            "endpoint": endpoint + "".join(f" {k}={','.join(v) if isinstance(v, tuple) else v}" for k, v in params),
+            "rows": len(frame),
+            "untyped_mb": round(untyped / 2**20, 3),
+            "typed_mb": round(typed / 2**20, 3),
+            "saving": f"{untyped / typed:.1f}x" if typed else "",
+        })
+    return pd.DataFrame(rows, columns=["endpoint", "rows", "untyped_mb", "typed_mb", "saving"])
@@ -1,26 +1,11 @@
 import streamlit as st
-import requests
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date
-
-BASE_URL = "http://localhost:8000/api"
-
-def fetch_data(endpoint):
-    try:
-        response = requests.get(f"{BASE_URL}/{endpoint}")
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as e:
-        st.error(f"HTTP Error fetching {endpoint}: {e}")
-        return []
-    except requests.exceptions.JSONDecodeError as e:
-        st.error(f"JSON Decode Error for {endpoint}: {e}")
-        return []
-    except requests.RequestException as e:
-        st.error(f"Error fetching {endpoint}: {e}")
-        return []
+from data_access import invalidate, load_frames, memory_report
+from filters import filter_index
+from chart_data import age_days, map_points, radar_vectors, sankey_links
 
 st.set_page_config(page_title="Logistics Fleet Management", layout="wide")
 # st.title("Logistics Fleet Management Dashboard")
@@ -54,19 +39,16 @@ with st.sidebar:
                 "Route & External Impacts"
             ],
         )
+    if st.button("Reload data"):
+        # Drops the cached tables for every session
+        invalidate()
 
 # Delivery & Driver Performance Section
 if section == "Delivery & Driver Performance":
     st.header("Delivery & Driver Performance")
     
     # Fetch data
-    deliveries = fetch_data("deliveries")
-    drivers = fetch_data("drivers")
-    slas = fetch_data("slas")
-    
-    df_deliveries = pd.DataFrame(deliveries)
-    df_drivers = pd.DataFrame(drivers)
-    df_slas = pd.DataFrame(slas)
+    df_deliveries, df_drivers, df_slas = load_frames("deliveries", "drivers", "slas")
     
     if not (df_deliveries.empty or df_drivers.empty or df_slas.empty):
         # Data preprocessing
@@ -133,20 +115,22 @@ if section == "Delivery & Driver Performance":
                 selected_training = st.multiselect("Training Completed", training_options, default=training_options)
         
         # Apply Filters
-        filtered_df = merged_df.copy()
-        if selected_status:
-            filtered_df = filtered_df[filtered_df['status'].isin(selected_status)]
-        if selected_sla_type:
-            filtered_df = filtered_df[filtered_df['sla_type'].isin(selected_sla_type)]
-        filtered_df = filtered_df[(filtered_df['date'] >= start_date) & (filtered_df['date'] <= end_date)]
-        if selected_compliance != "All":
-            filtered_df = filtered_df[filtered_df['sla_compliance'] == (1 if selected_compliance == "Compliant" else 0)]
-        filtered_df = filtered_df[
-            (filtered_df['punctuality_score'] >= selected_punctuality[0]) & 
-            (filtered_df['punctuality_score'] <= selected_punctuality[1])
-        ]
-        if selected_training:
-            filtered_df = filtered_df[filtered_df['training_completed'].isin(selected_training)]
+        index = filter_index(
+            merged_df,
+            categories=['status', 'sla_type', 'sla_compliance', 'training_completed'],
+            ranges=['date', 'punctuality_score'],
+            version=tuple(df.attrs.get("version") for df in (df_deliveries, df_drivers, df_slas)),
+        )
+        filtered_df = index.filter(
+            merged_df,
+            isin={
+                'status': selected_status,
+                'sla_type': selected_sla_type,
+                'sla_compliance': None if selected_compliance == "All" else [1 if selected_compliance == "Compliant" else 0],
+                'training_completed': selected_training,
+            },
+            between={'date': (start_date, end_date), 'punctuality_score': selected_punctuality},
+        )
         
         # Display Table
         desired_columns = [
@@ -159,12 +143,7 @@ if section == "Delivery & Driver Performance":
         # Visualizations
         st.subheader("Performance Insights")
         # Sankey Diagram
-        sankey_data = filtered_df.groupby(['sla_type', 'sla_compliance']).size().reset_index(name='count')
-        sankey_data['compliance_label'] = sankey_data['sla_compliance'].map({1: 'Compliant', 0: 'Non-Compliant'})
-        labels = list(sankey_data['sla_type'].unique()) + list(sankey_data['compliance_label'].unique())
-        source = [labels.index(sla) for sla in sankey_data['sla_type']]
-        target = [labels.index(comp) for comp in sankey_data['compliance_label']]
-        value = sankey_data['count']
+        labels, source, target, value = sankey_links(filtered_df, 'sla_type', 'sla_compliance', {1: 'Compliant', 0: 'Non-Compliant'})
         fig_sankey = go.Figure(data=[go.Sankey(
             node=dict(pad=15, thickness=20, line=dict(color="black", width=0.5), label=labels),
             link=dict(source=source, target=target, value=value)
@@ -181,24 +160,20 @@ if section == "Delivery & Driver Performance":
         
         # Sunburst Chart
         filtered_df['compliance_label'] = filtered_df['sla_compliance'].map({1: 'Compliant', 0: 'Non-Compliant'})
-        sunburst_data = filtered_df.groupby(['sla_type', 'compliance_label']).size().reset_index(name='count')
+        sunburst_data = filtered_df.groupby(['sla_type', 'compliance_label'], observed=True).size().reset_index(name='count')
         fig_sunburst = px.sunburst(sunburst_data, path=['sla_type', 'compliance_label'], values='count',
                                   title="Compliance by SLA")
         fig_sunburst.update_layout(height=400)
         st.plotly_chart(fig_sunburst, use_container_width=True)
         
         # Radar Chart
-        driver_metrics = filtered_df.groupby('status_driver').agg({
-            'punctuality_score': 'mean', 'incident_count': 'mean'
-        }).reset_index()
+        driver_metrics = radar_vectors(filtered_df, 'status_driver', {
+            'punctuality_score': 100, 'incident_count': lambda means: means.max() + 1
+        })
         fig_radar = go.Figure()
-        for status in driver_metrics['status_driver']:
-            metrics = driver_metrics[driver_metrics['status_driver'] == status]
+        for status, r in driver_metrics.items():
             fig_radar.add_trace(go.Scatterpolar(
-                r=[
-                    metrics['punctuality_score'].iloc[0] / 100,
-                    metrics['incident_count'].iloc[0] / (driver_metrics['incident_count'].max() + 1)
-                ],
+                r=r,
                 theta=['Punctuality', 'Incidents'],
                 fill='toself',
                 name=status
@@ -214,11 +189,7 @@ elif section == "Vehicle & Maintenance Management":
     st.header("Vehicle & Maintenance Management")
     
     # Fetch data
-    vehicles = fetch_data("vehicles")
-    maintenance = fetch_data("maintenance")
-    
-    df_vehicles = pd.DataFrame(vehicles)
-    df_maintenance = pd.DataFrame(maintenance)
+    df_vehicles, df_maintenance = load_frames("vehicles", "maintenance")
     
     if not (df_vehicles.empty or df_maintenance.empty):
         # Data preprocessing
@@ -294,23 +265,18 @@ elif section == "Vehicle & Maintenance Management":
                 selected_type = st.multiselect("Maintenance Type", type_options, default=type_options)
         
         # Apply Filters
-        filtered_df = merged_df.copy()
-        if selected_status and 'status' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['status'].isin(selected_status)]
-        if selected_vehicle:
-            filtered_df = filtered_df[filtered_df['vehicle_id'].isin(selected_vehicle)]
-        if 'fuel_efficiency' in filtered_df.columns:
-            filtered_df = filtered_df[
-                (filtered_df['fuel_efficiency'] >= selected_fuel_eff[0]) & 
-                (filtered_df['fuel_efficiency'] <= selected_fuel_eff[1])
-            ]
-        if 'last_maintenance_date' in filtered_df.columns:
-            filtered_df = filtered_df[
-                (filtered_df['last_maintenance_date'] >= start_date) & 
-                (filtered_df['last_maintenance_date'] <= end_date)
-            ]
-        if selected_type and 'type' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['type'].isin(selected_type)]
+        index = filter_index(
+            merged_df,
+            # Only the columns this merge produced, as the guards above
+            categories=[c for c in ['status', 'vehicle_id', 'type'] if c in merged_df.columns],
+            ranges=[c for c in ['fuel_efficiency', 'last_maintenance_date'] if c in merged_df.columns],
+            version=tuple(df.attrs.get("version") for df in (df_vehicles, df_maintenance)),
+        )
+        filtered_df = index.filter(
+            merged_df,
+            isin={c: v for c, v in [('status', selected_status), ('vehicle_id', selected_vehicle), ('type', selected_type)] if c in merged_df.columns},
+            between={c: v for c, v in [('fuel_efficiency', selected_fuel_eff), ('last_maintenance_date', (start_date, end_date))] if c in merged_df.columns},
+        )
         
         # Display Table
         desired_columns = [
@@ -332,7 +298,7 @@ elif section == "Vehicle & Maintenance Management":
         
         # Line Chart
         if 'last_maintenance_date' in filtered_df.columns and 'type' in filtered_df.columns:
-            filtered_df['maintenance_age_days'] = [(datetime.now().date() - d).days if pd.notna(d) else 0 for d in filtered_df['last_maintenance_date']]
+            filtered_df['maintenance_age_days'] = age_days(filtered_df['last_maintenance_date'])
             fig_line = px.line(filtered_df, x='last_maintenance_date', y='maintenance_age_days', color='type',
                               title="Days Since Last Maintenance by Type",
                               labels={'last_maintenance_date': 'Maintenance Date', 'maintenance_age_days': 'Days'})
@@ -358,13 +324,7 @@ elif section == "Route & External Impacts":
     st.header("Route & External Impacts")
     
     # Fetch data
-    routes = fetch_data("routes")
-    traffic = fetch_data("traffic")
-    weather = fetch_data("weather")
-    
-    df_routes = pd.DataFrame(routes)
-    df_traffic = pd.DataFrame(traffic)
-    df_weather = pd.DataFrame(weather)
+    df_routes, df_traffic, df_weather = load_frames("routes", "traffic", "weather")
     
     if not (df_routes.empty or df_traffic.empty or df_weather.empty):
         # Data preprocessing
@@ -438,20 +398,14 @@ elif section == "Route & External Impacts":
         # Visualizations
         st.subheader("Route & External Insights")
         # Scatter Map
-        map_data = []
-        for _, row in filtered_routes.iterrows():
-            map_data.extend([
-                {'lat': row['origin_lat'], 'lng': row['origin_lng'], 'type': 'Origin', 'route': row['route_name']},
-                {'lat': row['dest_lat'], 'lng': row['dest_lng'], 'type': 'Destination', 'route': row['route_name']}
-            ])
-        map_df = pd.DataFrame(map_data)
+        map_df = map_points(filtered_routes)
         fig_map = px.scatter_mapbox(map_df, lat='lat', lon='lng', color='type', hover_data=['route'],
                                    title="Route Origins and Destinations", mapbox_style="open-street-map", zoom=10)
         fig_map.update_layout(height=400, margin={"r":0,"t":40,"l":0,"b":0})
         st.plotly_chart(fig_map, use_container_width=True)
         
         # Treemap
-        treemap_data = filtered_traffic.groupby(['location', 'severity'])['delay_minutes'].sum().reset_index()
+        treemap_data = filtered_traffic.groupby(['location', 'severity'], observed=True)['delay_minutes'].sum().reset_index()
         fig_treemap = px.treemap(treemap_data, path=['location', 'severity'], values='delay_minutes',
                                 title="Delays by Location and Severity")
         fig_treemap.update_layout(height=400)
@@ -471,19 +425,9 @@ elif section == "Summary Dashboard":
     st.header("Summary Dashboard")
     
     # Fetch data
-    deliveries = fetch_data("deliveries")
-    vehicles = fetch_data("vehicles")
-    drivers = fetch_data("drivers")
-    maintenance = fetch_data("maintenance")
-    traffic = fetch_data("traffic")
-    slas = fetch_data("slas")
-    
-    df_deliveries = pd.DataFrame(deliveries)
-    df_vehicles = pd.DataFrame(vehicles)
-    df_drivers = pd.DataFrame(drivers)
-    df_maintenance = pd.DataFrame(maintenance)
-    df_traffic = pd.DataFrame(traffic)
-    df_slas = pd.DataFrame(slas)
+    df_deliveries, df_vehicles, df_drivers, df_maintenance, df_traffic, df_slas = load_frames(
+        "deliveries", "vehicles", "drivers", "maintenance", "traffic", "slas"
+    )
     
     if not (df_deliveries.empty or df_vehicles.empty or df_drivers.empty):
         # Data preprocessing
@@ -563,4 +507,8 @@ elif section == "Summary Dashboard":
         fig_gauge.update_layout(height=400)
         st.plotly_chart(fig_gauge, use_container_width=True)
     else:
-        st.warning("No data available for Summary Dashboard.")
\ No newline at end of file
+        st.warning("No data available for Summary Dashboard.")
+
+# Cached tables, after this run loaded what the section needed
+with st.sidebar.expander("Data memory"):
+    st.dataframe(memory_report(), hide_index=True, use_container_width=True)
@@ -0,0 +1,183 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+INDEX_CACHE_SIZE = 32
+MASK_CACHE_SIZE = 64
+MAX_BITMAPS = 32
+
+# Filter panels re-run on every widget change. A FilterIndex is built once per
+# loaded frame: a row bitmap for every value of the isin columns and, for the
+# range columns, row positions in value order. A selection is then a few
+# bitmap ORs, two searchsorted calls per range and one AND, and the frame is
+# copied once, by the final take. Columns with more than MAX_BITMAPS values
+# (driver_id, vehicle_id) keep their value codes instead of a bitmap each.
+
+def _range_values(series):
+    # Sections turn datetime columns into date objects; index those as datetimes
+    if series.dtype == object:
+        return pd.to_datetime(series).to_numpy()
+    return series.to_numpy()
+
+class FilterIndex:
+    def __init__(self, frame, categories=(), ranges=()):
+        self.rows = len(frame)
+        self.bitmaps = {}
+        self.codes = {}
+        self.valid = {}
+        for column in categories:
+            codes, values = pd.factorize(frame[column])
+            if len(values) > MAX_BITMAPS:
+                self.codes[column] = (codes.astype(np.int32), {value: i for i, value in enumerate(values)})
+                continue
+            self.bitmaps[column] = {value: codes == i for i, value in enumerate(values)}
+            # isin never matches missing values
+            self.valid[column] = None if (codes >= 0).all() else codes >= 0
+        self.sorted = {}
+        for column in ranges:
+            values = _range_values(frame[column])
+            order = np.argsort(values, kind="stable")
+            values = values[order]
+            # NaN and NaT sort last and never fall in a range
+            present = len(values) - int(pd.isna(values).sum())
+            self.sorted[column] = (order, values, present)
+        self._masks = OrderedDict()
+        self._last_range = {}
+        self._lock = threading.Lock()
+
+    def _isin(self, column, selected):
+        if column in self.codes:
+            codes, positions = self.codes[column]
+            # The extra last slot is where missing values (code -1) look
+            chosen = np.zeros(len(positions) + 1, dtype=bool)
+            chosen[[positions[value] for value in selected if value in positions]] = True
+            return chosen[codes]
+        bitmaps = self.bitmaps[column]
+        chosen = [bitmap for value, bitmap in bitmaps.items() if value in selected]
+        if len(chosen) == len(bitmaps):
+            return self.valid[column]
+        if not chosen:
+            return np.zeros(self.rows, dtype=bool)
+        if len(chosen) * 2 <= len(bitmaps):
+            mask = chosen[0].copy()
+            for bitmap in chosen[1:]:
+                mask |= bitmap
+            return mask
+        # Most values chosen: clear the few that are not
+        mask = np.ones(self.rows, dtype=bool) if self.valid[column] is None else self.valid[column].copy()
+        for value, bitmap in bitmaps.items():
+            if value not in selected:
+                mask &= ~bitmap
+        return mask
+
+    def _between(self, column, low, high):
+        order, values, present = self.sorted[column]
+        whole_days = values.dtype.kind == "M"
+        start, stop = 0, present
+        if low is not None:
+            start = int(np.searchsorted(values[:present], self._bound(values, low), "left"))
+        if high is not None:
+            if whole_days and isinstance(high, date) and not isinstance(high, datetime):
+                # An end date includes all of that day
+                stop = int(np.searchsorted(values[:present], self._bound(values, high + timedelta(days=1)), "left"))
+            else:
+                stop = int(np.searchsorted(values[:present], self._bound(values, high), "right"))
+        stop = max(start, stop)
+        if start == 0 and stop == self.rows:
+            return None
+        last = self._last_range.get(column)
+        if last is not None and abs(start - last[0]) + abs(stop - last[1]) < min(stop - start, self.rows - stop + start):
+            # A moved slider: only the rows between the old and new bounds change
+            last_start, last_stop, mask = last
+            mask = mask.copy()
+            mask[order[start:last_start]] = True
+            mask[order[last_stop:stop]] = True
+            mask[order[last_start:start]] = False
+            mask[order[stop:last_stop]] = False
+        elif stop - start <= self.rows // 2:
+            # Otherwise set or clear whichever side touches fewer rows
+            mask = np.zeros(self.rows, dtype=bool)
+            mask[order[start:stop]] = True
+        else:
+            mask = np.ones(self.rows, dtype=bool)
+            mask[order[:start]] = False
+            mask[order[stop:]] = False
+        self._last_range[column] = (start, stop, mask)
+        return mask
+
+    @staticmethod
+    def _bound(values, bound):
+        if values.dtype.kind == "M":
+            return np.datetime64(pd.Timestamp(bound)).astype(values.dtype)
+        if values.dtype.kind == "f":
+            # Compare at the column's precision, as the panels' float32 masks do
+            return values.dtype.type(bound)
+        return bound
+
+    def _mask(self, key, build):
+        with self._lock:
+            if key in self._masks:
+                self._masks.move_to_end(key)
+                return self._masks[key]
+        mask = build()
+        with self._lock:
+            self._masks[key] = mask
+            while len(self._masks) > MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+        return mask
+
+    def mask(self, isin=None, between=None):
+        # None when nothing is filtered out. Empty multiselects filter nothing,
+        # as in the panels before; cached masks are shared, so never modify them.
+        masks = []
+        for column, selected in (isin or {}).items():
+            if selected:
+                selected = frozenset(selected)
+                masks.append(self._mask(("isin", column, selected), lambda: self._isin(column, selected)))
+        for column, (low, high) in (between or {}).items():
+            if low is not None or high is not None:
+                masks.append(self._mask(("between", column, low, high), lambda: self._between(column, low, high)))
+        masks = [mask for mask in masks if mask is not None]
+        if not masks:
+            return None
+        if len(masks) == 1:
+            return masks[0]
+        combined = np.logical_and(masks[0], masks[1])
+        for mask in masks[2:]:
+            combined &= mask
+        return combined
+
+    def filter(self, frame, isin=None, between=None):
+        if len(frame) != self.rows:
+            raise ValueError(f"FilterIndex built for {self.rows} rows, frame has {len(frame)}")
+        mask = self.mask(isin, between)
+        return frame if mask is None else frame[mask]
+
+@st.cache_resource
+def _index_cache():
+    return OrderedDict(), threading.Lock()
+
+def filter_index(frame, categories=(), ranges=(), version=None):
+    # Shared by all sessions, keyed by the version of the loaded data (frames
+    # from load_frame carry it in attrs; pass it for frames merged from
+    # several). The section must prepare the frame the same way every run.
+    if version is None:
+        version = frame.attrs.get("version")
+    if version is None:
+        return FilterIndex(frame, categories, ranges)
+    key = (version, len(frame), tuple(categories), tuple(ranges))
+    cache, lock = _index_cache()
+    with lock:
+        index = cache.get(key)
+        if index is not None:
+            cache.move_to_end(key)
+            return index
+    index = FilterIndex(frame, categories, ranges)
+    with lock:
+        cache[key] = index
+        while len(cache) > INDEX_CACHE_SIZE:
+            cache.popitem(last=False)
+    return index
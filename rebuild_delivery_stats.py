@@ -0,0 +1,12 @@
+from api.database import Base, SessionLocal, engine
+from api.crud.delivery_stats import rebuild_delivery_stats
+
+# Recomputes the delivery_daily_stats rollup from the deliveries table, e.g.
+# after loading data directly into the database. Safe to run repeatedly.
+Base.metadata.create_all(bind=engine)
+db = SessionLocal()
+try:
+    groups = rebuild_delivery_stats(db)
+finally:
+    db.close()
+print(f"Rebuilt delivery_daily_stats: {groups} groups.")
\ No newline at end of file
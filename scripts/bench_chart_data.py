@@ -0,0 +1,131 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Run from the repository root: python -m scripts.bench_chart_data
+# The dashboards import their modules from dashboard/, as streamlit run does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard"))
+
+from chart_data import age_days, map_points, radar_vectors, sankey_links
+
+COMPLIANCE_LABELS = {1: 'Compliant', 0: 'Non-Compliant'}
+RADAR_SCALES = {
+    'punctuality_score': 100,
+    'total_deliveries': lambda means: means.max(),
+    'incident_count': lambda means: means.max() + 1,
+}
+
+def generate_frame(count, seed=0):
+    # Columns as the dashboards hold them after load_frame and the section's conversions
+    rng = np.random.default_rng(seed)
+    dates = pd.Series(pd.to_datetime("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, count), unit="D"))
+    dates[rng.random(count) < 0.01] = pd.NaT
+    return pd.DataFrame({
+        'route_name': np.array([f"Route {i}" for i in range(count)], dtype=object),
+        'origin_lat': rng.uniform(12, 29, count).astype("float32"),
+        'origin_lng': rng.uniform(72, 89, count).astype("float32"),
+        'dest_lat': rng.uniform(12, 29, count).astype("float32"),
+        'dest_lng': rng.uniform(72, 89, count).astype("float32"),
+        'sla_type': pd.Categorical(rng.choice(["Express", "Standard", "Economy"], count)),
+        'sla_compliance': rng.integers(0, 2, count).astype("int32"),
+        'status': pd.Categorical(rng.choice(["Active", "Inactive", "On Leave"], count)),
+        'punctuality_score': rng.uniform(50, 100, count).astype("float32"),
+        'total_deliveries': rng.integers(0, 500, count).astype("int32"),
+        'incident_count': rng.integers(0, 6, count).astype("int32"),
+        'last_maintenance_date': dates.dt.date,
+    })
+
+# The panels' row-loop versions, kept here as the baseline
+
+def loop_map_points(frame):
+    map_data = []
+    for _, row in frame.iterrows():
+        map_data.extend([
+            {'lat': row['origin_lat'], 'lng': row['origin_lng'], 'type': 'Origin', 'route': row['route_name']},
+            {'lat': row['dest_lat'], 'lng': row['dest_lng'], 'type': 'Destination', 'route': row['route_name']}
+        ])
+    return pd.DataFrame(map_data)
+
+def loop_sankey_links(frame):
+    sankey_data = frame.groupby(['sla_type', 'sla_compliance'], observed=True).size().reset_index(name='count')
+    sankey_data['compliance_label'] = sankey_data['sla_compliance'].map(COMPLIANCE_LABELS)
+    labels = list(sankey_data['sla_type'].unique()) + list(sankey_data['compliance_label'].unique())
+    source = [labels.index(sla) for sla in sankey_data['sla_type']]
+    target = [labels.index(comp) for comp in sankey_data['compliance_label']]
+    return labels, source, target, list(sankey_data['count'])
+
+def loop_radar_vectors(frame):
+    driver_metrics = frame.groupby('status', observed=True).agg({
+        'punctuality_score': 'mean', 'total_deliveries': 'mean', 'incident_count': 'mean'
+    }).reset_index()
+    vectors = {}
+    for status in driver_metrics['status']:
+        metrics = driver_metrics[driver_metrics['status'] == status]
+        vectors[status] = [
+            metrics['punctuality_score'].iloc[0] / 100,
+            metrics['total_deliveries'].iloc[0] / driver_metrics['total_deliveries'].max(),
+            metrics['incident_count'].iloc[0] / (driver_metrics['incident_count'].max() + 1)
+        ]
+    return vectors
+
+def loop_age_days(frame):
+    return [(datetime.now().date() - d).days if pd.notna(d) else 0 for d in frame['last_maintenance_date']]
+
+def same_map(slow, fast):
+    return slow.astype(object).equals(fast.astype(object))
+
+def same_sankey(slow, fast):
+    labels, source, target, value = fast
+    return slow == ([str(label) for label in labels], list(source), list(target), list(value))
+
+def same_radar(slow, fast):
+    # The loop averages in float32, the builder in float64
+    return list(slow) == list(fast) and all(np.allclose(slow[key], fast[key], rtol=1e-5) for key in slow)
+
+def same_age(slow, fast):
+    return slow == fast.tolist()
+
+BUILDERS = [
+    ("map_points", loop_map_points, map_points, same_map),
+    ("sankey_links", loop_sankey_links, lambda frame: sankey_links(frame, 'sla_type', 'sla_compliance', COMPLIANCE_LABELS), same_sankey),
+    ("radar_vectors", loop_radar_vectors, lambda frame: radar_vectors(frame, 'status', RADAR_SCALES), same_radar),
+    ("age_days", loop_age_days, lambda frame: age_days(frame['last_maintenance_date']), same_age),
+]
+
+def measure(fn, frame, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(frame)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the dashboards' row-loop chart data with the chart_data builders")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-loop-rows", type=int, default=1000000,
+                        help="skip the row-loop baseline above this many rows (iterrows needs about a minute per million)")
+    args = parser.parse_args()
+
+    print(f"{'builder':<14} {'rows':>8} {'loop ms':>10} {'vector ms':>10} {'speedup':>8}")
+    for count in args.rows:
+        frame = generate_frame(count)
+        for name, slow_fn, fast_fn, same in BUILDERS:
+            fast, fast_result = measure(fast_fn, frame, args.repeat)
+            if count > args.max_loop_rows:
+                print(f"{name:<14} {count:>8} {'-':>10} {fast * 1000:>10.2f} {'-':>8}")
+                continue
+            # The loops are the slow side; one run is enough at the larger sizes
+            slow, slow_result = measure(slow_fn, frame, 1 if count > 100000 else args.repeat)
+            if not same(slow_result, fast_result):
+                raise SystemExit(f"{name}: output differs from the row-loop version at {count} rows")
+            print(f"{name:<14} {count:>8} {slow * 1000:>10.2f} {fast * 1000:>10.2f} {slow / fast:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
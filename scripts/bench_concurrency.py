@@ -0,0 +1,70 @@
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+BASE_URL = "http://localhost:8000/api"
+
+# Measures how a cheap "probe" endpoint behaves while heavy reads run in
+# parallel. If DB calls block the event loop, probe latency tracks the slow
+# query; once they run off-loop it stays close to the probe's own cost.
+# Run it against the API before and after a change and compare the tables.
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def worker(url, deadline, latencies, errors, lock):
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            session.get(url, timeout=60).raise_for_status()
+        except requests.RequestException:
+            with lock:
+                errors.append(url)
+            continue
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+def run(base_url, slow_endpoint, probe_endpoint, slow_workers, probe_workers, duration):
+    lock = threading.Lock()
+    results = {slow_endpoint: [], probe_endpoint: []}
+    errors = []
+    deadline = time.perf_counter() + duration
+    with ThreadPoolExecutor(max_workers=slow_workers + probe_workers) as pool:
+        for _ in range(slow_workers):
+            pool.submit(worker, f"{base_url}/{slow_endpoint}", deadline, results[slow_endpoint], errors, lock)
+        for _ in range(probe_workers):
+            pool.submit(worker, f"{base_url}/{probe_endpoint}", deadline, results[probe_endpoint], errors, lock)
+    return results, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel-load latency benchmark for the API")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--slow-endpoint", default="deliveries/")
+    parser.add_argument("--probe-endpoint", default="slas/")
+    parser.add_argument("--slow-workers", type=int, default=8)
+    parser.add_argument("--probe-workers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    results, errors = run(args.base_url, args.slow_endpoint, args.probe_endpoint,
+                          args.slow_workers, args.probe_workers, args.duration)
+    print(f"{'endpoint':<20} {'requests':>9} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint, latencies in results.items():
+        if not latencies:
+            print(f"{endpoint:<20} {'0':>9}")
+            continue
+        print(f"{endpoint:<20} {len(latencies):>9} {len(latencies) / args.duration:>8.1f} "
+              f"{statistics.median(latencies) * 1000:>9.1f} {percentile(latencies, 95) * 1000:>9.1f} "
+              f"{percentile(latencies, 99) * 1000:>9.1f}")
+    if errors:
+        print(f"{len(errors)} failed requests")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import requests
+
+BASE_URL = "http://localhost:8000/api"
+
+# Posts single deliveries from parallel clients, the way telematics devices
+# report, and prints the sustained rows/s. Run it against the API with and
+# without INGEST_QUEUE=true; --wait asks for the synchronous ack (?wait=true).
+# --in-process skips HTTP and compares the two write paths directly:
+#   python -m scripts.bench_ingest --in-process 20000
+
+def delivery(i):
+    scheduled = datetime(2024, 1, 1) + timedelta(minutes=i)
+    return {
+        "vehicle_id": random.randint(1, 20), "driver_id": random.randint(1, 30),
+        "scheduled_time": scheduled.isoformat(), "actual_time": (scheduled + timedelta(minutes=20)).isoformat(),
+        "status": random.choice(["Delivered", "Delayed", "In Transit"]),
+        "sla_type": random.choice(["Express", "Standard", "Economy"]),
+        "distance_km": 12.5, "fuel_consumed": 2.1, "idle_time_min": 4.0, "vehicle_condition": "Good",
+        "origin_lat": 19.07, "origin_lng": 72.87, "dest_lat": 19.2, "dest_lng": 72.95,
+        "estimated_time_min": 35.0, "actual_time_min": 41.0, "fuel_efficiency": 9.5,
+        "estimated_fuel_cost": 140.0, "route_efficiency": 0.85, "traffic_index": 55.0,
+        "sla_compliance": random.randint(0, 1), "delay_minutes": 6.0, "penalty_amount": 0.0,
+        "weather_condition": "Clear", "weather_severity": "Low", "temperature": 29.0, "humidity": 60,
+        "wind_speed": 8.0, "date": scheduled.replace(hour=0, minute=0).isoformat(),
+        "time_of_day": "Morning", "day_of_week": scheduled.strftime("%A"), "is_weekend": scheduled.weekday() >= 5,
+    }
+
+def client(url, deadline, params, counts, lock):
+    session = requests.Session()
+    sent = rejected = 0
+    while time.perf_counter() < deadline:
+        response = session.post(url, json=delivery(sent), params=params, timeout=60)
+        if response.status_code == 503:
+            rejected += 1
+            time.sleep(float(response.headers.get("Retry-After", "1")))
+            continue
+        response.raise_for_status()
+        sent += 1
+    with lock:
+        counts["sent"] += sent
+        counts["rejected"] += rejected
+
+async def write_path(rows, queued, wait):
+    from fastapi import Response
+    from api.crud.delivery import create_delivery, create_delivery_batch
+    from api.database import SessionLocal, run_db
+    from api.ingest import close_ingest_queues, ingest
+    from api.schemas.delivery import DeliveryCreate
+
+    items = [DeliveryCreate(**delivery(i)) for i in range(rows)]
+    pending = asyncio.Semaphore(256)
+
+    def direct(item):
+        db = SessionLocal()
+        try:
+            return create_delivery(db, item).id
+        finally:
+            db.close()
+
+    async def submit(item):
+        async with pending:
+            if queued:
+                await ingest(Response(), "deliveries", create_delivery_batch, item, wait)
+            else:
+                await run_db(direct, item)
+
+    start = time.perf_counter()
+    if queued and not wait:
+        # Nothing to wait for per row, so one producer can keep the writer busy
+        for item in items:
+            await ingest(Response(), "deliveries", create_delivery_batch, item, False)
+    else:
+        await asyncio.gather(*(submit(item) for item in items))
+    await close_ingest_queues()
+    return time.perf_counter() - start
+
+def in_process(rows):
+    os.environ.setdefault("DATABASE_URL", "sqlite:///bench_ingest.db")
+    from api.crud.delivery import delete_all_deliveries
+    from api.database import Base, SessionLocal, engine
+    from api.models.delivery import Delivery
+    Base.metadata.create_all(bind=engine)
+    print(f"{'path':<24} {'rows':>8} {'rows/s':>10}")
+    for label, queued, wait in (("per-row transaction", False, False), ("queue, async ack", True, False), ("queue, sync ack", True, True)):
+        with SessionLocal() as db:
+            delete_all_deliveries(db)
+        elapsed = asyncio.run(write_path(rows, queued, wait))
+        with SessionLocal() as db:
+            stored = db.query(Delivery).count()
+        print(f"{label:<24} {stored:>8} {rows / elapsed:>10,.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-row POST ingest throughput for deliveries")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--wait", action="store_true", help="synchronous ack: wait for the assigned id")
+    parser.add_argument("--in-process", type=int, metavar="ROWS", help="compare write paths without HTTP")
+    args = parser.parse_args()
+    if args.in_process:
+        in_process(args.in_process)
+        return
+
+    params = {"wait": "true"} if args.wait else None
+    counts = {"sent": 0, "rejected": 0}
+    lock = threading.Lock()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        for _ in range(args.clients):
+            pool.submit(client, f"{args.base_url}/deliveries/", start + args.duration, params, counts, lock)
+    elapsed = time.perf_counter() - start
+    print(f"{counts['sent']} rows accepted in {elapsed:.1f}s: {counts['sent'] / elapsed:,.0f} rows/s "
+          f"({counts['rejected']} rejected with 503)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+# Run from the repository root: python -m scripts.bench_serialization
+# Benchmarks run against an in-memory SQLite database unless DATABASE_URL is set
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, insert
+from api.database import Base, SessionLocal, engine
+from api.models.delivery import Delivery
+from api.models.driver import Driver
+from api.models.maintenance import Maintenance
+from api.models.route import Route
+from api.models.sla import SLA
+from api.models.traffic import Traffic
+from api.models.vehicle import Vehicle
+from api.models.weather import Weather
+from api.schemas.delivery import DeliveryResponse
+from api.schemas.driver import DriverResponse
+from api.schemas.maintenance import MaintenanceResponse
+from api.schemas.route import RouteResponse
+from api.schemas.sla import SLAResponse
+from api.schemas.traffic import TrafficResponse
+from api.schemas.vehicle import VehicleResponse
+from api.schemas.weather import WeatherResponse
+from api.crud.delivery import get_deliveries
+from api.crud.driver import get_drivers
+from api.crud.maintenance import get_maintenance
+from api.crud.route import get_routes
+from api.crud.sla import get_slas
+from api.crud.traffic import get_traffic
+from api.crud.vehicle import get_vehicles
+from api.crud.weather import get_weather
+from api.pagination import PageParams
+from api.serialization import arrow_table, rows_response
+
+# Every list endpoint: model, the response_model it used to go through, and its read
+ENDPOINTS = [
+    ("deliveries", Delivery, DeliveryResponse, get_deliveries),
+    ("drivers", Driver, DriverResponse, get_drivers),
+    ("maintenance", Maintenance, MaintenanceResponse, get_maintenance),
+    ("routes", Route, RouteResponse, get_routes),
+    ("slas", SLA, SLAResponse, get_slas),
+    ("traffic", Traffic, TrafficResponse, get_traffic),
+    ("vehicles", Vehicle, VehicleResponse, get_vehicles),
+    ("weather", Weather, WeatherResponse, get_weather),
+]
+# Strings as the data generators store them where the schema reads them as another type
+STORED_STRINGS = {"training_completed": ["Yes", "No"]}
+
+def generate_rows(count):
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        scheduled = start + timedelta(minutes=17 * i)
+        rows.append({
+            "vehicle_id": random.randint(1, 20), "driver_id": random.randint(1, 30),
+            "scheduled_time": scheduled, "actual_time": scheduled + timedelta(minutes=random.randint(-30, 120)),
+            "status": random.choice(["Delivered", "Delayed", "In Transit"]),
+            "sla_type": random.choice(["Express", "Standard", "Economy"]),
+            "distance_km": random.uniform(5, 500), "fuel_consumed": random.uniform(1, 60),
+            "idle_time_min": random.uniform(0, 60), "vehicle_condition": random.choice(["Good", "Fair", "Poor"]),
+            "origin_lat": random.uniform(12, 29), "origin_lng": random.uniform(72, 89),
+            "dest_lat": random.uniform(12, 29), "dest_lng": random.uniform(72, 89),
+            "estimated_time_min": random.uniform(10, 600), "actual_time_min": random.uniform(10, 700),
+            "fuel_efficiency": random.uniform(5, 15), "estimated_fuel_cost": random.uniform(50, 5000),
+            "route_efficiency": random.uniform(0.5, 1.0), "traffic_index": random.uniform(0, 100),
+            "sla_compliance": random.randint(0, 1), "delay_minutes": random.uniform(-30, 120),
+            "penalty_amount": random.uniform(0, 500), "weather_condition": random.choice(["Clear", "Rain", "Snow"]),
+            "weather_severity": random.choice(["Low", "Moderate", "Severe"]), "temperature": random.uniform(10, 45),
+            "humidity": random.randint(20, 100), "wind_speed": random.uniform(0, 40),
+            "date": scheduled.replace(hour=0, minute=0, second=0), "time_of_day": random.choice(["Morning", "Afternoon", "Evening", "Night"]),
+            "day_of_week": scheduled.strftime("%A"), "is_weekend": scheduled.weekday() >= 5,
+        })
+    return rows
+
+def generate_model_rows(model, count):
+    # Any value of each column's type; enough to compare output shapes
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        row = {}
+        for column in model.__table__.columns:
+            if column.primary_key or column.info.get("internal") or column.name == "updated_at":
+                continue
+            if column.name in STORED_STRINGS:
+                row[column.name] = random.choice(STORED_STRINGS[column.name])
+            elif isinstance(column.type, Boolean):
+                row[column.name] = random.random() < 0.5
+            elif isinstance(column.type, Integer):
+                row[column.name] = random.randint(0, 100)
+            elif isinstance(column.type, Float):
+                row[column.name] = random.uniform(0, 80)
+            elif isinstance(column.type, DateTime):
+                row[column.name] = start + timedelta(minutes=17 * i)
+            elif isinstance(column.type, Date):
+                row[column.name] = (start + timedelta(days=i)).date()
+            else:
+                row[column.name] = random.choice(["A", "B", "C"]) + str(i % 7)
+        rows.append(row)
+    return rows
+
+def pydantic_models(db, model, schema):
+    # What FastAPI does for response_model=List[schema] over ORM objects
+    adapter = TypeAdapter(List[schema])
+    return adapter, adapter.validate_python(db.query(model).order_by(model.id).all(), from_attributes=True)
+
+def pydantic_path(db, model=Delivery, schema=DeliveryResponse):
+    adapter, models = pydantic_models(db, model, schema)
+    content = adapter.dump_python(models, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def orjson_path(db, read=get_deliveries):
+    return rows_response(read(db, PageParams())).body
+
+def check_shapes(count):
+    # JSON and Arrow from the Core path against the Pydantic output, row for row
+    for name, model, schema, read in ENDPOINTS:
+        with engine.begin() as conn:
+            conn.execute(model.__table__.delete())
+            conn.execute(insert(model), generate_model_rows(model, count))
+        db = SessionLocal()
+        try:
+            expected = json.loads(pydantic_path(db, model, schema))
+            if json.loads(orjson_path(db, read)) != expected:
+                raise SystemExit(f"{name}: JSON differs from the response_model output")
+            adapter, models = pydantic_models(db, model, schema)
+            if arrow_table(read(db, PageParams())).to_pylist() != adapter.dump_python(models):
+                raise SystemExit(f"{name}: Arrow values differ from the response_model output")
+        finally:
+            db.close()
+        print(f"{name}: JSON and Arrow match the response_model for {count} rows")
+
+def measure(fn, repeat):
+    best = float("inf")
+    body = None
+    for _ in range(repeat):
+        db = SessionLocal()
+        start = time.perf_counter()
+        body = fn(db)
+        best = min(best, time.perf_counter() - start)
+        db.close()
+    return best, body
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the Pydantic and Core+orjson read paths for deliveries")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check-rows", type=int, default=500, help="rows per endpoint for the output comparison")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    check_shapes(args.check_rows)
+    print(f"{'rows':>8} {'pydantic rows/s':>16} {'orjson rows/s':>14} {'speedup':>8}")
+    for count in args.rows:
+        with engine.begin() as conn:
+            conn.execute(Delivery.__table__.delete())
+            conn.execute(insert(Delivery), generate_rows(count))
+        slow, slow_body = measure(pydantic_path, args.repeat)
+        fast, fast_body = measure(orjson_path, args.repeat)
+        if json.loads(slow_body) != json.loads(fast_body):
+            raise SystemExit("JSON output differs between the two paths")
+        print(f"{count:>8} {count / slow:>16,.0f} {count / fast:>14,.0f} {slow / fast:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+import sys
+import tempfile
+import pytest
+
+# The dashboards import their modules from dashboard/, as streamlit run does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard"))
+
+# The API reads its settings at import: an in-memory SQLite database, an empty
+# archive and the debug endpoints off, before any test imports it
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ["ARCHIVE_DIR"] = tempfile.mkdtemp(prefix="logistics-archive-")
+os.environ["DEBUG_ENDPOINTS"] = "false"
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from api.main import app
+    return TestClient(app)
+
+@pytest.fixture
+def deliveries(client):
+    # Inserts through /batch; everything is deleted again after the test
+    def insert(rows):
+        response = client.post("/api/deliveries/batch", json=rows)
+        assert response.status_code == 200
+        return [row["id"] for row in response.json()]
+    yield insert
+    client.delete("/api/deliveries/all")
@@ -0,0 +1,33 @@
+# Request bodies for the create endpoints, with values the tests can override
+
+def delivery(sla_compliance=100, sla_type="Standard", **fields):
+    return {
+        "vehicle_id": 1, "driver_id": 1,
+        "scheduled_time": "2024-03-01T09:00:00", "actual_time": "2024-03-01T09:30:00",
+        "status": "Delivered", "sla_type": sla_type, "distance_km": 12.5, "fuel_consumed": 2.0,
+        "idle_time_min": 3.0, "vehicle_condition": "Good",
+        "origin_lat": 19.07, "origin_lng": 72.87, "dest_lat": 19.2, "dest_lng": 72.95,
+        "estimated_time_min": 40.0, "actual_time_min": 45.0, "fuel_efficiency": 8.0,
+        "estimated_fuel_cost": 180.0, "route_efficiency": 0.9, "traffic_index": 55.0,
+        "sla_compliance": sla_compliance, "delay_minutes": 5.0, "penalty_amount": 0.0,
+        "weather_condition": "Clear", "weather_severity": "Low", "temperature": 29.0,
+        "humidity": 70, "wind_speed": 8.0, "date": "2024-03-01T00:00:00",
+        "time_of_day": "Morning", "day_of_week": "Friday", "is_weekend": False,
+        **fields,
+    }
+
+def driver(i, training_completed="Yes"):
+    return {
+        "name": f"Driver {i}", "license_number": f"L{i}", "total_deliveries": i, "punctuality_score": 90.5,
+        "incident_count": 0, "status": "Active", "training_completed": training_completed,
+        "joined_date": "2024-01-01T00:00:00", "contact_number": "555",
+    }
+
+def traffic(timestamp, traffic_index, location="Mumbai", severity="Low"):
+    return {"location": location, "timestamp": timestamp, "traffic_index": traffic_index, "delay_minutes": 0.0, "severity": severity}
+
+def route(i, origin, dest):
+    return {
+        "origin_lat": origin[0], "origin_lng": origin[1], "dest_lat": dest[0], "dest_lng": dest[1],
+        "distance_km": 10.0, "typical_traffic": 50.0, "route_name": f"Route {i}",
+    }
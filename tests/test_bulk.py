@@ -0,0 +1,18 @@
+from tests.rows import driver
+
+def test_batch_returns_ids_in_input_order(client):
+    try:
+        ids = [row["id"] for row in client.post("/api/drivers/batch", json=[driver(i) for i in range(3)]).json()]
+        rows = client.get("/api/drivers/").json()
+        assert [row["id"] for row in rows] == ids
+        assert [row["name"] for row in rows] == ["Driver 0", "Driver 1", "Driver 2"]
+    finally:
+        client.delete("/api/drivers/all")
+
+def test_batch_without_ids(client):
+    try:
+        response = client.post("/api/drivers/batch", params={"return_ids": "false"}, json=[driver(i) for i in range(3)])
+        assert response.json() == {"count": 3}
+        assert len(client.get("/api/drivers/").json()) == 3
+    finally:
+        client.delete("/api/drivers/all")
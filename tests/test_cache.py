@@ -0,0 +1,40 @@
+from api.cache import ResponseCache
+from tests.rows import driver
+
+def test_etag_revalidation(client):
+    client.post("/api/drivers/batch", json=[driver(1)])
+    try:
+        first = client.get("/api/drivers/")
+        etag = first.headers["ETag"]
+        assert client.get("/api/drivers/", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/api/drivers/", headers={"If-Modified-Since": first.headers["Last-Modified"]}).status_code == 304
+
+        # A write through the API invalidates the table's entries
+        client.post("/api/drivers/batch", json=[driver(2)])
+        second = client.get("/api/drivers/", headers={"If-None-Match": etag})
+        assert second.status_code == 200
+        assert second.headers["ETag"] != etag
+        assert len(second.json()) == 2
+    finally:
+        client.delete("/api/drivers/all")
+
+def test_entries_expire(monkeypatch):
+    # Writes this process never saw show up once the entry is older than the TTL
+    now = [1000.0]
+    monkeypatch.setattr("api.cache.time.monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=30)
+    stored = cache.put("drivers", "key", 0, b"[1]", {})
+    assert cache.get("drivers", "key") is stored
+    now[0] += 30
+    assert cache.get("drivers", "key") is None
+
+    changed = cache.put("drivers", "key", 0, b"[1,2]", {})
+    assert changed.etag != stored.etag
+    assert changed.last_modified > stored.last_modified
+    assert cache.get("drivers", "key") is changed
+
+def test_zero_ttl_disables_cache():
+    cache = ResponseCache(ttl=0)
+    entry = cache.put("drivers", "key", 0, b"[1]", {})
+    assert entry.etag
+    assert cache.get("drivers", "key") is None
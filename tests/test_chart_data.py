@@ -0,0 +1,22 @@
+from datetime import date
+import pandas as pd
+import pytest
+from chart_data import age_days, sankey_links
+from scripts.bench_chart_data import BUILDERS, generate_frame
+
+@pytest.mark.parametrize("name, slow, fast, same", BUILDERS, ids=[builder[0] for builder in BUILDERS])
+def test_builders_match_the_row_loops(name, slow, fast, same):
+    frame = generate_frame(500, seed=1)
+    assert same(slow(frame), fast(frame))
+
+def test_sankey_unlabelled_targets_share_one_node():
+    # As Series.map: values missing from target_labels all go to None
+    frame = pd.DataFrame({"sla_type": ["Express", "Express", "Economy", "Economy"], "sla_compliance": [1, 85, 0, 92]})
+    labels, source, target, value = sankey_links(frame, "sla_type", "sla_compliance", {1: "Compliant", 0: "Non-Compliant"})
+    assert labels == ["Economy", "Express", "Non-Compliant", "Compliant", None]
+    links = sorted(zip((labels[i] for i in source), (labels[i] for i in target), value), key=str)
+    assert links == sorted([("Economy", "Non-Compliant", 1), ("Economy", None, 1), ("Express", "Compliant", 1), ("Express", None, 1)], key=str)
+
+def test_age_days_treats_missing_dates_as_zero():
+    dates = pd.Series([date(2024, 3, 1), None, date(2024, 2, 29)])
+    assert age_days(dates, today=date(2024, 3, 11)).tolist() == [10, 0, 11]
@@ -0,0 +1,119 @@
+import threading
+import pandas as pd
+import pytest
+import requests
+import data_access
+
+class FakeApi:
+    # Stands in for data_access._get, answering from a frame and an ETag, and
+    # for the clock the TTLs are measured on
+    def __init__(self, frame):
+        self.frame = frame
+        self.etag = '"1"'
+        self.calls = []
+        self.now = 1000.0
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def get(self, endpoint, params=None, etag=None):
+        params = params or {}
+        self.calls.append(("since_id" if "since_id" in params else "full", etag))
+        if "since_id" in params:
+            return self.frame[self.frame["id"] > params["since_id"]].reset_index(drop=True), '"delta"'
+        if etag == self.etag:
+            return None, etag
+        return self.frame.copy(), self.etag
+
+    def insert(self, ids):
+        self.frame = pd.concat([self.frame, pd.DataFrame({"id": ids})], ignore_index=True)
+        self.etag = f'"{len(self.frame)}"'
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeApi(pd.DataFrame({"id": [1, 2]}))
+    store = data_access.FrameStore()
+    monkeypatch.setattr(data_access, "_get", fake.get)
+    monkeypatch.setattr(data_access.time, "monotonic", lambda: fake.now)
+    monkeypatch.setattr(data_access, "frame_store", lambda: store)
+    return fake
+
+def test_frames_are_shared_within_the_ttl(api):
+    first = data_access.load_frame("slas", ttl=60)
+    api.advance(30)
+    second = data_access.load_frame("slas", ttl=60)
+    assert api.calls == [("full", None)]
+    assert first["id"].tolist() == second["id"].tolist() == [1, 2]
+    # Each caller gets its own copy
+    assert first is not second
+    assert first.attrs["version"] == second.attrs["version"]
+
+def test_revalidation_keeps_the_frame_on_304(api):
+    first = data_access.load_frame("slas", ttl=60)
+    api.advance(60)
+    second = data_access.load_frame("slas", ttl=60)
+    assert api.calls == [("full", None), ("full", '"1"')]
+    assert second.attrs["version"] == first.attrs["version"]
+
+def test_incremental_refresh_appends_the_delta(api):
+    data_access.load_frame("deliveries", ttl=60, incremental=True)
+    api.insert([3])
+    api.advance(60)
+    frame = data_access.load_frame("deliveries", ttl=60, incremental=True)
+    assert frame["id"].tolist() == [1, 2, 3]
+    # Nothing new: the whole table is revalidated against the last full read
+    api.advance(60)
+    data_access.load_frame("deliveries", ttl=60, incremental=True)
+    assert api.calls == [("full", None), ("since_id", None), ("since_id", None), ("full", '"1"')]
+
+def test_incremental_frames_get_a_full_read_after_full_refresh_ttl(api, monkeypatch):
+    monkeypatch.setattr(data_access, "FULL_REFRESH_TTL", 100)
+    data_access.load_frame("deliveries", ttl=60, incremental=True)
+    api.advance(100)
+    data_access.load_frame("deliveries", ttl=60, incremental=True)
+    assert api.calls == [("full", None), ("full", '"1"')]
+
+def test_load_frames_fetches_concurrently(monkeypatch):
+    # Both requests must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    errors = []
+
+    def get(endpoint, params=None, etag=None):
+        barrier.wait()
+        if endpoint == "weather":
+            raise requests.ConnectionError("refused")
+        return pd.DataFrame({"id": [1]}), '"1"'
+
+    store = data_access.FrameStore()
+    monkeypatch.setattr(data_access, "_get", get)
+    monkeypatch.setattr(data_access, "frame_store", lambda: store)
+    monkeypatch.setattr(data_access, "_report", lambda endpoint, error: errors.append(endpoint))
+    traffic, weather = data_access.load_frames("traffic", "weather")
+    assert traffic["id"].tolist() == [1]
+    # A failed table comes back empty and is reported, the others still load
+    assert weather.empty
+    assert errors == ["weather"]
+
+def test_typed_frame_dtypes():
+    frame = data_access.typed_frame("deliveries", pd.DataFrame({
+        "status": ["Delayed", "Delivered", "Delayed"],
+        "date": ["2024-03-01", "2024-03-02", "2024-03-03"],
+        "distance_km": [12.5, 3.25, 8.0],
+        "estimated_fuel_cost": [180.1, 75.3, 99.9],
+        "humidity": [70, 65, 80],
+        "id": [1, 2, 2**40],
+    }))
+    assert list(frame["status"].cat.categories) == ["Delayed", "Delivered"]
+    assert pd.api.types.is_datetime64_any_dtype(frame["date"])
+    # float32 only where it holds every value exactly
+    assert frame["distance_km"].dtype == "float32"
+    assert frame["estimated_fuel_cost"].dtype == "float64"
+    assert frame["humidity"].dtype == "int32"
+    assert frame["id"].dtype == "int64"
+
+def test_append_rows_keeps_categoricals():
+    frame = pd.DataFrame({"status": pd.Categorical(["Delivered"])})
+    delta = pd.DataFrame({"status": pd.Categorical(["Delayed"])})
+    combined = data_access.append_rows(frame, delta)
+    assert isinstance(combined["status"].dtype, pd.CategoricalDtype)
+    assert combined["status"].tolist() == ["Delivered", "Delayed"]
@@ -0,0 +1,28 @@
+import asyncio
+import contextvars
+import threading
+from sqlalchemy.pool import StaticPool
+from api.database import _engine_options, pool_size, run_db
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+def test_run_db_runs_off_the_event_loop():
+    def work():
+        return threading.current_thread().name, request_id.get()
+
+    async def scenario():
+        request_id.set("abc")
+        return await run_db(work), threading.current_thread().name
+
+    (thread, seen), loop_thread = asyncio.run(scenario())
+    assert thread.startswith("db") and thread != loop_thread
+    # The caller's context goes along, for the per-request metrics
+    assert seen == "abc"
+
+def test_engine_options_per_backend():
+    # One shared connection for an in-memory database, a pool otherwise
+    assert _engine_options("sqlite://")["poolclass"] is StaticPool
+    assert _engine_options("sqlite:///logistics.db")["pool_size"] == pool_size
+    mssql = _engine_options("mssql+pyodbc:///?odbc_connect=x")
+    assert mssql["fast_executemany"] is True
+    assert "connect_args" not in mssql
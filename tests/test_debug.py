@@ -0,0 +1,11 @@
+def test_explain_not_mounted_without_flag(client):
+    response = client.get("/debug/explain", params={"url": "/api/slas/"})
+    assert response.status_code == 404
+
+def test_slow_queries_are_logged(client, caplog, monkeypatch):
+    monkeypatch.setattr("api.database.slow_query_ms", 0)
+    with caplog.at_level("WARNING", logger="api.slow_query"):
+        client.get("/api/slas/", params={"limit": 5})
+    [message] = [record.getMessage() for record in caplog.records if "FROM slas" in record.getMessage()]
+    assert message.startswith("slow query ")
+    assert message.endswith("| parameters (5, 0)"), message
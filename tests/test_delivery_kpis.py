@@ -0,0 +1,28 @@
+import pytest
+from tests.rows import delivery
+
+def test_compliance_rate_ignores_filters(client, deliveries):
+    # The scale comes from the setting, not from the rows a filter leaves in
+    deliveries([delivery(100, "Express"), delivery(1, "Economy"), delivery(0, "Economy")])
+    [kpis] = client.get("/api/deliveries/kpis", params={"sla_type": "Economy"}).json()
+    assert kpis["count"] == 2
+    assert kpis["sla_compliance_rate"] == pytest.approx(0.5)
+
+def test_compliance_rate_from_scores(client, deliveries):
+    # Scores as scripts/data_generatorv2.py writes them, 0-100
+    deliveries([delivery(score) for score in (100, 92, 85, 70, 40)])
+    [kpis] = client.get("/api/deliveries/kpis").json()
+    assert kpis["sla_compliance_rate"] == pytest.approx(77.4)
+
+def test_compliance_rate_from_scores_by_group(client, deliveries):
+    # Scores of 0 and 1 are still scores
+    deliveries([delivery(90, "Express"), delivery(80, "Express"), delivery(1, "Economy"), delivery(0, "Economy")])
+    kpis = {row["group"]: row["sla_compliance_rate"] for row in client.get("/api/deliveries/kpis", params={"group_by": "sla_type"}).json()}
+    assert kpis == {"Economy": pytest.approx(0.5), "Express": pytest.approx(85.0)}
+
+def test_compliance_rate_from_flags(client, deliveries, monkeypatch):
+    # SLA_COMPLIANCE_UNIT=flag
+    monkeypatch.setattr("api.crud.delivery.compliance_scale", 100)
+    deliveries([delivery(flag) for flag in (1, 1, 1, 0)])
+    [kpis] = client.get("/api/deliveries/kpis").json()
+    assert kpis["sla_compliance_rate"] == pytest.approx(75.0)
@@ -0,0 +1,30 @@
+from tests.rows import delivery
+
+def query_ids(client, **params):
+    return [row["id"] for row in client.get("/api/deliveries/query", params=params).json()]
+
+def test_filters_combine(client, deliveries):
+    ids = deliveries([
+        delivery(sla_type="Express", status="Delivered", vehicle_id=1),
+        delivery(sla_type="Express", status="Delayed", vehicle_id=2),
+        delivery(sla_type="Economy", status="Delivered", vehicle_id=1),
+        delivery(sla_type="Standard", status="Delayed", vehicle_id=3),
+    ])
+    assert query_ids(client, sla_type=["Express", "Standard"]) == [ids[0], ids[1], ids[3]]
+    assert query_ids(client, sla_type="Express", status="Delayed") == [ids[1]]
+    assert query_ids(client, vehicle_id=1) == [ids[0], ids[2]]
+
+def test_end_date_includes_the_whole_day(client, deliveries):
+    ids = deliveries([
+        delivery(date="2024-03-01T00:00:00"),
+        delivery(date="2024-03-02T18:30:00"),
+        delivery(date="2024-03-03T00:00:00"),
+    ])
+    assert query_ids(client, start_date="2024-03-02", end_date="2024-03-02") == [ids[1]]
+    assert query_ids(client, end_date="2024-03-02") == ids[:2]
+
+def test_compliance_filter(client, deliveries):
+    ids = deliveries([delivery(1), delivery(0), delivery(1)])
+    assert query_ids(client, compliance="Compliant") == [ids[0], ids[2]]
+    assert query_ids(client, compliance="Non-Compliant") == [ids[1]]
+    assert client.get("/api/deliveries/query", params={"compliance": "Maybe"}).status_code == 422
@@ -0,0 +1,26 @@
+import pytest
+from tests.rows import delivery
+
+def test_rollup_follows_inserts(client, deliveries):
+    deliveries([
+        delivery(1, date="2024-03-01T00:00:00", delay_minutes=5.0),
+        delivery(0, date="2024-03-01T00:00:00", delay_minutes=20.0),
+        delivery(1, date="2024-03-02T00:00:00", delay_minutes=0.0),
+    ])
+    # A single-row insert goes into the same groups as a batch
+    assert client.post("/api/deliveries/", json=delivery(1, date="2024-03-02T00:00:00", delay_minutes=2.5)).status_code == 200
+    stats = client.get("/api/deliveries/daily-stats", params={"group_by": "date"}).json()
+    assert [(row["date"], row["delivery_count"], row["compliant_count"]) for row in stats] == [
+        ("2024-03-01", 2, 1), ("2024-03-02", 2, 2),
+    ]
+    assert [row["delay_minutes_sum"] for row in stats] == pytest.approx([25.0, 2.5])
+
+def test_rollup_totals_match_the_filtered_deliveries(client, deliveries):
+    deliveries([delivery(sla_type=sla_type, distance_km=d) for sla_type, d in [("Express", 10.0), ("Express", 4.0), ("Economy", 7.0)]])
+    [totals] = client.get("/api/deliveries/daily-stats", params={"sla_type": "Express"}).json()
+    assert totals["delivery_count"] == 2
+    assert totals["distance_km_sum"] == pytest.approx(14.0)
+
+def test_rollup_rejects_columns_it_does_not_keep(client):
+    assert client.get("/api/deliveries/daily-stats", params={"vehicle_id": 1}).status_code == 422
+    assert client.get("/api/deliveries/daily-stats", params={"group_by": "driver_id"}).status_code == 422
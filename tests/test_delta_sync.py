@@ -0,0 +1,19 @@
+from datetime import timedelta
+from api.database import utcnow
+from tests.rows import delivery
+
+def ids(client, **params):
+    return [row["id"] for row in client.get("/api/deliveries/", params=params).json()]
+
+def test_since_id_returns_only_newer_rows(client, deliveries):
+    first = deliveries([delivery(), delivery()])
+    later = deliveries([delivery()])
+    assert ids(client, since_id=first[-1]) == later
+    # Combined with after_id the later cursor wins
+    assert ids(client, since_id=first[0], after_id=first[-1]) == later
+
+def test_updated_since(client, deliveries):
+    before = utcnow() - timedelta(minutes=1)
+    inserted = deliveries([delivery(), delivery()])
+    assert ids(client, updated_since=before.isoformat()) == inserted
+    assert ids(client, updated_since=(utcnow() + timedelta(minutes=1)).isoformat()) == []
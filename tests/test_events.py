@@ -0,0 +1,43 @@
+import json
+from pydantic import BaseModel
+from api.events import Broadcaster
+
+class Row(BaseModel):
+    value: int
+
+def messages(subscriber) -> list:
+    events = []
+    while not subscriber.queue.empty():
+        event, data = subscriber.queue.get_nowait().decode().strip().split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+def test_publish_reaches_subscribers_of_the_table():
+    broadcaster = Broadcaster()
+    deliveries = broadcaster.subscribe(["deliveries"])
+    traffic = broadcaster.subscribe(["traffic"])
+    assert broadcaster.listening("deliveries") and not broadcaster.listening("weather")
+    broadcaster.publish("deliveries", [4, 5], [Row(value=1), Row(value=2)])
+    assert messages(deliveries) == [("insert", {
+        "table": "deliveries", "count": 2, "first_id": 4, "last_id": 5,
+        "rows": [{"id": 4, "value": 1}, {"id": 5, "value": 2}],
+    })]
+    assert messages(traffic) == []
+
+def test_slow_subscriber_gets_resync(monkeypatch):
+    monkeypatch.setattr("api.events.event_queue_size", 2)
+    broadcaster = Broadcaster()
+    subscriber = broadcaster.subscribe(["traffic"])
+    for i in range(3):
+        broadcaster.publish("traffic", [i], [Row(value=i)])
+    assert messages(subscriber) == [("resync", {"dropped": 3})]
+
+def test_client_limit():
+    broadcaster = Broadcaster(max_clients=1)
+    first = broadcaster.subscribe(["weather"])
+    assert broadcaster.subscribe(["weather"]) is None
+    broadcaster.unsubscribe(first)
+    assert broadcaster.subscribe(["weather"]) is not None
+
+def test_unknown_event_table(client):
+    assert client.get("/api/events", params={"tables": "deliveries,vehicles"}).status_code == 422
@@ -0,0 +1,22 @@
+from tests.rows import delivery, driver
+
+def test_fields_select_columns(client, deliveries):
+    deliveries([delivery(sla_type="Express")])
+    [row] = client.get("/api/deliveries/", params={"fields": "sla_type,status"}).json()
+    # id always comes along as the paging cursor
+    assert list(row) == ["id", "sla_type", "status"]
+    [row] = client.get("/api/deliveries/query", params=[("fields", "distance_km"), ("fields", "id")]).json()
+    assert list(row) == ["id", "distance_km"]
+
+def test_unknown_or_internal_fields_are_rejected(client):
+    response = client.get("/api/deliveries/", params={"fields": "sla_type,nope,origin_cell"})
+    assert response.status_code == 422
+    assert "nope, origin_cell" in response.json()["detail"]
+
+def test_projected_bool_column(client):
+    client.post("/api/drivers/batch", json=[driver(1, "No")])
+    try:
+        [row] = client.get("/api/drivers/", params={"fields": "training_completed"}).json()
+        assert row["training_completed"] is False
+    finally:
+        client.delete("/api/drivers/all")
@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+import pytest
+from filters import FilterIndex
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    count = 2000
+    status = rng.choice(["Active", "Inactive", "On Leave"], count).astype(object)
+    status[rng.random(count) < 0.05] = None
+    score = rng.uniform(50, 100, count).astype("float32")
+    score[rng.random(count) < 0.05] = np.nan
+    days = rng.integers(0, 60, count)
+    return pd.DataFrame({
+        "status": status,
+        "driver_id": rng.integers(1, 200, count),
+        "punctuality_score": score,
+        # As the panels hold them: date objects
+        "joined_date": [date(2024, 1, 1) + timedelta(days=int(d)) for d in days],
+    })
+
+def expected(frame, status=None, drivers=None, score=None, joined=None):
+    mask = pd.Series(True, index=frame.index)
+    if status:
+        mask &= frame["status"].isin(status)
+    if drivers:
+        mask &= frame["driver_id"].isin(drivers)
+    if score:
+        mask &= frame["punctuality_score"].between(*score)
+    if joined:
+        mask &= (frame["joined_date"] >= joined[0]) & (frame["joined_date"] <= joined[1])
+    return frame[mask]
+
+def test_filters_match_pandas(frame):
+    index = FilterIndex(frame, categories=["status", "driver_id"], ranges=["punctuality_score", "joined_date"])
+    cases = [
+        {},
+        {"status": ["Active"]},
+        {"status": ["Active", "Inactive", "On Leave"]},
+        {"status": ["Active", "Inactive"], "drivers": [3, 7, 150]},
+        {"score": (60.5, 80.25)},
+        # Moving the slider reuses the previous range's mask
+        {"score": (61.0, 80.25)},
+        {"score": (55.0, 99.0), "status": ["On Leave"]},
+        {"joined": (date(2024, 1, 10), date(2024, 1, 20))},
+    ]
+    for case in cases:
+        result = index.filter(
+            frame,
+            isin={"status": case.get("status"), "driver_id": case.get("drivers")},
+            between={"punctuality_score": case.get("score", (None, None)), "joined_date": case.get("joined", (None, None))},
+        )
+        pd.testing.assert_frame_equal(result, expected(frame, **case))
+
+def test_unfiltered_returns_the_frame(frame):
+    index = FilterIndex(frame, categories=["status"])
+    assert index.filter(frame, isin={"status": []}) is frame
+
+def test_index_is_tied_to_its_frame(frame):
+    index = FilterIndex(frame, categories=["status"])
+    with pytest.raises(ValueError):
+        index.filter(frame.iloc[1:])
@@ -0,0 +1,44 @@
+from api.geo import haversine_km
+from tests.rows import delivery, route
+
+MUMBAI = (19.07, 72.87)
+POINTS = [
+    (MUMBAI, (19.2, 72.95)),
+    ((28.6, 77.2), (19.08, 72.88)),
+    ((12.97, 77.59), (13.0, 77.6)),
+    # Inside the radius's bounding box but 6 km out
+    ((19.11, 72.91), (12.0, 77.0)),
+]
+
+def coordinates(origin, dest):
+    return {"origin_lat": origin[0], "origin_lng": origin[1], "dest_lat": dest[0], "dest_lng": dest[1]}
+
+def ids(client, path, **params):
+    return [row["id"] for row in client.get(path, params=params).json()]
+
+def test_deliveries_within_box(client, deliveries):
+    inserted = deliveries([delivery(**coordinates(origin, dest)) for origin, dest in POINTS])
+    box = {"min_lat": 18.9, "min_lng": 72.7, "max_lat": 19.3, "max_lng": 73.0}
+    assert ids(client, "/api/deliveries/within", **box) == [inserted[0], inserted[1], inserted[3]]
+    assert ids(client, "/api/deliveries/within", point="origin", **box) == [inserted[0], inserted[3]]
+    assert ids(client, "/api/deliveries/within", point="dest", **box) == inserted[:2]
+
+def test_deliveries_near_use_the_distance(client, deliveries):
+    assert haversine_km(*MUMBAI, *POINTS[3][0]) > 5
+    inserted = deliveries([delivery(**coordinates(origin, dest)) for origin, dest in POINTS])
+    near = {"lat": MUMBAI[0], "lng": MUMBAI[1], "radius_km": 5}
+    assert ids(client, "/api/deliveries/near", **near) == inserted[:2]
+    # The coordinates are checked even when ?fields= leaves them out
+    rows = client.get("/api/deliveries/near", params={**near, "fields": "status"}).json()
+    assert rows == [{"id": inserted[0], "status": "Delivered"}, {"id": inserted[1], "status": "Delivered"}]
+    assert ids(client, "/api/deliveries/near", sla_type="Express", **near) == []
+
+def test_routes_near_pages(client):
+    inserted = [row["id"] for row in client.post("/api/routes/batch", json=[route(i, origin, dest) for i, (origin, dest) in enumerate(POINTS)]).json()]
+    try:
+        near = {"lat": MUMBAI[0], "lng": MUMBAI[1], "radius_km": 5, "limit": 1}
+        first = client.get("/api/routes/near", params=near)
+        assert [row["id"] for row in first.json()] == inserted[:1]
+        assert ids(client, "/api/routes/near", after_id=first.headers["X-Next-After-Id"], **near) == inserted[1:2]
+    finally:
+        client.delete("/api/routes/all")
@@ -0,0 +1,21 @@
+from datetime import date
+import pytest
+from sqlalchemy import select
+from api.database import engine
+from api.explain import query_plan
+from api.models.delivery import Delivery
+from api.models.traffic import Traffic
+
+def plan(query) -> str:
+    compiled = query.compile(engine)
+    with engine.connect() as conn:
+        return " ".join(row["detail"] for row in query_plan(conn, str(compiled), tuple(compiled.params.values())))
+
+@pytest.mark.parametrize("query, index", [
+    (select(Delivery.id).where(Delivery.vehicle_id == 3, Delivery.date >= date(2024, 3, 1)), "ix_deliveries_vehicle_id_date"),
+    (select(Delivery.id).where(Delivery.driver_id == 3), "ix_deliveries_driver_id_date"),
+    (select(Traffic.id).where(Traffic.location == "Mumbai", Traffic.timestamp >= date(2024, 3, 1)), "ix_traffic_location_timestamp"),
+])
+def test_filters_use_an_index(client, query, index):
+    # client imports the app, which creates the tables and their indexes
+    assert f"INDEX {index} (" in plan(query)
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+from pydantic import BaseModel
+from api.ingest import IngestQueue
+
+class Row(BaseModel):
+    value: int
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_rows_are_written_in_batches():
+    batches = []
+
+    def write(db, items, return_ids):
+        if any(item.value < 0 for item in items):
+            raise ValueError("negative")
+        batches.append([item.value for item in items])
+        return [item.value * 10 for item in items]
+
+    async def scenario():
+        queue = IngestQueue("test_rows", write)
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in range(4)]
+        for value, future in zip([1, 2, -1, 3], futures):
+            await queue.put(Row(value=value), future)
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        await queue.close()
+        return results
+
+    results = run(scenario())
+    # One batch fails on the bad row and is retried one row at a time
+    assert results[:2] == [10, 20] and results[3] == 30
+    assert isinstance(results[2], ValueError)
+    assert batches == [[1], [2], [3]]
+
+def test_ids_only_when_waited_for():
+    flags = []
+
+    def write(db, items, return_ids):
+        flags.append(return_ids)
+        return [item.value for item in items] if return_ids else None
+
+    async def scenario():
+        queue = IngestQueue("test_rows", write)
+        await queue.put(Row(value=1), None)
+        await queue.queue.join()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put(Row(value=2), future)
+        result = await asyncio.wait_for(future, 5)
+        await queue.close()
+        return result
+
+    assert run(scenario()) == 2
+    assert flags == [False, True]
+
+def test_writer_survives_a_failed_flush(monkeypatch):
+    calls = []
+
+    def publish(table, ids, items):
+        calls.append(ids)
+        if len(calls) == 1:
+            raise RuntimeError("subscriber gone")
+
+    monkeypatch.setattr("api.ingest.broadcaster.publish", publish)
+
+    async def scenario():
+        queue = IngestQueue("test_rows", lambda db, items, return_ids: [item.value for item in items])
+        loop = asyncio.get_running_loop()
+        first = loop.create_future()
+        await queue.put(Row(value=1), first)
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(first, 5)
+        second = loop.create_future()
+        await queue.put(Row(value=2), second)
+        result = await asyncio.wait_for(second, 5)
+        await queue.close()
+        return result
+
+    assert run(scenario()) == 2
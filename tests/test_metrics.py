@@ -0,0 +1,40 @@
+import re
+from api.metrics import Histogram
+from tests.rows import driver
+
+def sample(text: str, name: str, **labels) -> float:
+    pattern = re.escape(name) + r"\{([^}]*)\} (\S+)"
+    for found, value in re.findall(pattern, text):
+        if all(f'{key}="{expected}"' in found for key, expected in labels.items()):
+            return float(value)
+    return 0.0
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("h", "Test.", ("route",), buckets=(1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe("/x", value=value)
+    assert histogram.render()[2:] == [
+        'h_bucket{route="/x",le="1"} 2',
+        'h_bucket{route="/x",le="10"} 3',
+        'h_bucket{route="/x",le="+Inf"} 4',
+        'h_sum{route="/x"} 56.5',
+        'h_count{route="/x"} 4',
+    ]
+
+def test_requests_are_counted_per_route_template(client):
+    before = client.get("/metrics").text
+    client.post("/api/drivers/batch", json=[driver(1), driver(2)])
+    client.post("/api/drivers/batch", params={"return_ids": "false"}, json=[driver(3)])
+    try:
+        client.get("/api/drivers/")
+        client.get("/api/drivers/", params={"fields": "name"})
+        after = client.get("/metrics").text
+    finally:
+        client.delete("/api/drivers/all")
+
+    def counted(name, **labels):
+        return sample(after, name, **labels) - sample(before, name, **labels)
+
+    assert counted("api_requests_total", method="GET", route="/api/drivers/", status="200") == 2
+    # Rows written through /batch, with and without RETURNING
+    assert counted("api_request_db_rows_sum", method="POST", route="/api/drivers/batch") == 3
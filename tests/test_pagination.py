@@ -0,0 +1,26 @@
+import json
+from tests.rows import delivery
+
+def test_keyset_pages_cover_every_row_once(client, deliveries):
+    ids = deliveries([delivery(delay_minutes=float(i)) for i in range(7)])
+    seen = []
+    params = {"limit": 3}
+    while True:
+        response = client.get("/api/deliveries/", params=params)
+        seen.extend(row["id"] for row in response.json())
+        if "X-Next-After-Id" not in response.headers:
+            break
+        params["after_id"] = response.headers["X-Next-After-Id"]
+    assert seen == ids
+
+def test_last_page_has_no_cursor(client, deliveries):
+    ids = deliveries([delivery() for _ in range(3)])
+    response = client.get("/api/deliveries/", params={"limit": 5, "after_id": ids[0]})
+    assert [row["id"] for row in response.json()] == ids[1:]
+    assert "X-Next-After-Id" not in response.headers
+
+def test_stream_returns_ndjson(client, deliveries):
+    ids = deliveries([delivery() for _ in range(4)])
+    response = client.get("/api/deliveries/", params={"stream": "true", "after_id": ids[0]})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == ids[1:]
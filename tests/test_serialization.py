@@ -0,0 +1,51 @@
+import json
+import io
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from tests.rows import delivery, driver
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+
+@pytest.mark.parametrize("stream", ["false", "true"])
+def test_empty_arrow_result_keeps_schema(client, stream):
+    # after_id past every row: no rows, but the columns and their types still arrive
+    response = client.get("/api/deliveries/", params={"after_id": 10**12, "stream": stream}, headers={"Accept": ARROW_STREAM})
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 0
+    assert table.schema.field("id").type == pa.int64()
+    assert table.schema.field("scheduled_time").type == pa.timestamp("us")
+    assert table.schema.field("distance_km").type == pa.float64()
+    assert pa.types.is_dictionary(table.schema.field("status").type)
+
+@pytest.mark.parametrize("stream", ["false", "true"])
+def test_driver_training_completed_is_bool(client, stream):
+    # Stored as "Yes"/"No"; the response schema declares a bool
+    client.post("/api/drivers/batch", json=[driver(1, "Yes"), driver(2, "No")])
+    try:
+        response = client.get("/api/drivers/", params={"stream": stream})
+        if stream == "true":
+            rows = [json.loads(line) for line in response.text.splitlines()]
+        else:
+            rows = response.json()
+        assert [row["training_completed"] for row in rows] == [True, False]
+
+        response = client.get("/api/drivers/", params={"stream": stream}, headers={"Accept": ARROW_STREAM})
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.schema.field("training_completed").type == pa.bool_()
+        assert table.column("training_completed").to_pylist() == [True, False]
+    finally:
+        client.delete("/api/drivers/all")
+
+def test_columnar_formats_match_json(client, deliveries):
+    deliveries([delivery(score, sla_type) for score, sla_type in [(90, "Express"), (70, "Economy")]])
+    rows = client.get("/api/deliveries/", params={"fields": "sla_type,sla_compliance"}).json()
+    arrow = client.get("/api/deliveries/", params={"fields": "sla_type,sla_compliance"}, headers={"Accept": ARROW_STREAM})
+    parquet = client.get("/api/deliveries/", params={"fields": "sla_type,sla_compliance"}, headers={"Accept": PARQUET})
+    assert arrow.headers["content-type"].startswith(ARROW_STREAM)
+    assert pa.ipc.open_stream(arrow.content).read_all().to_pylist() == rows
+    assert pq.read_table(io.BytesIO(parquet.content)).to_pylist() == rows
+
+def test_parquet_cannot_be_streamed(client):
+    assert client.get("/api/deliveries/", params={"stream": "true"}, headers={"Accept": PARQUET}).status_code == 406
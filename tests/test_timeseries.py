@@ -0,0 +1,42 @@
+import pytest
+from tests.rows import traffic
+
+@pytest.fixture
+def traffic_rows(client):
+    def insert(rows):
+        assert client.post("/api/traffic/batch", json=rows).status_code == 200
+    yield insert
+    client.delete("/api/traffic/all")
+
+def points(client, **params):
+    return [(p["location"], p["bucket"], p["count"], p["traffic_index"]) for p in client.get("/api/traffic/timeseries", params=params).json()]
+
+def test_hourly_buckets_per_location(client, traffic_rows):
+    traffic_rows([
+        traffic("2024-03-06T08:05:00", 10.0), traffic("2024-03-06T08:55:00", 30.0),
+        traffic("2024-03-06T09:00:00", 50.0), traffic("2024-03-06T08:30:00", 70.0, location="Pune"),
+    ])
+    assert points(client, interval="hour") == [
+        ("Mumbai", "2024-03-06T08:00:00", 2, pytest.approx(20.0)),
+        ("Mumbai", "2024-03-06T09:00:00", 1, pytest.approx(50.0)),
+        ("Pune", "2024-03-06T08:00:00", 1, pytest.approx(70.0)),
+    ]
+    assert points(client, interval="hour", agg="max", location="Mumbai", end="2024-03-06T09:00:00") == [
+        ("Mumbai", "2024-03-06T08:00:00", 2, pytest.approx(30.0)),
+    ]
+
+def test_weeks_start_on_monday_and_months_on_the_first(client, traffic_rows):
+    # Sunday 3 March, Monday 4 March, Sunday 10 March
+    traffic_rows([traffic("2024-03-03T12:00:00", 1.0), traffic("2024-03-04T00:00:00", 2.0), traffic("2024-03-10T23:00:00", 3.0)])
+    assert [p[1:3] for p in points(client, interval="week")] == [("2024-02-26T00:00:00", 1), ("2024-03-04T00:00:00", 2)]
+    assert [p[1:3] for p in points(client, interval="month")] == [("2024-03-01T00:00:00", 3)]
+
+def test_p95_is_the_nearest_rank(client, traffic_rows):
+    traffic_rows([traffic("2024-03-06T08:00:00", float(value)) for value in range(1, 21)])
+    assert points(client, interval="day", agg="p95") == [("Mumbai", "2024-03-06T00:00:00", 20, pytest.approx(19.0))]
+
+def test_auto_interval_fits_max_points(client, traffic_rows):
+    # 96 hours from the first row to the last
+    traffic_rows([traffic("2024-03-01T01:00:00", 1.0), traffic("2024-03-05T01:00:00", 2.0)])
+    assert [p[1] for p in points(client, max_points=100)] == ["2024-03-01T01:00:00", "2024-03-05T01:00:00"]
+    assert [p[1] for p in points(client, max_points=50)] == ["2024-03-01T00:00:00", "2024-03-05T00:00:00"]